@@ -0,0 +1,244 @@
+"""
+Offline benchmark suite for lobster_reconstructor.
+
+Generates a synthetic LOBSTER message file, runs every scenario in a fresh
+process (so peak RSS is per scenario) and writes the results as JSON.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --events 200000 --output results.json
+    python benchmarks/run_benchmarks.py --scenarios replay ofi_queries
+    python benchmarks/run_benchmarks.py --compare old.json --output new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import lobster_reconstructor
+from lobster_reconstructor import LobsterSim, Orderbook
+from lobster_reconstructor.synthetic import write_message_file
+
+NLEVELS = 10
+TICK_SIZE = 0.01
+
+
+def _new_sim(msg_path: str, use_matching_engine: bool = False) -> LobsterSim:
+    return LobsterSim(Orderbook(NLEVELS, "SYN", TICK_SIZE, use_matching_engine=use_matching_engine), msg_path)
+
+
+def _query_times(sim: LobsterSim, n: int, seed: int = 0) -> np.ndarray:
+    times = sim.dataM["Time"].to_numpy()
+    return np.sort(np.random.default_rng(seed).uniform(times[0], times[-1], n))
+
+
+def _time_queries(fn, args) -> tuple[float, list]:
+    latencies = []
+    started = time.perf_counter()
+    for a in args:
+        t0 = time.perf_counter()
+        fn(*a)
+        latencies.append(time.perf_counter() - t0)
+    return time.perf_counter() - started, latencies
+
+
+# -------------------------
+# Scenarios
+# -------------------------
+# Each scenario returns (seconds, replayed messages or None, per-query latencies or None).
+
+def bench_replay(msg_path: str, n_queries: int):
+    sim = _new_sim(msg_path)
+    started = time.perf_counter()
+    sim.simulate_until(np.inf)
+    return time.perf_counter() - started, len(sim.dataM), None
+
+
+def bench_matching_engine(msg_path: str, n_queries: int):
+    sim = _new_sim(msg_path, use_matching_engine=True)
+    started = time.perf_counter()
+    sim.simulate_until(np.inf)
+    return time.perf_counter() - started, len(sim.dataM), None
+
+
+def bench_sample_L2(msg_path: str, n_queries: int):
+    sim = _new_sim(msg_path)
+    times = sim.dataM["Time"].to_numpy()
+    interval = (times[-1] - times[0]) / n_queries
+    started = time.perf_counter()
+    sim.sample_L2_array(times[0], times[-1], interval)
+    return time.perf_counter() - started, len(sim.dataM), None
+
+
+def bench_L2_queries(msg_path: str, n_queries: int):
+    sim = _new_sim(msg_path)
+    engine = sim.build_L2_engine()
+    seconds, latencies = _time_queries(engine.snapshot, [(t, NLEVELS) for t in _query_times(sim, n_queries)])
+    return seconds, None, latencies
+
+
+def bench_L3_queries(msg_path: str, n_queries: int):
+    sim = _new_sim(msg_path)
+
+    def query(t):
+        sim.simulate_from_current_until(t)
+        sim.orderbook.convert_orderbook_to_L3_dataframe()
+
+    seconds, latencies = _time_queries(query, [(t,) for t in _query_times(sim, n_queries)])
+    return seconds, len(sim.dataM), latencies
+
+
+def bench_ofi_queries(msg_path: str, n_queries: int):
+    sim = _new_sim(msg_path)
+    starts = _query_times(sim, n_queries)
+    seconds, latencies = _time_queries(sim.sim_size_OFI, [(t, t + 60.0) for t in starts])
+    return seconds, len(sim.dataM), latencies
+
+
+def bench_features_to_csv(msg_path: str, n_queries: int):
+    sim = _new_sim(msg_path)
+    times = sim.dataM["Time"].to_numpy()
+    features = {
+        "mid_price": {"method": "mid_price", "args": []},
+        "spread": {"method": "bid_ask_spread", "args": []},
+        "bid_volume": {"method": "total_bid_volume", "args": []},
+        "ask_volume": {"method": "total_ask_volume", "args": []},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        sim.print_features_to_csv("features", times[0], times[-1], (times[-1] - times[0]) / n_queries,
+                                  features, "2000-01-01", "SYN", directory=tmp)
+        seconds = time.perf_counter() - started
+    return seconds, len(sim.dataM), None
+
+
+SCENARIOS = {
+    "replay": bench_replay,
+    "matching_engine": bench_matching_engine,
+    "sample_L2": bench_sample_L2,
+    "L2_queries": bench_L2_queries,
+    "L3_queries": bench_L3_queries,
+    "ofi_queries": bench_ofi_queries,
+    "features_to_csv": bench_features_to_csv,
+}
+
+
+# -------------------------
+# Runner
+# -------------------------
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def _run_scenario(name: str, msg_path: str, n_queries: int, results) -> None:
+    logging.disable(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds, events, latencies = SCENARIOS[name](msg_path, n_queries)
+    result = {
+        "scenario": name,
+        "seconds": seconds,
+        "events": events,
+        "events_per_sec": events / seconds if events and seconds > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if latencies:
+        result["queries"] = len(latencies)
+        result["queries_per_sec"] = len(latencies) / seconds
+        result["p50_ms"] = float(np.percentile(latencies, 50) * 1e3)
+        result["p99_ms"] = float(np.percentile(latencies, 99) * 1e3)
+    results.put(result)
+
+
+def run(scenarios: list, msg_path: str, n_queries: int) -> list:
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for name in scenarios:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_scenario, args=(name, msg_path, n_queries, queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            results.append({"scenario": name, "error": f"exit code {proc.exitcode}"})
+        else:
+            results.append(queue.get())
+        print(_format_result(results[-1]), flush=True)
+    return results
+
+
+def _format_result(result: dict) -> str:
+    if "error" in result:
+        return f"{result['scenario']:<16} FAILED ({result['error']})"
+    rate = f"{result['events_per_sec']:>12,.0f} events/s" if result["events_per_sec"] else " " * 21
+    line = f"{result['scenario']:<16} {result['seconds']:8.3f} s  {rate}  peak RSS {result['peak_rss_mb']:7.1f} MB"
+    if "p50_ms" in result:
+        line += f"  p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms"
+    return line
+
+
+def compare(old: dict, new: dict) -> None:
+    """
+    Print the change of each metric between two result files.
+    """
+    old_results = {r["scenario"]: r for r in old["results"] if "error" not in r}
+    print(f"\nChange vs. {old.get('version')} ({old.get('timestamp')}):")
+    for r in new["results"]:
+        base = old_results.get(r["scenario"])
+        if base is None or "error" in r:
+            continue
+        parts = [f"{key} {r[key] / base[key] - 1:+.1%}" for key in ("events_per_sec", "queries_per_sec", "peak_rss_mb", "p50_ms", "p99_ms")
+                 if r.get(key) and base.get(key)]
+        print(f"{r['scenario']:<16} " + "  ".join(parts))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000, help="number of synthetic messages")
+    parser.add_argument("--queries", type=int, default=200, help="queries or samples per query scenario")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--message-file", help="benchmark an existing LOBSTER message file instead")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON output path")
+    parser.add_argument("--compare", help="earlier JSON output to compare against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        msg_path = args.message_file
+        if msg_path is None:
+            msg_path = os.path.join(tmp, "synthetic_message.csv")
+            write_message_file(msg_path, n_events=args.events, seed=args.seed)
+        results = run(args.scenarios, msg_path, args.queries)
+
+    report = {
+        "version": lobster_reconstructor.__version__,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"events": args.events, "queries": args.queries, "seed": args.seed,
+                   "message_file": args.message_file},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,12 +31,28 @@ def run_dash():
 threading.Thread(target=run_dash, daemon=True).start() # This allows us to load the rest of the graphs/examples while Dash app is running
 
 
+# The graphs below replay `example.orderbook` on this thread. Other threads must not read the book while it is
+# being modified; they read the immutable views published during the replay instead.
+example.enable_views(every=10_000, interval=5.0)
+
+def watch_replay():
+    view = example.views.current
+    while True:
+        view = example.views.wait_for_update(view.version)
+        mid = "n/a" if view.mid_price is None else f"{view.mid_price * example.orderbook.price_scaling:.4f}"
+        print(f"Replay at {view.timestamp:.0f}s after midnight, {view.message_count} messages, mid price {mid}")
+
+threading.Thread(target=watch_replay, daemon=True).start()
+
+
 
 example.size_OFI_graph(35000, 36800, 5)
 example.count_OFI_graph(35000, 36800, 5)
 
 example.plot_price_levels_heatmap(35000, 36800, 5)
 example.midprice_graph(35000, 36800, 5)
+series_app = example.create_series_app() # OFI and midprice series above, re-queried at full detail when zoomed
+threading.Thread(target=lambda: series_app.run(debug=False, use_reloader=False, host='127.0.0.1', port=8051), daemon=True).start()
 example.depth_percentile_graph(35000, 36800, 5)
 example.display_L3_snapshots(32400, 57600, 3600)
 example.graph_trade_arrival_time(34200, 57600)
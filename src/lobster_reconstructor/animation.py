@@ -0,0 +1,657 @@
+import json
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+from .memory import MemoryReport, orderbook_memory
+from .orderbook import Orderbook
+from .utils import format_timestamp, import_optional
+
+
+class L3FrameProvider:
+    """
+    Lazily builds L3 animation frames for :meth:`LobsterSim.create_animated_L3_app`.
+
+    Frames are computed on demand by replaying messages on a private copy of the
+    book, starting from the nearest cached book state (checkpoint) at or before the
+    requested frame. Checkpoints are stored as flat arrays (see
+    :meth:`Orderbook.export_state`) and built figures are kept in an LRU cache;
+    both count against one approximate byte budget. A background thread
+    prefetches the next few frames after each request.
+
+    Parameters
+    ----------
+    sim : LobsterSim
+        Simulation providing the message data. Its own `orderbook` is never
+        modified, so the main thread can keep using it while frames are served.
+    start_time : float
+        Timestamp (seconds after midnight) of the first frame.
+    end_time : float
+        Timestamp (seconds after midnight) of the last frame (inclusive).
+    interval : float
+        Time interval (in seconds) between consecutive frames.
+    checkpoint_every : int, default=50
+        Store the book state every `checkpoint_every` frames. Going backwards
+        replays at most this many frames, unless checkpoints had to be thinned.
+    max_cache_bytes : int, default=64 * 1024 ** 2
+        Approximate memory budget of the checkpoints and the figure LRU cache
+        together. Checkpoints may take up to half of it; beyond that every other
+        checkpoint is dropped and the spacing doubles. Figures are evicted, least
+        recently used first, to keep the total within the budget.
+    prefetch : int, default=5
+        Number of frames to build ahead of the last requested frame.
+    undo_capacity : int, default=0
+        Journal this many messages on the private book (see
+        :meth:`Orderbook.enable_journal`). Stepping back to a frame whose messages
+        are still in the journal undoes them instead of restoring a checkpoint and
+        replaying forward. 0 disables journaling.
+
+    Attributes
+    ----------
+    timestamps : np.ndarray
+        Timestamp of each frame.
+    price_range : tuple of float
+        Scaled (min, max) price axis bounds, from a pre-scan of the window.
+    cache_bytes, checkpoint_bytes : int
+        Approximate bytes held by the figure cache and by the checkpoints.
+    """
+    def __init__(self, sim, start_time: float, end_time: float, interval: float,
+                 checkpoint_every: int = 50, max_cache_bytes: int = 64 * 1024 ** 2, prefetch: int = 5,
+                 undo_capacity: int = 0):
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        if end_time < start_time:
+            raise ValueError("end_time must be >= start_time")
+        self._sim = sim
+        self.ticker = sim.orderbook.ticker
+        self.price_scaling = sim.orderbook.price_scaling
+        n_frames = int(np.floor((end_time - start_time) / interval + 1e-9)) + 1
+        self.timestamps = start_time + interval * np.arange(n_frames)
+        self.checkpoint_every = max(1, checkpoint_every)
+        self._checkpoint_stride = self.checkpoint_every
+        self.max_cache_bytes = max_cache_bytes
+        self.prefetch = prefetch
+        self.undo_capacity = undo_capacity
+
+        self._lock = threading.RLock()
+        self._cache = OrderedDict()  # frame: (figure, nbytes)
+        self.cache_bytes = 0
+
+        book = Orderbook(sim.orderbook.nlevels, sim.orderbook.ticker, sim.orderbook.tick_size,
+                         sim.orderbook.price_scaling, sim.orderbook._use_auto_matching_engine)
+        sim._reset_book(book)
+        msg_idx = sim._replay_until(book, 0, self.timestamps[0])
+        if undo_capacity:
+            book.enable_journal(undo_capacity)
+        self._cursor_book = book
+        self._cursor_idx = msg_idx
+        self._cursor_frame = 0
+        self._checkpoints = {}  # frame: (state, msg_idx, nbytes)
+        self.checkpoint_bytes = 0
+        self._store_checkpoint()
+        self.price_range = self._prescan_price_range(start_time, end_time)
+
+        self._wanted = []
+        self._wanted_cv = threading.Condition()
+        self._prefetch_stop = threading.Event()
+        self._prefetch_thread = None
+        # Stops the prefetch thread when the provider is closed or garbage collected
+        self._stop_prefetch = weakref.finalize(self, _stop_prefetch, self._prefetch_stop, self._wanted_cv)
+        self._state_frame = None
+        self._state = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def close(self) -> None:
+        """
+        Stop the prefetch thread and release the cached figures and book states.
+
+        The provider must not be used afterwards. Also called when the provider
+        is garbage collected, and by the app of
+        :meth:`LobsterSim.create_animated_L3_app` when it is.
+        """
+        self._stop_prefetch()
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join(timeout=1)
+            self._prefetch_thread = None
+        with self._lock:
+            self._cache.clear()
+            self._checkpoints.clear()
+            self.cache_bytes = self.checkpoint_bytes = 0
+            self._state = self._state_frame = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def memory_usage(self, exact: bool = False) -> MemoryReport:
+        """
+        Memory held by the provider.
+
+        Components are "figures" (the figure LRU cache), "checkpoints" and
+        "cursor_book" (the private book, broken down in `details` as by
+        :func:`orderbook_memory`, including the undo journal).
+
+        Parameters
+        ----------
+        exact : bool, default=False
+            See :func:`orderbook_memory`. The cache and checkpoint sizes are the
+            running estimates kept against `max_cache_bytes` either way.
+
+        Returns
+        -------
+        MemoryReport
+        """
+        with self._lock:
+            book = orderbook_memory(self._cursor_book, exact)
+            report = MemoryReport(exact=exact)
+            report.components["figures"] = self.cache_bytes
+            report.components["checkpoints"] = self.checkpoint_bytes
+            report.components["cursor_book"] = book.total
+            report.details["cursor_book"] = book.components
+        return report
+
+    def _prescan_price_range(self, start_time: float, end_time: float) -> tuple[float, float]:
+        """
+        Estimate price axis bounds without building any frame.
+
+        Executions happen at the touch, so the range of execution prices within the
+        window (plus the touch at the first frame) tracks where the book moves; it
+        is widened by the depth spanned by the visible levels at the first frame.
+        """
+        book = self._cursor_book
+        dataM = self._sim.dataM
+        times = dataM["Time"].to_numpy()
+        lo = np.searchsorted(times, start_time, side="left")
+        hi = np.searchsorted(times, end_time, side="right")
+        window = dataM.iloc[lo:hi]
+        exec_prices = window.loc[window["Type"].isin(["vis_exec", "hid_exec"]), "Price"].to_numpy(dtype=np.float64)
+
+        bid_prices = list(book.bids.islice(0, book.nlevels))
+        ask_prices = list(book.asks.islice(0, book.nlevels))
+        touch = exec_prices.tolist() + bid_prices[:1] + ask_prices[:1]
+        if not touch:
+            return 0.0, 1.0
+        below = bid_prices[0] - bid_prices[-1] if bid_prices else 0
+        above = ask_prices[-1] - ask_prices[0] if ask_prices else 0
+        pad = book.tick_size / book.price_scaling
+        return ((min(touch) - below - pad) * book.price_scaling,
+                (max(touch) + above + pad) * book.price_scaling)
+
+    # --------------------------
+    # Frame construction
+    # --------------------------
+    def _advance_to(self, frame: int) -> None:
+        if frame < self._cursor_frame:
+            journal = self._cursor_book.journal
+            target_idx = int(np.searchsorted(self._sim.dataM["Time"].to_numpy(), self.timestamps[frame], side="right"))
+            if journal is not None and len(journal) >= self._cursor_idx - target_idx:
+                self._cursor_book.undo(self._cursor_idx - target_idx)
+                self._cursor_idx = target_idx
+                self._cursor_frame = frame
+                return
+            start = max(k for k in self._checkpoints if k <= frame)
+            state, msg_idx, _ = self._checkpoints[start]
+            self._cursor_book = self._restore_checkpoint(state)
+            if self.undo_capacity:
+                self._cursor_book.enable_journal(self.undo_capacity)
+            self._cursor_idx = msg_idx
+            self._cursor_frame = start
+        while self._cursor_frame < frame:
+            self._cursor_frame += 1
+            self._cursor_idx = self._sim._replay_until(self._cursor_book, self._cursor_idx,
+                                                       self.timestamps[self._cursor_frame])
+            if self._cursor_frame % self._checkpoint_stride == 0 and self._cursor_frame not in self._checkpoints:
+                self._store_checkpoint()
+
+    def _store_checkpoint(self) -> None:
+        state = self._cursor_book.export_state()
+        nbytes = 256 + sum(v.nbytes for v in state.values() if isinstance(v, np.ndarray))
+        self._checkpoints[self._cursor_frame] = (state, self._cursor_idx, nbytes)
+        self.checkpoint_bytes += nbytes
+        # Thin to every other checkpoint while they take more than half the budget
+        while self.checkpoint_bytes > self.max_cache_bytes // 2 and len(self._checkpoints) > 1:
+            self._checkpoint_stride *= 2
+            for k in [k for k in self._checkpoints if k % self._checkpoint_stride]:
+                self.checkpoint_bytes -= self._checkpoints.pop(k)[2]
+        self._evict_figures()
+
+    def _restore_checkpoint(self, state: dict) -> Orderbook:
+        ob = self._cursor_book
+        book = Orderbook(ob.nlevels, ob.ticker, ob.tick_size, ob.price_scaling, ob._use_auto_matching_engine)
+        book.restore_state(state)
+        return book
+
+    def frame_dataframe(self, frame: int) -> pd.DataFrame:
+        """
+        L3 DataFrame (scaled prices) of the book at a frame.
+
+        Parameters
+        ----------
+        frame : int
+            Frame number.
+
+        Returns
+        -------
+        DataFrame
+            See :meth:`Orderbook.convert_orderbook_to_L3_dataframe`.
+        """
+        with self._lock:
+            self._advance_to(frame)
+            df = self._cursor_book.convert_orderbook_to_L3_dataframe()
+        if not df.empty:
+            df.price = df.price * self.price_scaling
+        return df
+
+    def _build_figure(self, frame: int):
+        px = import_optional("plotly.express")
+        df = self.frame_dataframe(frame)
+        if df.empty:
+            df = pd.DataFrame({"direction": pd.Series(dtype=object), "price": pd.Series(dtype=float),
+                               "size": pd.Series(dtype=float)})
+        fig = px.bar(
+            df,
+            orientation='h',
+            x="size",
+            y="price",
+            color="direction",
+            title=f"{self.ticker}<br><sup>{format_timestamp(self.timestamps[frame])}",
+            color_discrete_sequence=["green", "red"]
+        )
+        fig.update_layout(
+            xaxis=dict(range=[0, 2000], autorange=False),
+            yaxis=dict(range=list(self.price_range), autorange=False),
+            uirevision="static",
+            height=600
+        )
+        nbytes = 4096 + sum(np.asarray(trace.x).nbytes + np.asarray(trace.y).nbytes for trace in fig.data)
+        return fig, nbytes
+
+    def figure(self, frame: int):
+        """
+        Plotly figure of a frame, from the LRU cache when available.
+
+        Requesting a frame also schedules prefetching of the following frames.
+
+        Parameters
+        ----------
+        frame : int
+            Frame number.
+
+        Returns
+        -------
+        plotly.graph_objects.Figure
+            Horizontal bar chart of the L3 book at the frame.
+        """
+        fig = self._cached_figure(frame)
+        self._schedule_prefetch(frame)
+        return fig
+
+    def _cached_figure(self, frame: int):
+        with self._lock:
+            if frame in self._cache:
+                self._cache.move_to_end(frame)
+                return self._cache[frame][0]
+            fig, nbytes = self._build_figure(frame)
+            self._cache[frame] = (fig, nbytes)
+            self.cache_bytes += nbytes
+            self._evict_figures()
+            return fig
+
+    def _evict_figures(self) -> None:
+        while self.cache_bytes + self.checkpoint_bytes > self.max_cache_bytes and len(self._cache) > 1:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self.cache_bytes -= evicted
+
+    # --------------------------
+    # Frame deltas
+    # --------------------------
+    def _visible_state(self) -> dict:
+        """
+        Sizes of the orders on the `nlevels` best levels of the cursor book, as
+        ``{direction: {price: {key: size}}}`` in priority and queue order.
+        """
+        book = self._cursor_book
+        return {direction: {price: {f"{direction[0]}{order_id}": int(order.size)
+                                    for order_id, order in side[price].items()}
+                            for price in side.islice(0, book.nlevels)}
+                for direction, side in (("bid", book.bids), ("ask", book.asks))}
+
+    def _frame_state(self, frame: int) -> dict:
+        if self._state_frame != frame:
+            self._advance_to(frame)
+            self._set_state(self._visible_state(), frame)
+        return self._state
+
+    def _set_state(self, state: dict, frame: int) -> None:
+        self._state, self._state_frame = state, frame
+        # Number of visible levels holding each order key, to spot order IDs resting at two prices
+        self._state_keys = Counter(key for levels in state.values() for level in levels.values() for key in level)
+
+    def _flatten_state(self, state: dict) -> dict:
+        orders = {}
+        for direction, levels in state.items():
+            for price, level in levels.items():
+                scaled_price = float(price * self.price_scaling)
+                for key, size in level.items():
+                    orders[key] = [direction, scaled_price, size]
+        return orders
+
+    def frame_orders(self, frame: int) -> dict:
+        """
+        Visible resting orders of the book at a frame, in queue order.
+
+        Parameters
+        ----------
+        frame : int
+            Frame number.
+
+        Returns
+        -------
+        dict
+            Mapping of an order key (``"b<order_id>"`` or ``"a<order_id>"``) to
+            ``[direction, scaled price, size]``, covering the `nlevels` best levels
+            of each side.
+        """
+        with self._lock:
+            return self._flatten_state(self._frame_state(frame))
+
+    def frame_delta(self, prev_frame: int, frame: int) -> dict:
+        """
+        Order-level difference between the visible books of two frames.
+
+        Moving forward by one frame from the frame served last, the delta is
+        derived from the messages between the two frames: only the orders they
+        touch and the price levels that enter or leave the `nlevels` best are
+        looked at, so the cost follows the event rate rather than the book size.
+        Other moves, books using the matching engine (whose fills remove orders
+        the messages do not name) and steps where an order ID would be visible at
+        two prices diff the two visible books instead.
+
+        Parameters
+        ----------
+        prev_frame : int
+            Frame the client currently displays.
+        frame : int
+            Frame to move to.
+
+        Returns
+        -------
+        dict
+            ``{"added": [[key, direction, price, size], ...], "removed": [key, ...],
+            "resized": [[key, size], ...]}``. Added orders are listed in queue order,
+            so appending them keeps time priority within each price level.
+        """
+        with self._lock:
+            if (frame != prev_frame + 1 or self._state_frame != prev_frame
+                    or self._cursor_book._use_auto_matching_engine):
+                return self._diff_orders(self.frame_orders(prev_frame), self.frame_orders(frame))
+            return self._message_delta(frame)
+
+    def _message_delta(self, frame: int) -> dict:
+        before = self._state
+        dataM = self._sim.dataM
+        times = dataM["Time"].to_numpy()
+        lo = int(np.searchsorted(times, self.timestamps[frame - 1], side="right"))
+        hi = int(np.searchsorted(times, self.timestamps[frame], side="right"))
+        # Orders named by the messages, grouped by side and price in message order
+        touched = {"bid": {}, "ask": {}}
+        window = dataM.iloc[lo:hi]
+        for order_id, price, direction in zip(window["OrderID"].tolist(), window["Price"].tolist(),
+                                              window["Direction"].tolist()):
+            if direction in touched:
+                touched[direction].setdefault(price, {})[order_id] = None
+        self._advance_to(frame)
+
+        book = self._cursor_book
+        added, removed, resized = [], [], []
+        after = {}
+        for direction, side in (("bid", book.bids), ("ask", book.asks)):
+            old_levels = before[direction]
+            levels = {}
+            for price in side.islice(0, book.nlevels):
+                old = old_levels.get(price)
+                scaled_price = float(price * self.price_scaling)
+                if old is None:
+                    # The level entered the visible range
+                    level = {f"{direction[0]}{order_id}": int(order.size) for order_id, order in side[price].items()}
+                    added.extend([key, direction, scaled_price, size] for key, size in level.items())
+                elif price in touched[direction]:
+                    level = dict(old)
+                    resting = side[price]
+                    for order_id in touched[direction][price]:
+                        key = f"{direction[0]}{order_id}"
+                        order = resting.get(order_id)
+                        if order is None:
+                            if level.pop(key, None) is not None:
+                                removed.append(key)
+                        elif key not in level:
+                            level[key] = int(order.size)
+                            added.append([key, direction, scaled_price, level[key]])
+                        elif level[key] != order.size:
+                            level[key] = int(order.size)
+                            resized.append([key, level[key]])
+                else:
+                    level = old
+                levels[price] = level
+            for price, old in old_levels.items():
+                if price not in levels:
+                    removed.extend(old)
+            after[direction] = levels
+
+        keys = self._state_keys
+        keys.subtract(removed)
+        keys.update(entry[0] for entry in added)
+        if any(keys[key] for key in removed) or any(keys[entry[0]] > 1 for entry in added):
+            # Duplicate order ID: the client cannot show both orders under one key
+            self._set_state(self._visible_state(), frame)
+            return self._diff_orders(self._flatten_state(before), self._flatten_state(self._state))
+        for key in removed:
+            del keys[key]
+        self._state, self._state_frame = after, frame
+        return {"added": added, "removed": removed, "resized": resized}
+
+    @staticmethod
+    def _diff_orders(before: dict, after: dict) -> dict:
+        added, resized = [], []
+        for key, (direction, price, size) in after.items():
+            old = before.get(key)
+            if old is None or old[1] != price:
+                added.append([key, direction, price, size])
+            elif old[2] != size:
+                resized.append([key, size])
+        removed = [key for key, old in before.items() if key not in after or after[key][1] != old[1]]
+        return {"added": added, "removed": removed, "resized": resized}
+
+    def frame_payload(self, frame: int, prev_frame: int = None) -> dict:
+        """
+        Message sent to the browser in delta transport mode.
+
+        Parameters
+        ----------
+        frame : int
+            Frame to display.
+        prev_frame : int, optional
+            Frame the client currently displays. When it is the frame directly before
+            `frame`, only the order-level delta is sent; otherwise a keyframe with
+            every visible order is sent.
+
+        Returns
+        -------
+        dict
+            JSON-serializable payload consumed by :data:`APPLY_FRAME_DELTA_JS`.
+        """
+        payload = {"frame": frame, "title": f"{self.ticker}<br><sup>{format_timestamp(self.timestamps[frame])}"}
+        if prev_frame is not None and prev_frame == frame - 1:
+            payload["key"] = False
+            payload.update(self.frame_delta(prev_frame, frame))
+        else:
+            orders = self.frame_orders(frame)
+            payload["key"] = True
+            payload.update(added=[[key, *order] for key, order in orders.items()], removed=[], resized=[])
+        return payload
+
+    def empty_delta_figure(self) -> dict:
+        """
+        Figure skeleton (one bar trace per side) that delta payloads are applied to.
+
+        Returns
+        -------
+        dict
+            Plotly figure dictionary.
+        """
+        traces = [
+            {"type": "bar", "orientation": "h", "name": direction, "x": [], "y": [], "marker": {"color": color}}
+            for direction, color in (("bid", "green"), ("ask", "red"))
+        ]
+        layout = {
+            "barmode": "relative",
+            "xaxis": {"range": [0, 2000], "autorange": False, "title": {"text": "size"}},
+            "yaxis": {"range": list(map(float, self.price_range)), "autorange": False, "title": {"text": "price"}},
+            "legend": {"title": {"text": "direction"}},
+            "uirevision": "static",
+            "height": 600,
+        }
+        return {"data": traces, "layout": layout}
+
+    # --------------------------
+    # Prefetching
+    # --------------------------
+    def _schedule_prefetch(self, frame: int) -> None:
+        if self.prefetch <= 0 or self._prefetch_stop.is_set():
+            return
+        with self._wanted_cv:
+            self._wanted[:] = [(frame + k) % len(self) for k in range(1, self.prefetch + 1)]
+            if self._prefetch_thread is None:
+                # The thread only holds a weak reference, so it does not keep the provider alive
+                self._prefetch_thread = threading.Thread(
+                    target=_prefetch_loop, args=(weakref.ref(self), self._wanted, self._wanted_cv, self._prefetch_stop),
+                    daemon=True)
+                self._prefetch_thread.start()
+            self._wanted_cv.notify()
+
+
+def _prefetch_loop(provider_ref, wanted: list, wanted_cv: threading.Condition, stop: threading.Event) -> None:
+    while True:
+        with wanted_cv:
+            while not wanted and not stop.is_set():
+                wanted_cv.wait()
+            if stop.is_set():
+                return
+            frame = wanted.pop(0)
+        provider = provider_ref()
+        if provider is None:
+            return
+        if frame not in provider._cache:
+            provider._cached_figure(frame)
+        del provider
+
+
+def _stop_prefetch(stop: threading.Event, wanted_cv: threading.Condition) -> None:
+    with wanted_cv:
+        stop.set()
+        wanted_cv.notify_all()
+
+
+@dataclass
+class FrameTransportStats:
+    """
+    Payload size and server-side latency of animation frame callbacks.
+
+    Attributes
+    ----------
+    mode : {'figure', 'delta'}
+        Frame transport mode of the app.
+    payload_bytes : list of int
+        JSON size of each frame sent to the browser.
+    latency : list of float
+        Seconds spent in the server callback for each frame.
+    keyframes : int
+        Number of full frames sent in delta mode.
+    """
+    mode: str
+    payload_bytes: list = field(default_factory=list)
+    latency: list = field(default_factory=list)
+    keyframes: int = 0
+
+    def record(self, payload, started: float) -> None:
+        if isinstance(payload, dict):
+            nbytes = len(json.dumps(payload))
+        else:
+            nbytes = len(payload.to_json())
+        self.payload_bytes.append(nbytes)
+        self.latency.append(time.perf_counter() - started)
+
+    def summary(self) -> dict:
+        """
+        Aggregate statistics over all recorded frames.
+
+        Returns
+        -------
+        dict
+            Frame count, keyframe count, mean/p50/p99 payload bytes and
+            mean/p50/p99 callback latency in milliseconds.
+        """
+        if not self.payload_bytes:
+            return {"mode": self.mode, "frames": 0}
+        sizes = np.asarray(self.payload_bytes)
+        latency_ms = np.asarray(self.latency) * 1000
+        return {
+            "mode": self.mode,
+            "frames": len(sizes),
+            "keyframes": self.keyframes,
+            "mean_bytes": float(sizes.mean()),
+            "p50_bytes": float(np.percentile(sizes, 50)),
+            "p99_bytes": float(np.percentile(sizes, 99)),
+            "mean_latency_ms": float(latency_ms.mean()),
+            "p50_latency_ms": float(np.percentile(latency_ms, 50)),
+            "p99_latency_ms": float(np.percentile(latency_ms, 99)),
+        }
+
+    def __str__(self) -> str:
+        stats = self.summary()
+        if stats["frames"] == 0:
+            return f"{self.mode} transport: no frames sent"
+        return (f"{self.mode} transport: {stats['frames']} frames, "
+                f"payload mean {stats['mean_bytes']:,.0f} B (p99 {stats['p99_bytes']:,.0f} B), "
+                f"latency mean {stats['mean_latency_ms']:.1f} ms (p99 {stats['p99_latency_ms']:.1f} ms)")
+
+
+APPLY_FRAME_DELTA_JS = """
+function(payload, figure) {
+    if (!payload) {
+        return window.dash_clientside.no_update;
+    }
+    var orders = window._lobsterL3Orders;
+    if (payload.key || !orders) {
+        orders = new Map();
+    }
+    payload.removed.forEach(function(key) { orders.delete(key); });
+    payload.resized.forEach(function(item) {
+        var order = orders.get(item[0]);
+        if (order) { order[2] = item[1]; }
+    });
+    payload.added.forEach(function(item) { orders.set(item[0], [item[1], item[2], item[3]]); });
+    window._lobsterL3Orders = orders;
+
+    var bid = {x: [], y: []}, ask = {x: [], y: []};
+    orders.forEach(function(order) {
+        var trace = order[0] === "bid" ? bid : ask;
+        trace.x.push(order[2]);
+        trace.y.push(order[1]);
+    });
+    var data = figure.data.map(function(trace) {
+        var src = trace.name === "bid" ? bid : ask;
+        return Object.assign({}, trace, {x: src.x, y: src.y});
+    });
+    var layout = Object.assign({}, figure.layout, {title: {text: payload.title}});
+    return {data: data, layout: layout};
+}
+"""
@@ -0,0 +1,165 @@
+import logging
+import time
+from array import array
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ANOMALY_KINDS = ("price_not_found", "order_id_not_found")
+_KIND_CODES = {kind: code for code, kind in enumerate(ANOMALY_KINDS)}
+_EVENT_TYPES = ("submit", "cancel", "delete", "vis_exec", "hid_exec", "cross", "halt")
+_EVENT_TYPE_CODES = {event_type: code for code, event_type in enumerate(_EVENT_TYPES, start=1)}
+
+
+class AnomalyLog:
+    """
+    Compact record of messages that refer to a price or order missing from the book.
+
+    Anomalies are appended to typed arrays (no per-anomaly objects or log
+    records). Only the first `log_first` anomalies are logged individually;
+    after that a one-line summary is logged at most once every `log_interval`
+    seconds, so logging cost is bounded by time rather than by the number of
+    anomalies. Anomalies recorded since the last log line are counted in
+    `unreported`; call :meth:`log_summary` to report them.
+
+    Parameters
+    ----------
+    name : str, default=""
+        Name used in log lines (e.g. the ticker).
+    log_first : int, default=10
+        Number of anomalies logged in full before switching to summaries.
+    log_interval : float, default=10.0
+        Minimum wall-clock seconds between two summary lines.
+    log : logging.Logger, optional
+        Logger to write to. Defaults to this module's logger.
+
+    Attributes
+    ----------
+    msg_index : array
+        Index of the offending message (number of messages the book had processed before it).
+    kind : array
+        Index into :data:`ANOMALY_KINDS`.
+    event_type : array
+        LOBSTER event type code of the message.
+    order_id, price : array
+        Order ID and unscaled price of the message.
+    timestamp : array
+        Message timestamp.
+    """
+    def __init__(self, name: str = "", log_first: int = 10, log_interval: float = 10.0,
+                 log: logging.Logger = None):
+        self.name = name
+        self.log_first = log_first
+        self.log_interval = log_interval
+        self.logger = log or logger
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Drop every recorded anomaly and restart rate limiting.
+        """
+        self.msg_index = array('q')
+        self.kind = array('b')
+        self.event_type = array('b')
+        self.order_id = array('q')
+        self.price = array('q')
+        self.timestamp = array('d')
+        self._logged = 0
+        self._reported = 0
+        self._next_summary = 0.0
+
+    def __len__(self) -> int:
+        return len(self.msg_index)
+
+    def truncate(self, n: int) -> None:
+        """
+        Keep only the first `n` recorded anomalies (used when undoing messages).
+        """
+        for buf in (self.msg_index, self.kind, self.event_type, self.order_id, self.price, self.timestamp):
+            del buf[n:]
+        self._reported = min(self._reported, n)
+
+    def record(self, msg_index: int, kind: str, order) -> None:
+        """
+        Record one anomaly.
+
+        Parameters
+        ----------
+        msg_index : int
+            Index of the message.
+        kind : str
+            One of :data:`ANOMALY_KINDS`.
+        order : Order
+            The offending message.
+        """
+        self.msg_index.append(msg_index)
+        self.kind.append(_KIND_CODES[kind])
+        self.event_type.append(_EVENT_TYPE_CODES.get(order.event_type, 0))
+        self.order_id.append(order.order_id)
+        self.price.append(order.price)
+        self.timestamp.append(order.timestamp)
+
+        if self._logged < self.log_first:
+            self._logged += 1
+            self._reported = len(self)
+            self.logger.warning("%sMessage %d (%s order %s at price %s on %s side): %s.%s",
+                                self._prefix(), msg_index, order.event_type, order.order_id, order.price,
+                                order.direction, kind.replace("_", " "),
+                                " Further anomalies are summarised." if self._logged == self.log_first else "")
+            self._next_summary = time.monotonic() + self.log_interval
+        elif time.monotonic() >= self._next_summary:
+            self.log_summary()
+
+    @property
+    def unreported(self) -> int:
+        """Number of anomalies recorded since the last log line."""
+        return len(self) - self._reported
+
+    def counts(self) -> dict:
+        """
+        Number of anomalies per kind.
+
+        Returns
+        -------
+        dict
+            {kind: count} for every kind in :data:`ANOMALY_KINDS`.
+        """
+        counts = np.bincount(np.frombuffer(self.kind, dtype=np.int8), minlength=len(ANOMALY_KINDS))
+        return dict(zip(ANOMALY_KINDS, counts.tolist()))
+
+    def log_summary(self) -> None:
+        """
+        Log the anomaly totals now and restart the summary interval.
+        """
+        self._next_summary = time.monotonic() + self.log_interval
+        if not len(self):
+            return
+        self._reported = len(self)
+        counts = ", ".join(f"{kind.replace('_', ' ')}: {n}" for kind, n in self.counts().items() if n)
+        self.logger.warning("%s%d anomalies so far (%s), last at message %d.",
+                            self._prefix(), len(self), counts, self.msg_index[-1])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Recorded anomalies as a DataFrame.
+
+        Returns
+        -------
+        DataFrame
+            Columns `msg_index`, `timestamp`, `event_type`, `kind`, `order_id` and
+            `price`; `event_type` and `kind` are categorical.
+        """
+        return pd.DataFrame({
+            "msg_index": np.frombuffer(self.msg_index, dtype=np.int64).copy(),
+            "timestamp": np.frombuffer(self.timestamp, dtype=np.float64).copy(),
+            "event_type": pd.Categorical.from_codes(np.frombuffer(self.event_type, dtype=np.int8) - 1,
+                                                    categories=list(_EVENT_TYPES)),
+            "kind": pd.Categorical.from_codes(np.frombuffer(self.kind, dtype=np.int8),
+                                              categories=list(ANOMALY_KINDS)),
+            "order_id": np.frombuffer(self.order_id, dtype=np.int64).copy(),
+            "price": np.frombuffer(self.price, dtype=np.int64).copy(),
+        })
+
+    def _prefix(self) -> str:
+        return f"[{self.name}] " if self.name else ""
@@ -0,0 +1,242 @@
+import json
+import os
+import numpy as np
+
+from .orderbook import Orderbook, LOBSTER_DUMMY_ASK_PRICE, LOBSTER_DUMMY_BID_PRICE
+
+MANIFEST_NAME = "manifest.json"
+_FORMAT_VERSION = 1
+
+
+def midprice_change_labels(mid: np.ndarray, horizons) -> np.ndarray:
+    """
+    Change of the midprice `h` samples ahead, for every sample and horizon.
+
+    Parameters
+    ----------
+    mid : np.ndarray
+        Midprice per sample, NaN where undefined.
+    horizons : sequence of int
+        Steps ahead (>= 1).
+
+    Returns
+    -------
+    np.ndarray
+        float64 array of shape (len(mid), len(horizons)); entry (i, j) is
+        ``mid[i + horizons[j]] - mid[i]``, NaN past the end of `mid`.
+    """
+    mid = np.asarray(mid, dtype=np.float64)
+    labels = np.full((len(mid), len(horizons)), np.nan)
+    for j, h in enumerate(horizons):
+        if h < 1:
+            raise ValueError("horizons must be >= 1")
+        if h < len(mid):
+            labels[:-h, j] = mid[h:] - mid[:-h]
+    return labels
+
+
+def _mid_from_levels(levels: np.ndarray) -> np.ndarray:
+    ask, bid = levels[:, 0, 0], levels[:, 0, 2]
+    mid = (ask + bid) / 2
+    mid[(ask == LOBSTER_DUMMY_ASK_PRICE) | (bid == LOBSTER_DUMMY_BID_PRICE)] = np.nan
+    return mid
+
+
+class TensorDatasetWriter:
+    """
+    Write L2 samples of a replayed book into sharded memory-mapped ``.npy`` files.
+
+    Each shard holds up to `shard_size` new samples, preceded by the last
+    ``window - 1`` samples of the previous shard so that every window of
+    `window` consecutive samples lies inside one shard. :meth:`close` derives the
+    midprice and labels from the first level of the written tensors and writes
+    the manifest read by :class:`TensorDataset`.
+
+    Parameters
+    ----------
+    path : str
+        Output directory, created if needed.
+    n_samples : int
+        Number of samples that will be appended.
+    num_levels : int
+        Levels per side in each sample.
+    window : int
+        Samples per training window.
+    horizons : sequence of int
+        Label horizons in samples, see :func:`midprice_change_labels`.
+    shard_size : int
+        New samples per shard.
+    metadata : dict, optional
+        Extra JSON-serialisable entries for the manifest.
+    """
+    def __init__(self, path: str, n_samples: int, num_levels: int, window: int, horizons,
+                 shard_size: int, metadata: dict = None):
+        if window < 1 or shard_size < 1:
+            raise ValueError("window and shard_size must be >= 1")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.n_samples = n_samples
+        self.num_levels = num_levels
+        self.window = window
+        self.horizons = [int(h) for h in horizons]
+        self.shard_size = shard_size
+        self.metadata = metadata or {}
+        self.time = np.empty(n_samples, dtype=np.float64)
+        self.msg_index = np.empty(n_samples, dtype=np.int64)
+        self.shards = []
+        self._shard = None
+        self._shard_start = 0
+        self._shard_stop = 0
+        self.count = 0
+
+    def append(self, orderbook: Orderbook, timestamp: float, msg_index: int) -> None:
+        """
+        Write the current L2 state of `orderbook` as the next sample.
+        """
+        i = self.count
+        if i == self._shard_stop:
+            self._open_shard()
+        orderbook.convert_orderbook_to_L2_array(self.num_levels, out=self._shard[i - self._shard_start])
+        self.time[i] = timestamp
+        self.msg_index[i] = msg_index
+        self.count = i + 1
+
+    def _open_shard(self) -> None:
+        if self.count >= self.n_samples:
+            raise ValueError(f"all {self.n_samples} samples have already been written")
+        overlap = min(self.window - 1, self.count)
+        start = self.count - overlap
+        stop = min(self.count + self.shard_size, self.n_samples)
+        name = f"levels-{len(self.shards):05d}.npy"
+        shard = np.lib.format.open_memmap(os.path.join(self.path, name), mode="w+", dtype=np.int64,
+                                          shape=(stop - start, self.num_levels, 4))
+        if overlap:
+            shard[:overlap] = self._shard[len(self._shard) - overlap:]
+            self._shard.flush()
+        self.shards.append({"file": name, "start": start, "first": self.count, "rows": stop - start})
+        self._shard, self._shard_start, self._shard_stop = shard, start, stop
+
+    def close(self) -> str:
+        """
+        Flush the shards, write the per-sample arrays and the manifest.
+
+        Returns
+        -------
+        str
+            Path of the manifest.
+        """
+        if self.count != self.n_samples:
+            raise ValueError(f"expected {self.n_samples} samples, got {self.count}")
+        if self._shard is not None:
+            self._shard.flush()
+            self._shard = None
+        mid = np.empty(self.n_samples, dtype=np.float64)
+        for entry in self.shards:
+            levels = np.load(os.path.join(self.path, entry["file"]), mmap_mode="r")
+            overlap = entry["first"] - entry["start"]
+            mid[entry["first"]:entry["start"] + entry["rows"]] = _mid_from_levels(levels[overlap:])
+        arrays = {"time": self.time, "msg_index": self.msg_index, "mid": mid,
+                  "labels": midprice_change_labels(mid, self.horizons)}
+        for name, values in arrays.items():
+            np.save(os.path.join(self.path, name + ".npy"), values)
+
+        manifest = {
+            "format_version": _FORMAT_VERSION,
+            "n_samples": self.n_samples,
+            "num_levels": self.num_levels,
+            "window": self.window,
+            "horizons": self.horizons,
+            "columns": ["ask_price", "ask_size", "bid_price", "bid_size"],
+            "dtype": "int64",
+            "shards": self.shards,
+            "arrays": {name: name + ".npy" for name in arrays},
+            **self.metadata,
+        }
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=1)
+        return manifest_path
+
+
+class TensorDataset:
+    """
+    Random access to the windows of a dataset written by
+    :meth:`LobsterSim.write_tensor_dataset`.
+
+    The shards and per-sample arrays are memory-mapped read-only; a window is a
+    view into one shard, so reading one copies nothing until it is used.
+
+    Parameters
+    ----------
+    path : str
+        Dataset directory holding ``manifest.json``.
+
+    Attributes
+    ----------
+    manifest : dict
+        Parsed manifest.
+    window : int
+        Samples per window.
+    horizons : list of int
+        Label horizons in samples.
+    time, msg_index, mid : np.ndarray
+        Per-sample timestamp, index of the last applied message (-1 for none) and
+        unscaled midprice (NaN where a side is empty).
+    labels : np.ndarray
+        Per-sample midprice change for each horizon, shape (n_samples, len(horizons)).
+    """
+    def __init__(self, path: str):
+        with open(os.path.join(path, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset format: {self.manifest.get('format_version')!r}")
+        self.window = self.manifest["window"]
+        self.horizons = self.manifest["horizons"]
+        self.shards = [np.load(os.path.join(path, s["file"]), mmap_mode="r") for s in self.manifest["shards"]]
+        self._shard_start = np.array([s["start"] for s in self.manifest["shards"]], dtype=np.int64)
+        self._shard_first = np.array([s["first"] for s in self.manifest["shards"]], dtype=np.int64)
+        for name, file in self.manifest["arrays"].items():
+            setattr(self, name, np.load(os.path.join(path, file), mmap_mode="r"))
+
+    def __len__(self) -> int:
+        return max(self.manifest["n_samples"] - self.window + 1, 0)
+
+    def window_levels(self, i: int) -> np.ndarray:
+        """
+        Samples ``i, ..., i + window - 1`` as a read-only view of shape
+        (window, num_levels, 4).
+        """
+        if not 0 <= i < len(self):
+            raise IndexError(f"window {i} out of range for {len(self)} windows")
+        k = int(np.searchsorted(self._shard_first, i + self.window - 1, side="right")) - 1
+        local = i - self._shard_start[k]
+        return self.shards[k][local:local + self.window]
+
+    def __getitem__(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Window `i` and the labels of its last sample.
+        """
+        return self.window_levels(i), self.labels[i + self.window - 1]
+
+    def batch(self, indices) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Stack several windows and their labels into new arrays.
+
+        Returns
+        -------
+        levels : np.ndarray
+            int64 array of shape (len(indices), window, num_levels, 4).
+        labels : np.ndarray
+            float64 array of shape (len(indices), len(horizons)).
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        levels = np.stack([self.window_levels(int(i)) for i in indices]) if len(indices) else \
+            np.empty((0, self.window, self.manifest["num_levels"], 4), dtype=np.int64)
+        return levels, np.asarray(self.labels[indices + self.window - 1])
+
+    def valid_windows(self) -> np.ndarray:
+        """
+        Indices of the windows whose labels are all defined.
+        """
+        ok = ~np.isnan(np.asarray(self.labels[self.window - 1:])).any(axis=1)
+        return np.flatnonzero(ok)
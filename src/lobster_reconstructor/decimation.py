@@ -0,0 +1,147 @@
+import numpy as np
+
+
+def _envelope_indices(first: np.ndarray, lo: np.ndarray, hi: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """
+    Merge per-bucket (first, min, max, last) indices into one sorted, de-duplicated index array.
+    """
+    idx = np.sort(np.stack([first, lo, hi, last], axis=1), axis=1).ravel()
+    keep = np.ones(len(idx), dtype=bool)
+    keep[1:] = idx[1:] != idx[:-1]
+    return idx[keep]
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, n_buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a time series to a min/max/first/last envelope over equal-width x buckets.
+
+    Each bucket (typically one screen pixel wide) keeps at most four points: its
+    first and last samples and the samples holding its minimum and maximum, in x
+    order. Lines drawn through the result are visually identical to lines drawn
+    through the full series at that resolution.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sorted sample positions (e.g. timestamps).
+    y : np.ndarray
+        Sample values. NaN samples are dropped.
+    n_buckets : int
+        Number of buckets spanning ``[x[0], x[-1]]``.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Decimated (x, y). Returned unchanged if there are no more than
+        4 * `n_buckets` samples.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    finite = ~np.isnan(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    if len(x) <= 4 * n_buckets:
+        return x, y
+
+    span = float(x[-1] - x[0]) or 1.0
+    bucket = np.minimum(((x - x[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(x)]
+
+    order = np.lexsort((y, bucket))
+    idx = _envelope_indices(starts, order[starts], order[ends - 1], ends - 1)
+    return x[idx], y[idx]
+
+
+class DecimationPyramid:
+    """
+    Multi-resolution min/max/first/last envelope of a time series.
+
+    Level k summarises blocks of ``factor ** k`` consecutive samples. A query for a
+    visible x range picks the coarsest level that still has at least one block
+    per pixel in that range, so zooming in re-queries finer data from these
+    cached arrays instead of recomputing the series.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sorted sample positions (e.g. timestamps).
+    y : np.ndarray
+        Sample values. NaN samples are dropped.
+    factor : int, default=4
+        Number of blocks of one level merged into a block of the next level.
+    min_blocks : int, default=256
+        Stop adding levels once a level has fewer blocks than this.
+
+    Attributes
+    ----------
+    x, y : np.ndarray
+        Full-resolution series.
+    levels : list of tuple
+        Per level, the (block size, first, min, max, last) sample indices of each block.
+    """
+    def __init__(self, x: np.ndarray, y: np.ndarray, factor: int = 4, min_blocks: int = 256):
+        if factor < 2:
+            raise ValueError("factor must be >= 2")
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=np.float64)
+        finite = ~np.isnan(y)
+        self.x = x[finite]
+        self.y = y[finite]
+        self.factor = factor
+        self.levels = []
+
+        n = len(self.x)
+        lo = hi = np.arange(n)
+        size = 1
+        while len(lo) >= max(min_blocks, 1) * factor:
+            size *= factor
+            lo = self._merge(lo, np.argmin)
+            hi = self._merge(hi, np.argmax)
+            first = np.arange(len(lo)) * size
+            last = np.minimum(first + size, n) - 1
+            self.levels.append((size, first, lo, hi, last))
+
+    def _merge(self, child: np.ndarray, pick) -> np.ndarray:
+        pad = (-len(child)) % self.factor
+        if pad:
+            child = np.concatenate([child, np.repeat(child[-1], pad)])
+        groups = child.reshape(-1, self.factor)
+        return groups[np.arange(len(groups)), pick(self.y[groups], axis=1)]
+
+    def query(self, x0: float, x1: float, n_pixels: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Envelope of the series restricted to ``[x0, x1]`` at roughly pixel resolution.
+
+        Parameters
+        ----------
+        x0 : float
+            Start of the visible range.
+        x1 : float
+            End of the visible range.
+        n_pixels : int
+            Width of the plot area in pixels.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (x, y) with at most about 4 * `n_pixels` points.
+        """
+        start = np.searchsorted(self.x, x0, side="left")
+        stop = np.searchsorted(self.x, x1, side="right")
+        count = stop - start
+        if count <= 4 * n_pixels:
+            return self.x[start:stop], self.y[start:stop]
+
+        for size, first, lo, hi, last in reversed(self.levels):
+            if count // size >= n_pixels:
+                # Whole blocks come from the cached level; partial blocks at the edges
+                # (fewer than `size` samples each) are taken at full resolution.
+                b0, b1 = -(-start // size), stop // size
+                idx = np.concatenate([
+                    np.arange(start, b0 * size),
+                    _envelope_indices(first[b0:b1], lo[b0:b1], hi[b0:b1], last[b0:b1]),
+                    np.arange(b1 * size, stop),
+                ])
+                return minmax_decimate(self.x[idx], self.y[idx], n_pixels)
+        return minmax_decimate(self.x[start:stop], self.y[start:stop], n_pixels)
@@ -0,0 +1,220 @@
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+# Latency histogram buckets are powers of two in nanoseconds: bucket k counts
+# samples with 2**(k-1) <= ns < 2**k.
+N_LATENCY_BUCKETS = 40
+
+
+@dataclass
+class ReplayStats:
+    """
+    Counters and sampled timings collected while an instrumented book replays messages.
+
+    Created by :meth:`Orderbook.enable_instrumentation` or
+    :meth:`LobsterSim.enable_instrumentation`.
+
+    Attributes
+    ----------
+    sample_every : int
+        Time one in every `sample_every` calls of `process_order`.
+    book_size_every : int
+        Record the book size once every `book_size_every` events.
+    events : int
+        Number of processed events.
+    event_counts : Counter
+        Processed events per event type.
+    latency_buckets : dict
+        Per event type, an int64 array of power-of-two nanosecond bucket counts
+        of the sampled `process_order` latencies.
+    latency_sum : dict
+        Per event type, the total sampled latency in seconds.
+    anomalies : Counter
+        Anomalies keyed by (event type, kind), e.g. ("cancel", "price_not_found").
+    book_size : list
+        (timestamp, event number, bid levels, ask levels, resting orders) samples.
+    replay_seconds : float
+        Wall-clock seconds spent inside :class:`LobsterSim` replay loops.
+    replay_events : int
+        Events applied by those replay loops.
+    """
+    sample_every: int = 64
+    book_size_every: int = 1000
+    events: int = 0
+    event_counts: Counter = field(default_factory=Counter)
+    latency_buckets: dict = field(default_factory=dict)
+    latency_sum: dict = field(default_factory=dict)
+    anomalies: Counter = field(default_factory=Counter)
+    book_size: list = field(default_factory=list)
+    replay_seconds: float = 0.0
+    replay_events: int = 0
+
+    def record_latency(self, event_type: str, ns: int) -> None:
+        buckets = self.latency_buckets.get(event_type)
+        if buckets is None:
+            buckets = self.latency_buckets[event_type] = np.zeros(N_LATENCY_BUCKETS, dtype=np.int64)
+            self.latency_sum[event_type] = 0.0
+        buckets[min(ns.bit_length(), N_LATENCY_BUCKETS - 1)] += 1
+        self.latency_sum[event_type] += ns * 1e-9
+
+    def record_anomaly(self, event_type: str, kind: str) -> None:
+        self.anomalies[(event_type, kind)] += 1
+
+    def record_book_size(self, orderbook) -> None:
+        n_orders = sum(len(level) for level in orderbook.bids.values()) \
+            + sum(len(level) for level in orderbook.asks.values())
+        self.book_size.append((orderbook.curr_book_timestamp, self.events,
+                               len(orderbook.bids), len(orderbook.asks), n_orders))
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.replay_events / self.replay_seconds if self.replay_seconds > 0 else float("nan")
+
+    def latency_quantile(self, event_type: str, q: float) -> float:
+        """
+        Approximate latency quantile of `process_order` for one event type.
+
+        Parameters
+        ----------
+        event_type : str
+            Event type, e.g. "submit".
+        q : float
+            Quantile in [0, 1].
+
+        Returns
+        -------
+        float
+            Upper edge (seconds) of the histogram bucket holding the quantile,
+            or NaN if no sample was taken for `event_type`.
+        """
+        buckets = self.latency_buckets.get(event_type)
+        if buckets is None or not buckets.sum():
+            return float("nan")
+        k = int(np.searchsorted(np.cumsum(buckets), q * buckets.sum()))
+        return 2.0 ** k * 1e-9
+
+    def book_size_dataframe(self) -> pd.DataFrame:
+        """
+        Book size samples as a DataFrame with columns `timestamp`, `event`,
+        `bid_levels`, `ask_levels` and `orders`.
+        """
+        return pd.DataFrame(self.book_size, columns=["timestamp", "event", "bid_levels", "ask_levels", "orders"])
+
+    def summary(self) -> str:
+        """
+        Human-readable summary of the collected statistics.
+
+        Returns
+        -------
+        str
+            Multi-line summary.
+        """
+        lines = [f"{self.events} events ({self.events_per_sec:,.0f} events/s in replay)"]
+        for event_type, count in self.event_counts.most_common():
+            lines.append(f"  {event_type:<9} {count:>10}  p50 {self.latency_quantile(event_type, 0.5) * 1e6:8.2f} us"
+                         f"  p99 {self.latency_quantile(event_type, 0.99) * 1e6:8.2f} us")
+        for (event_type, kind), count in sorted(self.anomalies.items()):
+            lines.append(f"  anomaly {event_type}/{kind}: {count}")
+        return "\n".join(lines)
+
+    def to_prometheus(self, prefix: str = "lobster", labels: dict = None) -> str:
+        """
+        Render the statistics in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix : str, default="lobster"
+            Metric name prefix.
+        labels : dict, optional
+            Extra labels added to every sample (e.g. ``{"ticker": "AAPL"}``).
+
+        Returns
+        -------
+        str
+            Metrics text.
+        """
+        base = dict(labels or {})
+
+        def fmt(extra=None):
+            merged = {**base, **(extra or {})}
+            if not merged:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in merged.items()) + "}"
+
+        out = [f"# HELP {prefix}_events_total Messages processed by the order book.",
+               f"# TYPE {prefix}_events_total counter"]
+        out += [f"{prefix}_events_total{fmt({'event_type': t})} {n}" for t, n in sorted(self.event_counts.items())]
+
+        out += [f"# HELP {prefix}_process_order_seconds Sampled latency of Orderbook.process_order.",
+                f"# TYPE {prefix}_process_order_seconds histogram"]
+        for event_type, buckets in sorted(self.latency_buckets.items()):
+            cumulative = np.cumsum(buckets)
+            for k in range(N_LATENCY_BUCKETS - 1):
+                out.append(f"{prefix}_process_order_seconds_bucket{fmt({'event_type': event_type, 'le': f'{2.0 ** k * 1e-9:.9g}'})} "
+                           f"{cumulative[k]}")
+            out.append(f"{prefix}_process_order_seconds_bucket{fmt({'event_type': event_type, 'le': '+Inf'})} {cumulative[-1]}")
+            out.append(f"{prefix}_process_order_seconds_sum{fmt({'event_type': event_type})} {self.latency_sum[event_type]:.9g}")
+            out.append(f"{prefix}_process_order_seconds_count{fmt({'event_type': event_type})} {cumulative[-1]}")
+
+        out += [f"# HELP {prefix}_anomalies_total Messages referring to a price or order missing from the book.",
+                f"# TYPE {prefix}_anomalies_total counter"]
+        out += [f"{prefix}_anomalies_total{fmt({'event_type': t, 'kind': k})} {n}"
+                for (t, k), n in sorted(self.anomalies.items())]
+
+        out += [f"# HELP {prefix}_replay_events_per_second Replay throughput.",
+                f"# TYPE {prefix}_replay_events_per_second gauge",
+                f"{prefix}_replay_events_per_second{fmt()} {self.events_per_sec:.6g}"]
+        if self.book_size:
+            _, _, bid_levels, ask_levels, orders = self.book_size[-1]
+            out += [f"# HELP {prefix}_book_levels Price levels in the book at the last sample.",
+                    f"# TYPE {prefix}_book_levels gauge",
+                    f"{prefix}_book_levels{fmt({'side': 'bid'})} {bid_levels}",
+                    f"{prefix}_book_levels{fmt({'side': 'ask'})} {ask_levels}",
+                    f"# HELP {prefix}_book_orders Resting orders in the book at the last sample.",
+                    f"# TYPE {prefix}_book_orders gauge",
+                    f"{prefix}_book_orders{fmt()} {orders}"]
+        return "\n".join(out) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "lobster", labels: dict = None) -> None:
+        """
+        Write :meth:`to_prometheus` output to `path` atomically (write then rename),
+        as expected by the node exporter textfile collector.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus(prefix, labels))
+        os.replace(tmp_path, path)
+
+
+def instrument_process_order(orderbook, stats: ReplayStats):
+    """
+    Build an instrumented replacement for ``orderbook.process_order``.
+
+    The returned function wraps the `process_order` currently in place (the class
+    implementation or another instance wrapper); installing it as an instance
+    attribute leaves the class method (and every other book) untouched.
+    """
+    process_order = orderbook.process_order
+    event_counts = stats.event_counts
+    sample_every = max(1, stats.sample_every)
+    book_size_every = max(1, stats.book_size_every)
+    perf_counter_ns = time.perf_counter_ns
+
+    def instrumented_process_order(order):
+        stats.events += 1
+        n = stats.events
+        event_counts[order.event_type] += 1
+        if n % sample_every == 0:
+            t0 = perf_counter_ns()
+            process_order(order)
+            stats.record_latency(order.event_type, perf_counter_ns() - t0)
+        else:
+            process_order(order)
+        if n % book_size_every == 0:
+            stats.record_book_size(orderbook)
+
+    return instrumented_process_order
@@ -0,0 +1,181 @@
+from collections import deque
+
+from .orders import LimitOrder
+
+# OFI component each book-changing message can move, by (event type, direction)
+_OFI_PAIRS = {
+    ('submit', 'bid'): 'Lb', ('submit', 'ask'): 'La',
+    ('cancel', 'bid'): 'Db', ('cancel', 'ask'): 'Da',
+    ('delete', 'bid'): 'Db', ('delete', 'ask'): 'Da',
+    ('vis_exec', 'bid'): 'Mb', ('vis_exec', 'ask'): 'Ma',
+}
+# Component moved when the matching engine fills a submission against the other side
+_MATCHED_PAIR = {'bid': 'Ma', 'ask': 'Mb'}
+
+
+class UndoJournal:
+    """
+    Bounded record of the inverse of every message applied to an order book.
+
+    Each entry holds what one message changed, captured just before it was
+    applied: the touched resting order's timestamp, size and (if the message can
+    remove it) queue position, the opposite levels a matching-engine fill
+    consumed, the OFI component it moved, the lengths of the trade and anomaly
+    logs, the cached BBO and the book timestamps. Entries hold plain values, not
+    the order objects, so removed orders are not kept alive. When the journal is
+    full the oldest entries are dropped.
+
+    Created by :meth:`Orderbook.enable_journal`; undo with :meth:`Orderbook.undo`.
+
+    Parameters
+    ----------
+    capacity : int, default=100_000
+        Maximum number of messages that can be undone.
+    """
+    def __init__(self, capacity: int = 100_000):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.entries = deque(maxlen=capacity)
+        # Installed journaling process_order and the instance one it wraps (None: class method)
+        self._wrapper = None
+        self._previous = None
+
+    @property
+    def capacity(self) -> int:
+        return self.entries.maxlen
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+def _position(level: dict, order_id: int) -> int:
+    if next(iter(level)) == order_id:
+        return 0
+    for i, key in enumerate(level):
+        if key == order_id:
+            return i
+    return -1
+
+
+def journal_process_order(orderbook, journal: UndoJournal):
+    """
+    Build a journaling replacement for ``orderbook.process_order``.
+
+    The returned function wraps the `process_order` currently in place and
+    appends one entry to `journal` for every message that was applied.
+    """
+    process_order = orderbook.process_order
+    entries = journal.entries
+
+    def journaled_process_order(order):
+        direction = order.direction
+        if direction == 'bid':
+            side, opposite = orderbook.bids, orderbook.asks
+        elif direction == 'ask':
+            side, opposite = orderbook.asks, orderbook.bids
+        else:
+            return process_order(order)
+
+        ofi_before = order_before = levels_before = None
+        name = _OFI_PAIRS.get((order.event_type, direction))
+        if name is not None:
+            price, order_id = order.price, order.order_id
+            level = side.get(price)
+            resting = None if level is None else level.get(order_id)
+            if resting is None:
+                order_before = (direction, price, order_id, None, 0, -1)
+            else:
+                # The queue position only matters if the message can remove the order
+                removes = order.event_type == 'delete' or (order.event_type != 'submit' and order.size >= resting.size)
+                order_before = (direction, price, order_id, resting.timestamp, resting.size,
+                                _position(level, order_id) if removes else -1)
+            pair = getattr(orderbook.cum_OFI, name)
+            ofi_before = (name, pair.size, pair.count)
+            if order.event_type == 'submit' and orderbook._use_auto_matching_engine:
+                levels_before = []
+                for opposite_price, opposite_level in opposite.items():
+                    if (opposite_price > price) if direction == 'bid' else (opposite_price < price):
+                        break
+                    levels_before.append((opposite_price, [(o.order_id, o.timestamp, o.size)
+                                                           for o in opposite_level.values()]))
+                if levels_before:
+                    pair = getattr(orderbook.cum_OFI, _MATCHED_PAIR[direction])
+                    ofi_before += (_MATCHED_PAIR[direction], pair.size, pair.count)
+
+        entry = (orderbook.curr_book_timestamp, orderbook.midprice, orderbook.midprice_change_timestamp,
+                 len(orderbook.trade_log), len(orderbook.anomalies), orderbook._warning_count,
+                 orderbook._best_bid, orderbook._best_bid_size, orderbook._best_ask, orderbook._best_ask_size,
+                 orderbook.bbo_change_count, ofi_before, order_before, levels_before)
+        process_order(order)
+        entries.append(entry)
+
+    return journaled_process_order
+
+
+def undo(orderbook, journal: UndoJournal, n: int = 1) -> int:
+    """
+    Revert the last `n` journaled messages of `orderbook`, newest first.
+
+    Returns
+    -------
+    int
+        Number of messages reverted; fewer than `n` if the journal ran out.
+    """
+    entries = journal.entries
+    undone = 0
+    while undone < n and entries:
+        (timestamp, midprice, midprice_change_timestamp, n_trades, n_anomalies, warning_count,
+         best_bid, best_bid_size, best_ask, best_ask_size, bbo_change_count,
+         ofi_before, order_before, levels_before) = entries.pop()
+
+        if order_before is not None:
+            direction, price, order_id, timestamp_added, size, position = order_before
+            side = orderbook.bids if direction == 'bid' else orderbook.asks
+            if levels_before:
+                opposite = orderbook.asks if direction == 'bid' else orderbook.bids
+                opposite_direction = 'ask' if direction == 'bid' else 'bid'
+                for opposite_price, orders in levels_before:
+                    opposite[opposite_price] = {oid: LimitOrder(ts, oid, o_size, opposite_price, opposite_direction)
+                                                for oid, ts, o_size in orders}
+            level = side.get(price)
+            resting = None if level is None else level.get(order_id)
+            if timestamp_added is None:
+                # The message added the order (or did not touch the book)
+                if resting is not None:
+                    del level[order_id]
+                    if not level:
+                        del side[price]
+            elif resting is not None:
+                # Still queued (a submission may have replaced it under the same ID)
+                resting.timestamp, resting.size = timestamp_added, size
+            else:
+                resting = LimitOrder(timestamp_added, order_id, size, price, direction)
+                if level is None:
+                    side[price] = {order_id: resting}
+                elif 0 <= position < len(level):
+                    items = list(level.items())
+                    items.insert(position, (order_id, resting))
+                    side[price] = dict(items)
+                else:
+                    level[order_id] = resting
+            ofi = orderbook.cum_OFI
+            for i in range(0, len(ofi_before), 3):
+                pair = getattr(ofi, ofi_before[i])
+                pair.size, pair.count = ofi_before[i + 1], ofi_before[i + 2]
+
+        del orderbook.trade_log[n_trades:]
+        if len(orderbook.anomalies) > n_anomalies:
+            orderbook.anomalies.truncate(n_anomalies)
+        orderbook._warning_count = warning_count
+        orderbook._best_bid, orderbook._best_bid_size = best_bid, best_bid_size
+        orderbook._best_ask, orderbook._best_ask_size = best_ask, best_ask_size
+        orderbook.bbo_change_count = bbo_change_count
+        orderbook.curr_book_timestamp = timestamp
+        orderbook.midprice = midprice
+        orderbook.midprice_change_timestamp = midprice_change_timestamp
+        orderbook.message_count -= 1
+        undone += 1
+    return undone
@@ -0,0 +1,447 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+import numpy as np
+
+from .orderbook import Orderbook
+from .orders import Order
+from .loaders import _EVENT_TYPE_LABELS, _DIRECTION_LABELS
+from .parsers import UnsupportedFormat, _parse_block
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+# -------------------------
+# Decoding
+# -------------------------
+def decode_messages(lines: list) -> list:
+    """
+    Decode a batch of LOBSTER message lines into :class:`Order` objects.
+
+    The batch is parsed in one vectorized pass (see :mod:`parsers`); batches the
+    fast parser does not support are split line by line.
+
+    Parameters
+    ----------
+    lines : list of bytes
+        Message lines (``time,type,order_id,size,price,direction[,...]``), with or
+        without trailing newlines.
+
+    Returns
+    -------
+    list
+        One :class:`Order` per line, or None for lines that cannot be decoded
+        (unknown event type or direction, wrong field count, ...).
+    """
+    if not lines:
+        return []
+    buf = b"\n".join(line.rstrip(b"\r\n") for line in lines) + b"\n"
+    try:
+        values = _parse_block(np.frombuffer(buf, dtype=np.uint8), (0,))
+    except UnsupportedFormat:
+        return [_decode_line(line) for line in lines]
+    if values.shape[1] < 6 or len(values) != len(lines):
+        return [_decode_line(line) for line in lines]
+
+    event_type, direction = values[:, 1], values[:, 5]
+    event_labels = _EVENT_TYPE_LABELS[np.where((event_type >= 1) & (event_type <= 7), event_type, 0)]
+    direction_labels = _DIRECTION_LABELS[np.where(np.abs(direction) == 1, direction, 0) + 1]
+    return [Order(t, e, oid, size, price, d) if e is not None and d is not None else None
+            for t, e, oid, size, price, d in zip(values[:, 0].view(np.float64).tolist(), event_labels,
+                                                 values[:, 2].tolist(), values[:, 3].tolist(),
+                                                 values[:, 4].tolist(), direction_labels)]
+
+
+def _decode_line(line: bytes):
+    try:
+        fields = line.decode().strip().split(",")
+        t, event_type, order_id, size, price, direction = (float(fields[0]), *(int(f) for f in fields[1:6]))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not 1 <= event_type <= 7 or direction not in (1, -1):
+        return None
+    return Order(t, _EVENT_TYPE_LABELS[event_type], order_id, size, price, _DIRECTION_LABELS[direction + 1])
+
+
+# -------------------------
+# Feed statistics
+# -------------------------
+@dataclass
+class FeedStats:
+    """
+    Counters and end-to-end latencies of a :class:`LiveFeed`.
+
+    Latency is measured per message from the moment the line was received from
+    the source to the moment the message had been applied to the book.
+
+    Attributes
+    ----------
+    messages : int
+        Messages applied to the book.
+    rejected : int
+        Lines that could not be decoded or were refused by the book.
+    batches : int
+        Batches applied.
+    max_queue_depth : int
+        Largest number of messages waiting in the queue.
+    snapshots_published : int
+        Snapshots published to subscribers.
+    snapshots_dropped : int
+        Older snapshots discarded because a subscriber fell behind.
+    latency_history : int
+        Number of most recent per-message latencies kept in `recent_latencies`.
+    """
+    latency_history: int = 100_000
+    messages: int = 0
+    rejected: int = 0
+    batches: int = 0
+    max_queue_depth: int = 0
+    snapshots_published: int = 0
+    snapshots_dropped: int = 0
+    latency_sum: float = 0.0
+    latency_max: float = 0.0
+    _recent: np.ndarray = field(default=None, repr=False)
+    _recent_pos: int = field(default=0, repr=False)
+
+    def __post_init__(self):
+        self._recent = np.zeros(self.latency_history, dtype=np.float64)
+
+    def record_latencies(self, seconds: np.ndarray) -> None:
+        n = len(seconds)
+        if not n:
+            return
+        self.latency_sum += float(seconds.sum())
+        self.latency_max = max(self.latency_max, float(seconds.max()))
+        size = len(self._recent)
+        if n >= size:
+            self._recent[:] = seconds[-size:]
+            self._recent_pos = size
+            return
+        idx = (self._recent_pos + np.arange(n)) % size
+        self._recent[idx] = seconds
+        self._recent_pos += n
+
+    @property
+    def recent_latencies(self) -> np.ndarray:
+        """
+        Most recent per-message latencies in seconds, oldest first.
+        """
+        size = len(self._recent)
+        if self._recent_pos <= size:
+            return self._recent[:self._recent_pos].copy()
+        start = self._recent_pos % size
+        return np.concatenate([self._recent[start:], self._recent[:start]])
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency_sum / self.messages if self.messages else float("nan")
+
+    def latency_quantile(self, q: float) -> float:
+        """
+        Latency quantile in seconds over the most recent messages (NaN if none).
+        """
+        recent = self.recent_latencies
+        return float(np.quantile(recent, q)) if len(recent) else float("nan")
+
+
+@dataclass
+class BookSnapshot:
+    """
+    L2 state of a live book published to subscribers.
+
+    Attributes
+    ----------
+    timestamp : float
+        Book timestamp (seconds after midnight) of the last applied message.
+    messages : int
+        Number of messages applied so far.
+    levels : np.ndarray
+        int64 array of shape (num_levels, 4), see
+        :meth:`Orderbook.convert_orderbook_to_L2_array`.
+    wall_time : float
+        ``time.time()`` when the snapshot was taken.
+    """
+    timestamp: float
+    messages: int
+    levels: np.ndarray
+    wall_time: float
+
+
+class _Subscription:
+    def __init__(self, feed: "LiveFeed", maxsize: int):
+        self._feed = feed
+        self._maxsize = max(1, maxsize)
+        # Unbounded so the end marker always fits behind the buffered snapshots
+        self._queue = asyncio.Queue()
+
+    def _offer(self, snapshot) -> None:
+        # Snapshots are states: when the subscriber falls behind, the oldest is replaced
+        if snapshot is not _END and self._queue.qsize() >= self._maxsize:
+            self._queue.get_nowait()
+            self._feed.stats.snapshots_dropped += 1
+        self._queue.put_nowait(snapshot)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> BookSnapshot:
+        snapshot = await self._queue.get()
+        if snapshot is _END:
+            raise StopAsyncIteration
+        return snapshot
+
+    def close(self) -> None:
+        self._feed._subscriptions.discard(self)
+
+
+# -------------------------
+# Feed
+# -------------------------
+class LiveFeed:
+    """
+    Asyncio ingestion of a live LOBSTER message feed into an :class:`Orderbook`.
+
+    A reader task pulls lines from `source`, stamps their arrival time and puts
+    them on a bounded queue; an applier task takes everything waiting (up to
+    `batch_size` lines), decodes the batch in one pass and applies it to the book.
+    When the book falls behind, the queue fills up and the reader stops pulling
+    from the source, which for a socket pushes back on the sender through TCP flow
+    control. Batches therefore stay small while the feed is quiet and grow under
+    load.
+
+    After every applied batch the L2 state is published to subscribers, either
+    when it changed (the default) or at most once every `snapshot_interval`
+    seconds of wall-clock time.
+
+    Parameters
+    ----------
+    orderbook : Orderbook
+        Book to update.
+    source : async iterable of bytes
+        Message lines, e.g. :func:`read_lines` over a socket or :func:`replay_file`.
+    batch_size : int, default=1024
+        Maximum number of messages applied per batch.
+    max_pending : int, default=16384
+        Capacity of the queue, in messages, between the reader and the book.
+    snapshot_interval : float, optional
+        Publish at most once per this many wall-clock seconds. Publishes on every
+        change of the top `num_levels` levels if omitted.
+    num_levels : int, optional
+        Levels per side in snapshots. Defaults to the book's `nlevels`.
+
+    Attributes
+    ----------
+    stats : FeedStats
+        Throughput, queue and latency statistics.
+    """
+    def __init__(self, orderbook: Orderbook, source: AsyncIterator[bytes], batch_size: int = 1024,
+                 max_pending: int = 16384, snapshot_interval: float = None, num_levels: int = None):
+        if batch_size < 1 or max_pending < 1:
+            raise ValueError("batch_size and max_pending must be >= 1")
+        self.orderbook = orderbook
+        self.source = source
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.snapshot_interval = snapshot_interval
+        self.num_levels = num_levels or orderbook.nlevels
+        self.stats = FeedStats()
+        self._queue = None
+        self._subscriptions = set()
+        self._last_levels = None
+        self._last_publish = -math.inf
+
+    def subscribe(self, maxsize: int = 1) -> _Subscription:
+        """
+        Subscribe to book snapshots.
+
+        Parameters
+        ----------
+        maxsize : int, default=1
+            Snapshots buffered for this subscriber. When it is full, the oldest
+            snapshot is dropped, so a slow subscriber never stalls the feed.
+
+        Returns
+        -------
+        async iterator of BookSnapshot
+            Ends when the feed finishes. Call ``close()`` to unsubscribe early.
+        """
+        subscription = _Subscription(self, maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    async def run(self) -> FeedStats:
+        """
+        Consume the source until it is exhausted and every message has been applied.
+
+        Returns
+        -------
+        FeedStats
+            Final statistics.
+        """
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        reader = asyncio.create_task(self._read())
+        try:
+            await self._apply()
+        finally:
+            reader.cancel()
+            for subscription in list(self._subscriptions):
+                subscription._offer(_END)
+        await asyncio.gather(reader, return_exceptions=True)
+        return self.stats
+
+    async def _read(self) -> None:
+        queue = self._queue
+        try:
+            async for line in self.source:
+                await queue.put((line, time.perf_counter_ns()))
+            await queue.put((_END, None))
+        except Exception as exc:
+            await queue.put((exc, None))
+
+    async def _apply(self) -> None:
+        book = self.orderbook
+        stats = self.stats
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            stats.max_queue_depth = max(stats.max_queue_depth, queue.qsize() + 1)
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            lines, received = zip(*batch)
+            end = lines[-1] if received[-1] is None else None
+            if end is not None:
+                lines, received = lines[:-1], received[:-1]
+
+            applied = np.ones(len(lines), dtype=bool)
+            for i, order in enumerate(decode_messages(lines)):
+                try:
+                    if order is None:
+                        raise ValueError("undecodable message")
+                    book.process_order(order)
+                except ValueError as exc:
+                    applied[i] = False
+                    if not stats.rejected:
+                        logger.warning("Rejected live message %r: %s", lines[i], exc)
+                    stats.rejected += 1
+            done = time.perf_counter_ns()
+            latencies = (done - np.array(received, dtype=np.int64)[applied]) * 1e-9
+            stats.messages += int(applied.sum())
+            stats.batches += 1 if lines else 0
+            stats.record_latencies(latencies)
+            if lines:
+                self._maybe_publish()
+
+            if end is _END:
+                return
+            if end is not None:
+                raise end
+            # Let the reader and subscribers run between batches
+            await asyncio.sleep(0)
+
+    def _maybe_publish(self) -> None:
+        if not self._subscriptions:
+            return
+        now = time.monotonic()
+        if self.snapshot_interval is not None and now - self._last_publish < self.snapshot_interval:
+            return
+        levels = self.orderbook.convert_orderbook_to_L2_array(self.num_levels)
+        if self.snapshot_interval is None and self._last_levels is not None \
+                and np.array_equal(levels, self._last_levels):
+            return
+        self._last_levels = levels
+        self._last_publish = now
+        snapshot = BookSnapshot(self.orderbook.curr_book_timestamp, self.stats.messages, levels, time.time())
+        for subscription in list(self._subscriptions):
+            subscription._offer(snapshot)
+        self.stats.snapshots_published += 1
+
+
+# -------------------------
+# Sources
+# -------------------------
+async def read_lines(reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """
+    Yield the lines received on an asyncio stream until it closes.
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        yield line
+
+
+async def replay_file(msg_book_file_path: str, speed: float = 1.0) -> AsyncIterator[bytes]:
+    """
+    Yield the lines of a message file paced by their timestamps.
+
+    Parameters
+    ----------
+    msg_book_file_path : str
+        Uncompressed LOBSTER message.csv file path.
+    speed : float, default=1.0
+        Replay speed multiple: 1 is real time, 10 is ten times faster, ``math.inf``
+        emits as fast as the consumer accepts lines.
+    """
+    if speed <= 0:
+        raise ValueError("speed must be > 0")
+    start_wall = time.monotonic()
+    start_time = None
+    with open(msg_book_file_path, "rb") as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            if math.isfinite(speed):
+                t = float(line.split(b",", 1)[0])
+                if start_time is None:
+                    start_time = t
+                delay = (t - start_time) / speed - (time.monotonic() - start_wall)
+                # Sleep only when ahead of schedule by a noticeable margin
+                if delay > 0.001:
+                    await asyncio.sleep(delay)
+            elif not i % 1024:
+                # Unpaced: still let other tasks run now and then
+                await asyncio.sleep(0)
+            yield line
+
+
+async def serve_file(msg_book_file_path: str, host: str = "127.0.0.1", port: int = 0,
+                     speed: float = 1.0) -> asyncio.AbstractServer:
+    """
+    Start a local TCP publisher that replays a message file to every client.
+
+    Each connecting client receives the file from the start, paced as in
+    :func:`replay_file`. Writes wait for the socket to drain, so a slow client
+    slows its replay down instead of growing buffers.
+
+    Parameters
+    ----------
+    msg_book_file_path : str
+        Uncompressed LOBSTER message.csv file path.
+    host : str, default="127.0.0.1"
+        Interface to listen on.
+    port : int, default=0
+        Port to listen on; 0 picks a free port (see ``server.sockets[0].getsockname()``).
+    speed : float, default=1.0
+        Replay speed multiple.
+
+    Returns
+    -------
+    asyncio.AbstractServer
+        The running server. Close it with ``server.close()``.
+    """
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            async for line in replay_file(msg_book_file_path, speed):
+                writer.write(line if line.endswith(b"\n") else line + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
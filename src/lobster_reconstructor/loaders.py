@@ -0,0 +1,814 @@
+import bz2
+import gzip
+import hashlib
+import io
+import lzma
+import os
+import queue
+import struct
+import threading
+import zipfile
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+from .parsers import UnsupportedFormat, parse_message_arrays, parse_numeric_csv
+
+MESSAGE_COLUMNS = ["Time", "Type", "OrderID", "Size", "Price", "Direction"]
+
+EVENT_TYPE_MAP = {
+    1: 'submit',
+    2: 'cancel',
+    3: 'delete',
+    4: 'vis_exec',
+    5: 'hid_exec',
+    6: 'cross',
+    7: 'halt'
+}
+
+DIRECTION_MAP = {-1: 'ask', 1: 'bid'}
+
+EVENT_TYPE_CODES = {name: code for code, name in EVENT_TYPE_MAP.items()}
+DIRECTION_CODES = {name: code for code, name in DIRECTION_MAP.items()}
+
+_EVENT_TYPE_LABELS = np.array([None] + [EVENT_TYPE_MAP[code] for code in range(1, 8)], dtype=object)
+_DIRECTION_LABELS = np.array(['ask', None, 'bid'], dtype=object)
+
+_MESSAGE_CSV_OPTIONS = dict(
+    header=None,
+    names=MESSAGE_COLUMNS,
+    usecols=range(len(MESSAGE_COLUMNS)),  # drop any extra columns in the file
+    dtype={
+        "Time": float,
+        "Type": "Int64",
+        "OrderID": "Int64",
+        "Size": "Int64",
+        "Price": "Int64",
+        "Direction": "Int64"
+    },
+    na_values=["", "NA"],         # treat blanks as NaN
+    low_memory=False
+)
+
+
+COMPRESSED_EXTENSIONS = (".gz", ".xz", ".lzma", ".bz2", ".zip", ".zst", ".zstd")
+
+
+def is_compressed(path) -> bool:
+    """
+    Whether `path` names a compressed file that :func:`open_decompressed` can read.
+    """
+    return isinstance(path, (str, os.PathLike)) and str(path).lower().endswith(COMPRESSED_EXTENSIONS)
+
+
+def _open_zip_member(path: str):
+    archive = zipfile.ZipFile(path)
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    if not members:
+        archive.close()
+        raise ValueError(f"Zip archive {path} contains no files.")
+    member = archive.open(members[0])
+    member_close = member.close
+
+    def close():
+        member_close()
+        archive.close()
+    member.close = close
+    return member
+
+
+def _open_zstd(path: str):
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError("Reading .zst files requires the optional 'zstandard' package "
+                          "(pip install zstandard).") from exc
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+_DECOMPRESSORS = {
+    ".gz": lambda path: gzip.open(path, "rb"),
+    ".xz": lambda path: lzma.open(path, "rb"),
+    ".lzma": lambda path: lzma.open(path, "rb"),
+    ".bz2": lambda path: bz2.open(path, "rb"),
+    ".zip": _open_zip_member,
+    ".zst": _open_zstd,
+    ".zstd": _open_zstd,
+}
+
+
+class _ThreadedDecompressor(io.RawIOBase):
+    """
+    Raw binary stream whose bytes are decompressed ahead of time by a worker thread.
+
+    zlib, lzma, bz2 and zstandard release the GIL while decompressing, so the
+    worker overlaps with parsing in the consuming thread.
+    """
+    def __init__(self, opener, block_size: int, max_blocks: int):
+        super().__init__()
+        self._queue = queue.Queue(maxsize=max_blocks)
+        self._stop = threading.Event()
+        self._block = b""
+        self._pos = 0
+        self._eof = False
+        self._thread = threading.Thread(target=self._run, args=(opener, block_size), daemon=True)
+        self._thread.start()
+
+    def _run(self, opener, block_size: int) -> None:
+        try:
+            with opener() as source:
+                while not self._stop.is_set():
+                    block = source.read(block_size)
+                    if not block:
+                        break
+                    self._put(block)
+        except Exception as exc:
+            self._put(exc)
+            return
+        self._put(None)
+
+    def _put(self, item) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while self._pos >= len(self._block):
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+                return 0
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            self._block, self._pos = item, 0
+        n = min(len(buffer), len(self._block) - self._pos)
+        buffer[:n] = self._block[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._thread.join(timeout=1)
+        super().close()
+
+
+def open_decompressed(path: str, block_size: int = 1 << 20, max_blocks: int = 8) -> io.BufferedReader:
+    """
+    Open a compressed file as a binary stream decompressed in a background thread.
+
+    Parameters
+    ----------
+    path : str
+        File ending in .gz, .xz/.lzma, .bz2, .zip (first member is read) or
+        .zst/.zstd (requires the optional `zstandard` package).
+    block_size : int, default=1 MiB
+        Number of decompressed bytes handed over at a time.
+    max_blocks : int, default=8
+        Maximum number of decompressed blocks buffered ahead of the reader.
+
+    Returns
+    -------
+    io.BufferedReader
+        Stream of decompressed bytes. Close it to stop the worker thread.
+
+    Raises
+    ------
+    ValueError
+        If the extension is not a supported compression format.
+    """
+    ext = os.path.splitext(str(path).lower())[1]
+    if ext not in _DECOMPRESSORS:
+        raise ValueError(f"Unsupported compressed file: {path}")
+    opener = _DECOMPRESSORS[ext]
+    return io.BufferedReader(_ThreadedDecompressor(lambda: opener(path), block_size, max_blocks), block_size)
+
+
+def _open_source(path):
+    """
+    Open `path` for parsing: compressed files are decompressed in a background
+    thread, other paths and buffers are passed through unchanged.
+    """
+    return open_decompressed(path) if is_compressed(path) else None
+
+
+def read_message_arrays(msg_book_file_path: str) -> dict:
+    """
+    Parse an uncompressed message file with the parallel fixed-schema parser.
+
+    Parameters
+    ----------
+    msg_book_file_path : str
+        LOBSTER message.csv file path.
+
+    Returns
+    -------
+    dict
+        Typed arrays in the layout of :meth:`LobsterSim.message_arrays`. Unknown
+        event type and direction codes are stored as 0.
+
+    Raises
+    ------
+    UnsupportedFormat
+        If the file does not fit the plain numeric schema (see :mod:`parsers`).
+    """
+    return parse_message_arrays(msg_book_file_path)
+
+
+def message_frame_from_arrays(arrays: dict) -> pd.DataFrame:
+    """
+    Build the message DataFrame of :func:`read_message_file` from typed arrays.
+
+    Event type and direction codes are translated with lookup arrays.
+
+    Parameters
+    ----------
+    arrays : dict
+        Arrays from :func:`read_message_arrays`.
+
+    Returns
+    -------
+    DataFrame
+        Message data with the columns and dtypes of :func:`read_message_file`.
+    """
+    return pd.DataFrame({
+        "Time": arrays["time"],
+        "Type": pd.Series(_EVENT_TYPE_LABELS[arrays["type"]]),
+        "OrderID": pd.array(arrays["order_id"], dtype="Int64"),
+        "Size": pd.array(arrays["size"], dtype="Int64"),
+        "Price": pd.array(arrays["price"], dtype="Int64"),
+        "Direction": pd.Series(_DIRECTION_LABELS[arrays["direction"] + 1]),
+    })
+
+
+def message_arrays_from_frame(dataM: pd.DataFrame) -> dict:
+    """
+    Convert a message DataFrame of :func:`read_message_file` into typed arrays.
+
+    Parameters
+    ----------
+    dataM : DataFrame
+        Message data with string event type and direction labels.
+
+    Returns
+    -------
+    dict
+        Arrays in the layout of :func:`read_message_arrays`. Missing values and
+        unknown labels are stored as 0.
+    """
+    return {
+        "time": dataM["Time"].to_numpy(dtype=np.float64),
+        "type": dataM["Type"].map(EVENT_TYPE_CODES).fillna(0).to_numpy(dtype=np.int8),
+        "order_id": dataM["OrderID"].to_numpy(dtype=np.int64, na_value=0),
+        "size": dataM["Size"].to_numpy(dtype=np.int64, na_value=0),
+        "price": dataM["Price"].to_numpy(dtype=np.int64, na_value=0),
+        "direction": dataM["Direction"].map(DIRECTION_CODES).fillna(0).to_numpy(dtype=np.int8),
+    }
+
+
+def load_message_arrays(msg_book_file_path: str) -> dict:
+    """
+    Read a message file into typed arrays, with the fast parser when the file allows it.
+
+    Parameters
+    ----------
+    msg_book_file_path : str
+        LOBSTER message.csv file path, possibly compressed.
+
+    Returns
+    -------
+    dict
+        Arrays in the layout of :func:`read_message_arrays`.
+    """
+    if not is_compressed(msg_book_file_path):
+        try:
+            return read_message_arrays(msg_book_file_path)
+        except UnsupportedFormat:
+            pass
+    return message_arrays_from_frame(read_message_file(msg_book_file_path))
+
+
+def read_message_file(msg_book_file_path) -> pd.DataFrame:
+    """
+    Read a LOBSTER message.csv file into a DataFrame.
+
+    Plain uncompressed files are parsed with the parallel fixed-schema parser
+    (:func:`read_message_arrays`); files it does not support (blank fields,
+    compressed files, buffers, ...) are read with pandas.
+
+    Parameters
+    ----------
+    msg_book_file_path : str or file-like
+        LOBSTER message.csv file path, or a buffer holding message rows. Compressed
+        files (see :func:`open_decompressed`) are read directly.
+
+    Returns
+    -------
+    DataFrame
+        Message data with columns `Time`, `Type`, `OrderID`, `Size`, `Price` and
+        `Direction`. Event type and direction codes are translated to their string
+        labels (see :class:`Order`).
+    """
+    if isinstance(msg_book_file_path, (str, os.PathLike)) and not is_compressed(msg_book_file_path):
+        try:
+            return message_frame_from_arrays(read_message_arrays(msg_book_file_path))
+        except UnsupportedFormat:
+            pass
+
+    source = _open_source(msg_book_file_path)
+    if source is None:
+        dataM = pd.read_csv(msg_book_file_path, **_MESSAGE_CSV_OPTIONS)
+    else:
+        with source:
+            dataM = pd.read_csv(source, **_MESSAGE_CSV_OPTIONS)
+    return _translate_message_codes(dataM)
+
+
+def _translate_message_codes(dataM: pd.DataFrame) -> pd.DataFrame:
+    dataM['Type'] = dataM['Type'].map(EVENT_TYPE_MAP)
+    dataM['Direction'] = dataM['Direction'].map(DIRECTION_MAP)
+    return dataM
+
+
+def iter_message_chunks(msg_book_file_path, chunk_size: int = 100_000):
+    """
+    Read a LOBSTER message.csv file in fixed-size chunks.
+
+    Parameters
+    ----------
+    msg_book_file_path : str or file-like
+        LOBSTER message.csv file path, or a buffer holding message rows. Compressed
+        files (see :func:`open_decompressed`) are read directly.
+    chunk_size : int, default=100_000
+        Number of messages per chunk.
+
+    Yields
+    ------
+    DataFrame
+        Consecutive chunks in the format of :func:`read_message_file`.
+    """
+    source = _open_source(msg_book_file_path)
+    try:
+        with pd.read_csv(source if source is not None else msg_book_file_path,
+                         chunksize=chunk_size, **_MESSAGE_CSV_OPTIONS) as reader:
+            for chunk in reader:
+                yield _translate_message_codes(chunk)
+    finally:
+        if source is not None:
+            source.close()
+
+
+def orderbook_column_names(num_levels: int) -> list[str]:
+    """
+    Column names of a LOBSTER orderbook.csv file with `num_levels` levels.
+
+    Parameters
+    ----------
+    num_levels : int
+        Number of price levels per side stored in the file.
+
+    Returns
+    -------
+    list of str
+        Names in file order: AskPrice1, AskSize1, BidPrice1, BidSize1, AskPrice2, ...
+    """
+    col_names = []
+    for i in range(1, num_levels + 1):
+        col_names.extend([
+            f"AskPrice{i}", f"AskSize{i}",
+            f"BidPrice{i}", f"BidSize{i}"
+        ])
+    return col_names
+
+
+_NPY_HEADER_LEN = 128
+
+
+def _npy_header(shape: tuple) -> bytes:
+    """
+    Version 1.0 ``.npy`` header for a C-ordered int64 array, padded to a fixed
+    length so it can be rewritten in place once the row count is known.
+    """
+    header = "{'descr': '<i8', 'fortran_order': False, 'shape': (%d, %d), }" % shape
+    header = header.ljust(_NPY_HEADER_LEN - 11) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def _iter_orderbook_chunks(lob_book_file_path: str, chunk_size: int = 100_000):
+    source = _open_source(lob_book_file_path)
+    try:
+        try:
+            reader = pd.read_csv(source if source is not None else lob_book_file_path, header=None,
+                                 dtype=np.int64, chunksize=chunk_size)
+        except pd.errors.EmptyDataError:
+            raise ValueError(f"Orderbook file {lob_book_file_path!r} has no rows.") from None
+        with reader:
+            chunks = iter(reader)
+            while True:
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                except ValueError as exc:
+                    raise ValueError(f"Orderbook file {lob_book_file_path!r} has non-integer values "
+                                     "(LOBSTER orderbook files have no header row).") from exc
+                if chunk.shape[1] % 4 != 0:
+                    raise ValueError("Orderbook file column count is not a multiple of 4.")
+                yield chunk.to_numpy(dtype=np.int64)
+    finally:
+        if source is not None:
+            source.close()
+
+
+def _write_npy_stream(path: str, chunks) -> None:
+    """
+    Write int64 row chunks to a ``.npy`` file as they arrive, without holding
+    the whole array in memory.
+    """
+    tmp_path = path + ".tmp"
+    rows, cols = 0, 0
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_npy_header((0, 0)))
+            for chunk in chunks:
+                rows += chunk.shape[0]
+                cols = chunk.shape[1]
+                f.write(np.ascontiguousarray(chunk, dtype="<i8").tobytes())
+            f.seek(0)
+            f.write(_npy_header((rows, cols)))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_orderbook_array(lob_book_file_path: str, cache: bool = True, cache_dir: str = None) -> np.ndarray:
+    """
+    Load a LOBSTER orderbook.csv file as an int64 array.
+
+    When `cache` is True, the parsed array is stored as ``<file>.npy`` (next to
+    the CSV, or in `cache_dir`) and memory-mapped on subsequent loads, so only the rows that
+    are actually touched are read from disk. The cache is rebuilt whenever the
+    CSV is newer than it. If the cache cannot be written (e.g. read-only
+    directory), the parsed in-memory array is returned instead.
+
+    Plain files are parsed with the parallel fixed-schema parser
+    (:func:`parse_numeric_csv`). Compressed files (see :func:`open_decompressed`)
+    are read directly; the cache is then written chunk by chunk from the
+    decompressed stream.
+
+    Parameters
+    ----------
+    lob_book_file_path : str
+        LOBSTER orderbook.csv file path.
+    cache : bool, default=True
+        Whether to read from and write to the binary ``.npy`` cache.
+    cache_dir : str, optional
+        Directory for the cache, created if needed, so that nothing is written
+        next to the data files. See :func:`cache_path`.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_rows, 4 * num_levels) in file column order.
+
+    Raises
+    ------
+    ValueError
+        If the file has no rows, non-integer values (e.g. a header row), or a
+        column count that is not a multiple of 4.
+    """
+    npy_path = cache_path(lob_book_file_path, ".npy", cache_dir) if cache else None
+    if cache and not _is_stale(npy_path, lob_book_file_path):
+        dataL = np.load(npy_path, mmap_mode='r')
+        if dataL.ndim == 2 and dataL.shape[1] % 4 == 0:
+            return dataL
+
+    dataL = None
+    if not is_compressed(lob_book_file_path):
+        try:
+            dataL = parse_numeric_csv(lob_book_file_path)
+        except UnsupportedFormat:
+            pass
+        else:
+            if dataL.shape[1] % 4 != 0:
+                raise ValueError("Orderbook file column count is not a multiple of 4.")
+
+    if cache:
+        try:
+            if dataL is None:
+                _write_npy_stream(npy_path, _iter_orderbook_chunks(lob_book_file_path))
+            else:
+                np.save(npy_path, dataL)
+            return np.load(npy_path, mmap_mode='r')
+        except OSError:
+            pass
+    if dataL is None:
+        dataL = np.concatenate(list(_iter_orderbook_chunks(lob_book_file_path)))
+    return dataL
+
+
+def cache_path(source_path: str, suffix: str, cache_dir: str = None) -> str:
+    """
+    Path of a cache file derived from `source_path`.
+
+    Parameters
+    ----------
+    source_path : str
+        Data file the cache is built from.
+    suffix : str
+        Cache file suffix, e.g. ``".npy"``.
+    cache_dir : str, optional
+        Directory to keep the cache in, created if needed. The file name then
+        carries a hash of the absolute source path, so files with the same name
+        in different directories do not collide. Defaults to the source file's
+        directory (``<source><suffix>``).
+
+    Returns
+    -------
+    str
+        Cache file path.
+    """
+    if cache_dir is None:
+        return source_path + suffix
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = hashlib.sha1(os.path.abspath(source_path).encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{os.path.basename(source_path)}-{digest}{suffix}")
+
+
+def _is_stale(path: str, source_path: str) -> bool:
+    return not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(source_path)
+
+
+# -------------------------
+# Time-windowed loading
+# -------------------------
+@dataclass
+class MessageIndex:
+    """
+    Sparse index of a message file mapping timestamps to byte offsets.
+
+    Every `every`-th line of the file is recorded with its timestamp and byte
+    offset, so a time window can be read by seeking instead of parsing the file
+    from the start.
+
+    Attributes
+    ----------
+    time : np.ndarray
+        Timestamp of each indexed line.
+    offset : np.ndarray
+        Byte offset of each indexed line.
+    line : np.ndarray
+        Line number (0-based message index) of each indexed line.
+    n_lines : int
+        Number of lines in the file.
+    file_size : int
+        Size of the file in bytes.
+    """
+    time: np.ndarray
+    offset: np.ndarray
+    line: np.ndarray
+    n_lines: int
+    file_size: int
+
+    def locate_line(self, line: int) -> tuple[int, int]:
+        """
+        Byte offset of the closest indexed line at or before `line`.
+
+        Returns
+        -------
+        tuple of int
+            (byte offset, line number at that offset).
+        """
+        i = max(int(np.searchsorted(self.line, line, side='right')) - 1, 0)
+        return int(self.offset[i]), int(self.line[i])
+
+    def end_offset(self, end_time: float) -> int:
+        """
+        Byte offset before which every line with timestamp <= `end_time` lies.
+        """
+        i = int(np.searchsorted(self.time, end_time, side='right'))
+        return int(self.offset[i]) if i < len(self.offset) else self.file_size
+
+
+def _ends_with_newline(f, file_size: int) -> bool:
+    f.seek(file_size - 1)
+    return f.read(1) == b"\n"
+
+
+def build_message_index(msg_book_file_path: str, every: int = 1024, block_size: int = 1 << 24) -> MessageIndex:
+    """
+    Index a message file with a single line scan.
+
+    Newlines are located block by block with NumPy; only the indexed lines are
+    parsed for their timestamp.
+
+    Parameters
+    ----------
+    msg_book_file_path : str
+        LOBSTER message.csv file path.
+    every : int, default=1024
+        Record every `every`-th line.
+    block_size : int, default=16 MiB
+        Number of bytes scanned at a time.
+
+    Returns
+    -------
+    MessageIndex
+        Index of the file.
+    """
+    file_size = os.path.getsize(msg_book_file_path)
+    offsets = [np.zeros(1, dtype=np.int64)] if file_size else []
+    n_lines = 0
+    with open(msg_book_file_path, "rb") as f:
+        pos = 0
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            starts = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10) + pos + 1
+            line_numbers = n_lines + 1 + np.arange(len(starts))
+            offsets.append(starts[(line_numbers % every == 0) & (starts < file_size)])
+            n_lines += len(starts)
+            pos += len(block)
+        if file_size and not _ends_with_newline(f, file_size):
+            n_lines += 1
+
+        offset = np.concatenate(offsets) if offsets else np.zeros(0, dtype=np.int64)
+        times = np.empty(len(offset), dtype=np.float64)
+        for i, off in enumerate(offset.tolist()):
+            f.seek(off)
+            times[i] = float(f.readline().split(b",", 1)[0])
+
+    return MessageIndex(times, offset.astype(np.int64), np.arange(len(offset), dtype=np.int64) * every,
+                        n_lines, file_size)
+
+
+def load_message_index(msg_book_file_path: str, every: int = 1024, cache: bool = True,
+                       cache_dir: str = None) -> MessageIndex:
+    """
+    Load the sidecar index ``<file>.idx.npz`` of a message file, building it if needed.
+
+    Parameters
+    ----------
+    msg_book_file_path : str
+        LOBSTER message.csv file path.
+    every : int, default=1024
+        Line spacing used when the index has to be built.
+    cache : bool, default=True
+        Whether to read and write the sidecar file. The index is rebuilt when the
+        message file is newer than it.
+    cache_dir : str, optional
+        Directory for the sidecar file instead of the message file's directory,
+        see :func:`cache_path`.
+
+    Returns
+    -------
+    MessageIndex
+        Index of the file.
+    """
+    index_path = cache_path(msg_book_file_path, ".idx.npz", cache_dir)
+    if cache and not _is_stale(index_path, msg_book_file_path):
+        with np.load(index_path) as data:
+            return MessageIndex(data["time"], data["offset"], data["line"], int(data["n_lines"]), int(data["file_size"]))
+
+    index = build_message_index(msg_book_file_path, every)
+    if cache:
+        try:
+            np.savez(index_path, time=index.time, offset=index.offset, line=index.line,
+                     n_lines=index.n_lines, file_size=index.file_size)
+        except OSError:
+            pass
+    return index
+
+
+def read_message_window(msg_book_file_path: str, index: MessageIndex, start_line: int = 0,
+                        end_time: float = None) -> pd.DataFrame:
+    """
+    Read the messages from line `start_line` up to and including `end_time`.
+
+    Only the byte range covering those lines (rounded out to the index spacing)
+    is read from disk.
+
+    Parameters
+    ----------
+    msg_book_file_path : str
+        LOBSTER message.csv file path.
+    index : MessageIndex
+        Index of the file, see :func:`load_message_index`.
+    start_line : int, default=0
+        First message (0-based line number) to return.
+    end_time : float, optional
+        Last timestamp (inclusive) to return. Defaults to the end of the file.
+
+    Returns
+    -------
+    DataFrame
+        Messages in the format of :func:`read_message_file`, indexed from 0.
+    """
+    start_offset, indexed_line = index.locate_line(start_line)
+    end_offset = index.file_size if end_time is None else index.end_offset(end_time)
+    with open(msg_book_file_path, "rb") as f:
+        f.seek(start_offset)
+        data = f.read(max(end_offset - start_offset, 0))
+    if not data.strip():
+        return pd.DataFrame({name: pd.Series(dtype=float if name == "Time" else object) for name in MESSAGE_COLUMNS})
+
+    dataM = read_message_file(io.BytesIO(data)).iloc[start_line - indexed_line:]
+    if end_time is not None:
+        dataM = dataM[dataM["Time"] <= end_time]
+    return dataM.reset_index(drop=True)
+
+
+def book_snapshot_path(msg_book_file_path: str) -> str:
+    """
+    Path of the sidecar book snapshot file of a message file (``<file>.books.npz``).
+    """
+    return msg_book_file_path + ".books.npz"
+
+
+def write_book_snapshots(path: str, snapshots: list, source_path: str = None) -> None:
+    """
+    Store several order book states in one ``.npz`` file.
+
+    Parameters
+    ----------
+    path : str
+        Output file path.
+    snapshots : list of tuple
+        (time, message line, state) triples, where `message line` is the number of
+        messages applied to reach the state and `state` comes from
+        :meth:`Orderbook.export_state`. Must be sorted by time.
+    source_path : str, optional
+        Message file the snapshots were replayed from. Its size and modification
+        time are stored so :func:`read_book_snapshot` can detect a changed file.
+    """
+    order_fields = ("direction", "price", "order_id", "size", "timestamp")
+    scalar_fields = ("curr_book_timestamp", "midprice", "midprice_change_timestamp")
+    counts = [len(state["price"]) for _, _, state in snapshots]
+    arrays = {
+        "time": np.array([t for t, _, _ in snapshots], dtype=np.float64),
+        "line": np.array([line for _, line, _ in snapshots], dtype=np.int64),
+        "order_offsets": np.r_[0, np.cumsum(counts)].astype(np.int64),
+    }
+    for name in scalar_fields:
+        arrays[name] = np.array([state[name] for _, _, state in snapshots], dtype=np.float64)
+    for name in order_fields:
+        arrays[name] = np.concatenate([state[name] for _, _, state in snapshots]) if snapshots else np.zeros(0)
+    if source_path is not None:
+        arrays["source_size"] = np.int64(os.path.getsize(source_path))
+        arrays["source_mtime"] = np.float64(os.path.getmtime(source_path))
+    np.savez(path, **arrays)
+
+
+def read_book_snapshot(path: str, time: float, source_path: str = None) -> tuple[int, dict] | None:
+    """
+    Latest stored book state taken at or before `time`.
+
+    Parameters
+    ----------
+    path : str
+        Snapshot file written by :func:`write_book_snapshots`.
+    time : float
+        Timestamp (seconds after midnight).
+    source_path : str, optional
+        Message file the snapshots should belong to. The snapshots are ignored if
+        it is newer than `path`, or its size or modification time differ from the
+        ones stored by :func:`write_book_snapshots`.
+
+    Returns
+    -------
+    tuple or None
+        (message line, state) with `state` suitable for
+        :meth:`Orderbook.restore_state`, or None if no snapshot precedes `time` or
+        the snapshots are stale.
+    """
+    if source_path is not None and _is_stale(path, source_path):
+        return None
+    with np.load(path) as data:
+        if source_path is not None and "source_size" in data.files and (
+                int(data["source_size"]) != os.path.getsize(source_path)
+                or float(data["source_mtime"]) != os.path.getmtime(source_path)):
+            return None
+        i = int(np.searchsorted(data["time"], time, side='right')) - 1
+        if i < 0:
+            return None
+        lo, hi = data["order_offsets"][i], data["order_offsets"][i + 1]
+        state = {name: data[name][lo:hi] for name in ("direction", "price", "order_id", "size", "timestamp")}
+        for name in ("curr_book_timestamp", "midprice", "midprice_change_timestamp"):
+            state[name] = float(data[name][i])
+        return int(data["line"][i]), state
@@ -1,17 +1,33 @@
 import os
-import plotly.express as px
-import plotly.graph_objects as go
+import time as _time
 import pandas as pd
 import numpy as np
 import csv
-from scipy.stats import zscore
-from typing import Literal
+import weakref
+from typing import Literal, TYPE_CHECKING
 
-from .orderbook import Orderbook
+from .orderbook import Orderbook, Trade
 from .orders import Order
-from .utils import format_timestamp
-from dash import Dash, dcc, html, Input, Output, State, callback_context
-from plotly.subplots import make_subplots
+from .utils import format_timestamp, import_optional
+from .loaders import (EVENT_TYPE_CODES, read_message_file, load_orderbook_array, orderbook_column_names,
+                      load_message_index, read_message_window, book_snapshot_path, read_book_snapshot,
+                      write_book_snapshots, is_compressed, read_message_arrays, message_frame_from_arrays,
+                      message_arrays_from_frame)
+from .parsers import UnsupportedFormat
+from .validation import BookValidationReport, compare_L2_arrays
+from .decimation import DecimationPyramid
+from .quotes import L1Stream
+from .l2_engine import L2Engine
+from .streaming import MessageStream
+from .instrumentation import ReplayStats
+from .memory import MemoryReport, sim_memory, sample_replay_memory
+from .views import ViewPublisher
+from .journal import UndoJournal
+from .dataset import TensorDatasetWriter, TensorDataset
+from .animation import L3FrameProvider, FrameTransportStats, APPLY_FRAME_DELTA_JS
+
+if TYPE_CHECKING:
+    from dash import Dash
 
 
 class MatchingError(Exception):
@@ -24,6 +40,89 @@ class MatchingError(Exception):
         super().__init__(message)
 
 
+def _count_by_bin(values: np.ndarray, is_bid: np.ndarray, bin_size: float) -> pd.DataFrame:
+    """
+    Count bid and ask observations per bin of width `bin_size` with np.bincount.
+    """
+    bins = (values // bin_size) * bin_size
+    unique_bins, inverse = np.unique(bins, return_inverse=True)
+    return pd.DataFrame({
+        "bid": np.bincount(inverse[is_bid], minlength=len(unique_bins)),
+        "ask": np.bincount(inverse[~is_bid], minlength=len(unique_bins)),
+    }, index=unique_bins)
+
+
+def _price_level_grid(levels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Scatter L2 samples into a dense price-by-time grid of sizes.
+
+    Parameters
+    ----------
+    levels : np.ndarray
+        L2 samples of shape (T, num_levels, 4), see :meth:`LobsterSim.sample_L2_array`.
+
+    Returns
+    -------
+    heatmap : np.ndarray
+        Sizes of shape (n_prices, T).
+    prices : np.ndarray
+        Unscaled price of each row: every multiple of the greatest common tick
+        between the lowest and highest price present.
+    """
+    prices = levels[:, :, 0::2]
+    sizes = levels[:, :, 1::2]
+    present = sizes > 0
+    t_idx = np.nonzero(present)[0]
+    present_prices = prices[present]
+    if not present_prices.size:
+        return np.zeros((0, len(levels))), np.empty(0, dtype=np.int64)
+    lowest = present_prices.min()
+    tick = int(np.gcd.reduce(present_prices - lowest)) or 1
+    tick_idx = (present_prices - lowest) // tick
+    heatmap = np.zeros((int(tick_idx.max()) + 1, len(levels)))
+    np.add.at(heatmap, (tick_idx, t_idx), sizes[present])
+    return heatmap, lowest + tick * np.arange(heatmap.shape[0])
+
+
+def _bps_grid(levels: np.ndarray, midprices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Scatter L2 samples into a grid of sizes by distance from the midprice in
+    basis points (rounded to the nearest integer) and time.
+
+    Sizes of levels that round to the same bin are summed; samples without a
+    midprice (an empty side) contribute nothing.
+
+    Returns
+    -------
+    heatmap : np.ndarray
+        Sizes of shape (n_bins, T).
+    bps : np.ndarray
+        Basis points of each row, from the lowest to the highest bin present.
+    """
+    prices = levels[:, :, 0::2]
+    sizes = levels[:, :, 1::2]
+    mids = midprices[:, None, None]
+    present = (sizes > 0) & np.isfinite(mids)
+    t_idx = np.nonzero(present)[0]
+    bps = np.rint((prices - mids) / mids * 10000)[present].astype(np.int64)
+    if not bps.size:
+        return np.zeros((0, len(levels))), np.empty(0, dtype=np.int64)
+    lowest, highest = bps.min(), bps.max()
+    heatmap = np.zeros((highest - lowest + 1, len(levels)))
+    np.add.at(heatmap, (bps - lowest, t_idx), sizes[present])
+    return heatmap, np.arange(lowest, highest + 1)
+
+
+def _axis_seconds(value) -> float:
+    """
+    Seconds after midnight of a plot x-axis value, given as seconds or as the
+    datetime the series was plotted at (seconds since the epoch).
+    """
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    return (pd.Timestamp(value) - pd.Timestamp(0)).total_seconds()
+
+
 class LobsterSim:
     """
     LOBSTER simulation and visualization interface.
@@ -38,11 +137,37 @@ class LobsterSim:
         Orderbook object to operate on. See :class:`Orderbook`
         in `orderbook.py` for full definition.
     msg_book_file_path : str
-        LOBSTER message.csv file path.
+        LOBSTER message.csv file path. Files compressed with gzip, xz, bzip2, zip or
+        zstd are read directly (see :func:`open_decompressed`).
     lob_book_file_path : str, default=None
-        LOBSTER orderbook.csv file path.
+        LOBSTER orderbook.csv file path, optionally compressed.
         Not necessary for end user (just use default val), used solely in debugging/testing
         to ensure matching between reconstructed and expected.
+    cache_orderbook_file : bool, default=True
+        Whether to keep a binary ``.npy`` copy of `lob_book_file_path` next to it and
+        memory-map it on later runs (see :func:`load_orderbook_array`), and whether
+        time windows may use the ``.idx.npz`` index and ``.books.npz`` snapshots.
+    cache_dir : str, default=None
+        Directory for the ``.npy`` and ``.idx.npz`` caches, so nothing is written
+        next to the data files. Defaults to the data files' directories.
+    start_time : float, default=None
+        Start of the time window to load (seconds after midnight). The book is
+        initialised from the latest stored snapshot at or before `start_time` (see
+        :meth:`write_book_snapshots`) and only messages from that snapshot on are
+        read, using the byte-offset index ``<file>.idx.npz`` (built on first use).
+        Without a snapshot file, or if the message file changed since the snapshots
+        were written, the window is read from the start of the file.
+    end_time : float, default=None
+        End of the time window to load (inclusive). Messages after it are not read.
+    streaming : bool, default=False
+        Parse the message file in chunks in a background thread instead of loading
+        it into `dataM` (see :class:`MessageStream`), so memory use does not grow
+        with file length. The book can then only move forward in time: features
+        built on :meth:`simulate_until` / :meth:`simulate_from_current_until` with
+        increasing times work, while those needing random access to the messages
+        (validation, animation, L2 engine, book snapshots) raise ValueError.
+    chunk_size : int, default=100_000
+        Number of messages parsed at a time in streaming mode.
 
     Attributes
     ----------
@@ -58,73 +183,75 @@ class LobsterSim:
         - `Size`: int
         - `Price`: int
         - `Direction`: Literal['bid', 'ask']
+    series_pyramids : dict
+        :class:`DecimationPyramid` of the last series plotted by `midprice_graph`,
+        `size_OFI_graph` and `count_OFI_graph`, keyed by "midprice", "size_OFI" and
+        "count_OFI". :meth:`query_series` and :meth:`create_series_app` use them to
+        redraw a zoomed range at full detail without replaying the book again.
+    message_offset : int
+        Line number in the message file of the first row of `dataM` (0 unless a
+        time window was loaded).
+    views : ViewPublisher or None
+        Published views of the book for other threads, see :meth:`enable_views`.
     """
-    def __init__(self, orderbook: Orderbook, msg_book_file_path: str, lob_book_file_path: str = None):
+    def __init__(self, orderbook: Orderbook, msg_book_file_path: str, lob_book_file_path: str = None, cache_orderbook_file: bool = True,
+                 start_time: float = None, end_time: float = None, streaming: bool = False, chunk_size: int = 100_000,
+                 cache_dir: str = None):
         self.orderbook = orderbook
         self._last_idx = 0
-        columns = ["Time", "Type", "OrderID", "Size", "Price", "Direction"]
-
-        dtype_map = {
-            "Time": float,
-            "Type": "Int64",
-            "OrderID": "Int64",
-            "Size": "Int64",
-            "Price": "Int64",
-            "Direction": "Int64"
-        }
-
-        dataM = pd.read_csv(
-            msg_book_file_path,
-            header=None,
-            names=columns,
-            usecols=range(len(columns)),  # drop any extra columns in the file
-            dtype=dtype_map,
-            na_values=["", "NA"],         # treat blanks as NaN
-            low_memory=False
-        )
-
-        # dataM = dataM[~dataM['Type'].isin([6, 7])] #Remove halts and auction trades
-        event_map = {
-            1: 'submit',
-            2: 'cancel',
-            3: 'delete',
-            4: 'vis_exec',
-            5: 'hid_exec',
-            6: 'cross',
-            7: 'halt'
-        }
-
-        dataM['Type'] = dataM['Type'].map(event_map)
-        dataM['Direction'] = dataM['Direction'].map({-1: 'ask', 1: 'bid'})
-
-        self.dataM = dataM
+        self.series_pyramids = {}
+        self._message_arrays = None
+        self._l2_engine = None
+        self.msg_book_file_path = msg_book_file_path
+        self.message_offset = 0
+        self._base_state = None
+        self._stream = None
+        self.views = None
+
+        if streaming:
+            if start_time is not None or end_time is not None:
+                raise ValueError("Time windows cannot be combined with streaming mode.")
+            self.dataM = None
+            self._stream = MessageStream(msg_book_file_path, chunk_size)
+        elif start_time is None and end_time is None:
+            self.dataM = None
+            if not is_compressed(msg_book_file_path):
+                try:
+                    # The parsed arrays double as the message_arrays cache
+                    self._message_arrays = read_message_arrays(msg_book_file_path)
+                    self.dataM = message_frame_from_arrays(self._message_arrays)
+                except UnsupportedFormat:
+                    pass
+            if self.dataM is None:
+                self.dataM = read_message_file(msg_book_file_path)
+        else:
+            snapshot = None
+            snapshot_path = book_snapshot_path(msg_book_file_path)
+            if cache_orderbook_file and start_time is not None and os.path.exists(snapshot_path):
+                snapshot = read_book_snapshot(snapshot_path, start_time, msg_book_file_path)
+            if snapshot is not None:
+                self.message_offset, self._base_state = snapshot
+            if is_compressed(msg_book_file_path):
+                # Byte offsets are meaningless in a compressed stream, so parse it and cut the window
+                dataM = read_message_file(msg_book_file_path).iloc[self.message_offset:]
+                if end_time is not None:
+                    dataM = dataM[dataM["Time"] <= end_time]
+                self.dataM = dataM.reset_index(drop=True)
+            else:
+                index = load_message_index(msg_book_file_path, cache=cache_orderbook_file, cache_dir=cache_dir)
+                self.dataM = read_message_window(msg_book_file_path, index, self.message_offset, end_time)
+            if self._base_state is not None:
+                self.orderbook.restore_state(self._base_state)
 
         if lob_book_file_path is None:
             self._dataL = None
+            self._dataL_array = None
         else:
-            sample = pd.read_csv(lob_book_file_path, nrows=1, header=None)
-            num_cols = sample.shape[1]
-
-            if num_cols % 4 != 0:
-                raise ValueError("Orderbook file column count is not a multiple of 4.")
-
-            num_levels = num_cols // 4
-
-            col_names = []
-            for i in range(1, num_levels + 1):
-                col_names.extend([
-                    f"AskPrice{i}", f"AskSize{i}",
-                    f"BidPrice{i}", f"BidSize{i}"
-                ])
-
-            dataL = pd.read_csv(
-                lob_book_file_path,
-                header=None,
-                names=col_names,
-                dtype=int,
-                low_memory=False
-            )
-            self._dataL = dataL
+            self._dataL_array = load_orderbook_array(lob_book_file_path, cache=cache_orderbook_file, cache_dir=cache_dir)
+            if self.message_offset or end_time is not None:
+                self._dataL_array = self._dataL_array[self.message_offset:self.message_offset + len(self.dataM)]
+            num_levels = self._dataL_array.shape[1] // 4
+            self._dataL = pd.DataFrame(self._dataL_array, columns=orderbook_column_names(num_levels), copy=False)
 
     def simulate_until(self, time: float) -> None:
         """
@@ -135,15 +262,238 @@ class LobsterSim:
         ----------
         time : float
             Time in seconds after midnight to simulate until
+
+        Raises
+        ------
+        ValueError
+            If `time` is earlier than the book snapshot a time window was loaded from,
+            or, in streaming mode, earlier than the current book timestamp.
+
+        Notes
+        -----
+        In streaming mode the book cannot be reset, so it is only advanced from its
+        current state.
         """
+        if self._base_state is not None and time < self._base_state["curr_book_timestamp"]:
+            raise ValueError("time parameter must not be earlier than the loaded window")
+        if self._stream is not None and self._stream.position > 0:
+            self.simulate_from_current_until(time)
+            return
         self._last_idx = 0
-        self.orderbook.clear_orderbook()
-        for row in self.dataM.itertuples(index=False):
-            if row.Time > time:
-                break
-            curr_order = Order(row.Time, row.Type, row.OrderID, row.Size, row.Price, row.Direction)
-            self.orderbook.process_order(curr_order)
-            self._last_idx += 1
+        self._reset_book(self.orderbook)
+        self._last_idx = self._replay_until(self.orderbook, 0, time)
+        if self.views is not None:
+            self.views.publish()
+
+    def enable_instrumentation(self, sample_every: int = 64, book_size_every: int = 1000) -> ReplayStats:
+        """
+        Collect replay statistics for this simulator's orderbook.
+
+        See :meth:`Orderbook.enable_instrumentation`. In addition, the wall-clock
+        time of every replay loop is added up, giving the events/s figure.
+
+        Parameters
+        ----------
+        sample_every : int, default=64
+            Time one in every `sample_every` events.
+        book_size_every : int, default=1000
+            Record the book size once every `book_size_every` events.
+
+        Returns
+        -------
+        ReplayStats
+            Statistics object filled by subsequent replays. Export it with
+            :meth:`ReplayStats.write_prometheus`.
+        """
+        return self.orderbook.enable_instrumentation(sample_every=sample_every, book_size_every=book_size_every)
+
+    def disable_instrumentation(self) -> ReplayStats:
+        """
+        Stop collecting replay statistics. See :meth:`Orderbook.disable_instrumentation`.
+        """
+        return self.orderbook.disable_instrumentation()
+
+    def enable_undo_journal(self, capacity: int = 100_000) -> UndoJournal:
+        """
+        Journal the replay so :meth:`step_back` and :meth:`rewind_to` can move the
+        book backwards without replaying from the start.
+
+        Parameters
+        ----------
+        capacity : int, default=100_000
+            Number of most recent messages that can be undone. Going back further
+            falls back to a replay from the start.
+
+        Returns
+        -------
+        UndoJournal
+            See :meth:`Orderbook.enable_journal`.
+        """
+        return self.orderbook.enable_journal(capacity)
+
+    def disable_undo_journal(self) -> None:
+        """
+        Stop journaling the replay. See :meth:`Orderbook.disable_journal`.
+        """
+        self.orderbook.disable_journal()
+
+    def step_back(self, k: int = 1) -> int:
+        """
+        Move the book back by `k` messages.
+
+        The most recent messages are undone from the journal; if it holds fewer
+        than `k`, the book is replayed from the start instead. Stepping back and
+        forth with :meth:`simulate_from_current_until` costs time proportional to
+        the distance moved.
+
+        Parameters
+        ----------
+        k : int, default=1
+            Number of messages to go back (at most the number applied).
+
+        Returns
+        -------
+        int
+            Number of messages the book moved back.
+
+        Raises
+        ------
+        ValueError
+            In streaming mode, or if the undo journal is not enabled.
+        """
+        if self._stream is not None:
+            raise ValueError("The stream cannot be rewound in streaming mode.")
+        if self.orderbook.journal is None:
+            raise ValueError("The undo journal is not enabled; call enable_undo_journal first.")
+        target_idx = max(self._last_idx - k, 0)
+        moved = self._last_idx - target_idx
+        if len(self.orderbook.journal) >= moved:
+            self._last_idx -= self.orderbook.undo(moved)
+        if self._last_idx > target_idx:
+            self._reset_book(self.orderbook)
+            self._last_idx = self._apply_messages_until(self.orderbook, 0, np.inf, target_idx)
+        if self.views is not None:
+            self.views.publish()
+        return moved
+
+    def rewind_to(self, time: float) -> None:
+        """
+        Move the book to its state at `time` (inclusive), backwards with the undo
+        journal or forwards by replaying.
+
+        Parameters
+        ----------
+        time : float
+            Time in seconds after midnight.
+
+        Raises
+        ------
+        ValueError
+            In streaming mode, or if the undo journal is not enabled.
+        """
+        self._require_message_data("rewind_to")
+        times = self.dataM["Time"].to_numpy()
+        target_idx = int(np.searchsorted(times, time, side="right"))
+        if target_idx >= self._last_idx:
+            self.simulate_from_current_until(time)
+        else:
+            self.step_back(self._last_idx - target_idx)
+
+    def enable_views(self, num_levels: int = None, every: int = 1000, interval: float = None) -> ViewPublisher:
+        """
+        Publish versioned views of the book for other threads (e.g. a Dash app).
+
+        While a simulation call runs, a new view is published every `every`
+        messages (at most once per `interval` wall-clock seconds, if given), and
+        once more when the call returns (in streaming mode, only when it returns).
+        Other threads read ``sim.views.current``
+        instead of the book itself: it always holds a complete state and reading
+        it never blocks the replay.
+
+        Parameters
+        ----------
+        num_levels : int, optional
+            Levels per side in each view. Defaults to the book's `nlevels`.
+        every : int, default=1000
+            Messages between publications during a replay.
+        interval : float, optional
+            Minimum wall-clock seconds between publications during a replay.
+
+        Returns
+        -------
+        ViewPublisher
+            Also available as `views`.
+        """
+        self.views = ViewPublisher(self.orderbook, num_levels=num_levels, every=every, interval=interval)
+        return self.views
+
+    def disable_views(self) -> None:
+        """
+        Stop publishing views. Views already handed out stay valid.
+        """
+        self.views = None
+
+    def memory_usage(self, exact: bool = False) -> MemoryReport:
+        """
+        Report the bytes used by the message table, the reference orderbook table,
+        cached arrays and frames, and the components of the order book.
+
+        Parameters
+        ----------
+        exact : bool, default=False
+            Traverse every object instead of estimating from buffer sizes and one
+            sample object per kind. If :mod:`tracemalloc` is tracing, the report
+            also holds the traced heap size.
+
+        Returns
+        -------
+        MemoryReport
+            See :func:`memory.sim_memory`.
+        """
+        return sim_memory(self, exact)
+
+    def sample_memory(self, times, exact: bool = False, trace: bool = True) -> pd.DataFrame:
+        """
+        Replay the book from the start and record the memory footprint at each of `times`.
+
+        Parameters
+        ----------
+        times : array-like
+            Sorted sample times in seconds after midnight.
+        exact : bool, default=False
+            Use exact component sizes.
+        trace : bool, default=True
+            Also record the traced Python heap and its peak between samples with
+            :mod:`tracemalloc` (slows the replay down).
+
+        Returns
+        -------
+        DataFrame
+            See :func:`memory.sample_replay_memory`.
+        """
+        return sample_replay_memory(self, times, exact, trace)
+
+    def close(self) -> None:
+        """
+        Stop the background reader of streaming mode. No-op otherwise.
+        """
+        if self._stream is not None:
+            self._stream.close()
+
+    def _require_message_data(self, feature: str) -> None:
+        if self.dataM is None:
+            raise ValueError(f"{feature} needs the full message data and is not available in streaming mode.")
+
+    def _reset_book(self, orderbook: Orderbook) -> None:
+        """
+        Reset `orderbook` to the state before the first row of `dataM`: empty, or
+        the stored snapshot when a time window was loaded.
+        """
+        if self._base_state is None:
+            orderbook.clear_orderbook()
+        else:
+            orderbook.restore_state(self._base_state)
+        orderbook.message_count = self.message_offset
 
     def simulate_from_current_until(self, time: float) -> None:
         """
@@ -163,12 +513,128 @@ class LobsterSim:
         """
         if time < self.orderbook.curr_book_timestamp:
             raise ValueError("time parameter must be greater than current book timestamp")
-        for row in self.dataM.iloc[self._last_idx:].itertuples(index=False):
-            if row.Time > time:
+        self._last_idx = self._replay_until(self.orderbook, self._last_idx, time)
+        if self.views is not None:
+            self.views.publish()
+
+    def write_book_snapshots(self, interval: float = 300.0, path: str = None) -> str:
+        """
+        Store book snapshots on a regular time grid for time-windowed loading.
+
+        Replays the whole message data once on a separate book and saves its
+        state every `interval` seconds. Later ``LobsterSim(..., start_time=t)``
+        calls restore the latest snapshot at or before `t` and only read the
+        messages after it.
+
+        Parameters
+        ----------
+        interval : float, default=300.0
+            Seconds between snapshots.
+        path : str, optional
+            Output file. Defaults to ``<message file>.books.npz``.
+
+        Returns
+        -------
+        str
+            Path of the snapshot file.
+
+        Raises
+        ------
+        ValueError
+            If a time window was loaded (snapshots must cover the file from the start).
+        """
+        self._require_message_data("Writing book snapshots")
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        if self.message_offset or self._base_state is not None:
+            raise ValueError("Book snapshots must be written from a simulator that loaded the whole message file.")
+        if path is None:
+            path = book_snapshot_path(self.msg_book_file_path)
+
+        ob = self.orderbook
+        book = Orderbook(ob.nlevels, ob.ticker, ob.tick_size, ob.price_scaling, ob._use_auto_matching_engine)
+        times = self.dataM["Time"].to_numpy()
+        snapshots = []
+        if len(times):
+            msg_idx = 0
+            for t in np.arange(times[0], times[-1] + interval, interval):
+                msg_idx = self._replay_until(book, msg_idx, t)
+                snapshots.append((float(t), msg_idx, book.export_state()))
+        write_book_snapshots(path, snapshots, self.msg_book_file_path)
+        return path
+
+    def _replay_until(self, orderbook: Orderbook, start_idx: int, time: float) -> int:
+        """
+        Apply messages to `orderbook` from message index `start_idx` up to and
+        including `time`.
+
+        Parameters
+        ----------
+        orderbook : Orderbook
+            Book to advance. Does not have to be `self.orderbook`.
+        start_idx : int
+            Index of the first message to apply.
+        time : float
+            Time in seconds after midnight to simulate until.
+
+        Returns
+        -------
+        int
+            Index of the first message that was not applied.
+
+        Raises
+        ------
+        ValueError
+            In streaming mode, if `orderbook` is not the simulator's book or
+            `start_idx` is not the stream position.
+
+        Notes
+        -----
+        Anomalies recorded during the replay that the rate-limited anomaly log
+        has not reported yet are logged as a summary before returning.
+        """
+        apply = self._apply_messages_until
+        if self.views is not None and orderbook is self.orderbook and self._stream is None:
+            apply = self._apply_publishing_views
+        stats = orderbook.stats
+        if stats is None:
+            idx = apply(orderbook, start_idx, time)
+        else:
+            started = _time.perf_counter()
+            idx = apply(orderbook, start_idx, time)
+            stats.replay_seconds += _time.perf_counter() - started
+            stats.replay_events += idx - start_idx
+        if orderbook.anomalies.unreported:
+            orderbook.anomalies.log_summary()
+        return idx
+
+    def _apply_publishing_views(self, orderbook: Orderbook, start_idx: int, time: float) -> int:
+        """
+        Apply messages in runs of `views.every` and consider publishing a view after each run.
+        """
+        idx = start_idx
+        while True:
+            stop_idx = idx + self.views.every
+            idx = self._apply_messages_until(orderbook, idx, time, stop_idx)
+            if idx < stop_idx:
+                return idx
+            self.views.maybe_publish()
+
+    def _apply_messages_until(self, orderbook: Orderbook, start_idx: int, time: float, stop_idx: int = None) -> int:
+        if self._stream is not None:
+            if orderbook is not self.orderbook or start_idx != self._stream.position:
+                raise ValueError("Streaming mode can only move the simulator's own book forward in time.")
+            for row in self._stream.take_until(time):
+                orderbook.process_order(Order(*row))
+            return self._stream.position
+
+        idx = start_idx
+        for row in self.dataM.iloc[start_idx:stop_idx].itertuples(index=False, name=None):
+            if row[0] > time:
                 break
-            curr_order = Order(row.Time, row.Type, row.OrderID, row.Size, row.Price, row.Direction)
-            self.orderbook.process_order(curr_order)
-            self._last_idx += 1
+            orderbook.process_order(Order(*row))
+            idx += 1
+        return idx
 
     def display_L3_snapshots(self, start_time: float, end_time: float, interval: float) -> None:
         """
@@ -186,6 +652,7 @@ class LobsterSim:
         interval : float
             Time interval (in seconds) between consecutive snapshots.
         """
+        make_subplots = import_optional("plotly.subplots").make_subplots
         self.simulate_until(start_time)
         curr_time = start_time + interval
         traces_tuples = []
@@ -230,6 +697,7 @@ class LobsterSim:
         interval : float
             Time interval (in seconds) between consecutive snapshots.
         """
+        make_subplots = import_optional("plotly.subplots").make_subplots
         self.simulate_until(start_time)
         curr_time = start_time + interval
         traces_tuples = []
@@ -314,7 +782,92 @@ class LobsterSim:
         self.simulate_from_current_until(end_time)
         return self.orderbook.calc_count_OFI()
 
-    def create_animated_L3_app(self, start_time: float, end_time: float, interval: float) -> Dash:
+    def extract_L1_stream(self, start_time: float = None, end_time: float = None, changes_only: bool = True) -> L1Stream:
+        """
+        Replay the message data once and record the best bid/ask after every message.
+
+        Quotes are written into preallocated arrays during the replay, so no
+        per-event DataFrame or Python object is created. The result can be
+        sampled on any time grid with :meth:`L1Stream.asof` without another replay.
+
+        Parameters
+        ----------
+        start_time : float, optional
+            Timestamp (seconds after midnight) to start recording. The book is
+            simulated up to this time first and its quote is the first row.
+            Defaults to the first message.
+        end_time : float, optional
+            Timestamp (seconds after midnight) to stop recording (inclusive).
+            Defaults to the last message.
+        changes_only : bool, default=True
+            Keep only rows where the best bid/ask price or size changed.
+
+        Returns
+        -------
+        L1Stream
+            Quote stream with unscaled prices.
+        """
+        book = self.orderbook
+        if start_time is None:
+            if self._stream is None or self._stream.position == 0:
+                self._last_idx = 0
+                self._reset_book(book)
+        else:
+            self.simulate_until(start_time)
+        n_initial = 0 if start_time is None else 1
+        if self._stream is None:
+            times = self.dataM["Time"].to_numpy()
+            end_idx = len(times) if end_time is None else int(np.searchsorted(times, end_time, side='right'))
+            end_idx = max(end_idx, self._last_idx)
+            n = end_idx - self._last_idx + n_initial
+        else:
+            n = 4096  # unknown in streaming mode; buffers grow as needed
+
+        columns = {
+            "time": np.empty(n, dtype=np.float64),
+            "msg_index": np.empty(n, dtype=np.int64),
+            "bid_price": np.full(n, np.nan),
+            "bid_size": np.zeros(n, dtype=np.int64),
+            "ask_price": np.full(n, np.nan),
+            "ask_size": np.zeros(n, dtype=np.int64),
+        }
+
+        def record(i, timestamp):
+            if i >= len(columns["time"]):
+                for name, col in columns.items():
+                    grown = np.full(2 * len(col), np.nan) if col.dtype.kind == 'f' else np.zeros(2 * len(col), dtype=col.dtype)
+                    grown[:len(col)] = col
+                    columns[name] = grown
+            columns["time"][i] = timestamp
+            columns["msg_index"][i] = self._last_idx - 1
+            if book.bids:
+                columns["bid_price"][i] = book.highest_bid_price()
+                columns["bid_size"][i] = book.highest_bid_volume()
+            if book.asks:
+                columns["ask_price"][i] = book.lowest_ask_price()
+                columns["ask_size"][i] = book.lowest_ask_volume()
+
+        if n_initial:
+            record(0, start_time)
+        i = n_initial
+        if self._stream is None:
+            rows = self.dataM.iloc[self._last_idx:end_idx].itertuples(index=False, name=None)
+        else:
+            rows = self._stream.take_until(np.inf if end_time is None else end_time)
+        for row in rows:
+            book.process_order(Order(*row))
+            self._last_idx += 1
+            record(i, row[0])
+            i += 1
+
+        time_col, msg_index, bid_price, bid_size, ask_price, ask_size = (col[:i] for col in columns.values())
+        stream = L1Stream(time_col, msg_index, bid_price, bid_size, ask_price, ask_size, book.price_scaling)
+        return stream.changes_only() if changes_only else stream
+
+    def create_animated_L3_app(self, start_time: float, end_time: float, interval: float,
+                               checkpoint_every: int = 50, max_cache_bytes: int = 64 * 1024 ** 2,
+                               prefetch: int = 5, transport: Literal["figure", "delta"] = "figure",
+                               undo_capacity: int = 0) -> "Dash":
         """
         Create an interactive Dash application showing an animated L3 order book.
 
@@ -330,39 +883,59 @@ class LobsterSim:
             Timestamp (seconds after midnight) to end the simulation.
         interval : float
             Time interval (in seconds) between consecutive frames.
+        checkpoint_every : int, default=50
+            Number of frames between cached book states used to rebuild frames.
+        max_cache_bytes : int, default=64 * 1024 ** 2
+            Approximate memory budget of the built-figure LRU cache.
+        prefetch : int, default=5
+            Number of frames built ahead in a background thread while playing.
+        transport : {'figure', 'delta'}, default='figure'
+            How frames reach the browser:
+
+            - 'figure' : the server sends a full plotly figure for every frame.
+            - 'delta' : the server sends only the orders added, removed or resized
+              since the previous frame (a full keyframe after a jump), and a
+              client-side callback applies them to the displayed figure.
+        undo_capacity : int, default=0
+            Journal this many messages so stepping back a few frames undoes them
+            instead of replaying from a cached book state. 0 disables it.
 
         Returns
         -------
         dash.Dash
             A Dash application instance that can be run or embedded in a web server.
+            Its `transport_stats` attribute (:class:`FrameTransportStats`) records the
+            payload size and callback latency of every frame sent; the running
+            totals are also shown below the slider. Its `frame_provider` attribute
+            is the :class:`L3FrameProvider` serving the frames, see
+            :meth:`L3FrameProvider.memory_usage`. It is closed when the app is
+            garbage collected; call ``app.frame_provider.close()`` to stop its
+            prefetch thread earlier.
 
         Notes
         -----
-        - The method simulates the order book over the specified interval and stores
-          snapshots in memory.
+        - Frames are built lazily by an :class:`L3FrameProvider` on a private copy of
+          the book, so `self.orderbook` can keep being used while the app runs.
         - Each frame shows a horizontal bar chart of L3 order sizes by price and direction.
         - Users can interact via a play/pause button and a slider for manual navigation.
         """
-        frames = []
-        timestamps = []
-        self.simulate_until(start_time)
-        curr_time = start_time
-        while curr_time <= end_time:
-            self.simulate_from_current_until(curr_time)
-            df = self.orderbook.convert_orderbook_to_L3_dataframe()
-            df.price = df.price * self.orderbook.price_scaling
-            frames.append(df)
-            timestamps.append(curr_time)
-            curr_time += interval
-
-        all_prices = pd.concat([df["price"] for df in frames])
-        price_min = all_prices.min()
-        price_max = all_prices.max()
+        import_optional("dash", "The animated L3 app")
+        from dash import Dash, dcc, html, Input, Output, State, callback_context, no_update
+        self._require_message_data("The L3 animation app")
+        if transport not in ("figure", "delta"):
+            raise ValueError(f"Unknown transport: {transport!r}. Expected 'figure' or 'delta'.")
+        frames = L3FrameProvider(self, start_time, end_time, interval, checkpoint_every=checkpoint_every,
+                                 max_cache_bytes=max_cache_bytes, prefetch=prefetch if transport == "figure" else 0,
+                                 undo_capacity=undo_capacity)
+        stats = FrameTransportStats(transport)
 
         app = Dash(__name__)
+        app.transport_stats = stats
+        app.frame_provider = frames
+        weakref.finalize(app, frames.close)
 
         app.layout = html.Div([
-            dcc.Graph(id='l3-graph'),
+            dcc.Graph(id='l3-graph', figure=frames.empty_delta_figure() if transport == "delta" else None),
             html.Div([
                 html.Button("⏯ Play/Pause", id="play-pause", n_clicks=0)
             ], style={'marginTop': '10px'}),
@@ -378,17 +951,11 @@ class LobsterSim:
             ),
             dcc.Interval(id='interval', interval=2000, n_intervals=0),
             dcc.Store(id='paused', data=False),
+            dcc.Store(id='l3-delta'),
+            html.Div(id='transport-stats', style={'fontSize': 'small', 'color': 'gray'}),
         ])
-        @app.callback(
-            Output('l3-graph', 'figure'),
-            Output('frame-slider', 'value'),
-            Output('paused', 'data'),
-            Input('interval', 'n_intervals'),
-            Input('frame-slider', 'value'),
-            Input('play-pause', 'n_clicks'),
-            State('paused', 'data')
-        )
-        def update_l3_graph(n_intervals, slider_value, play_clicks, paused):
+
+        def next_frame(slider_value, paused):
             ctx = callback_context
             triggered = ctx.triggered[0]['prop_id'].split('.')[0]
 
@@ -401,28 +968,207 @@ class LobsterSim:
                 frame = slider_value
             else:
                 frame = slider_value
-
-            df = frames[frame]
-            timestamp = timestamps[frame]
-            fig = px.bar(
-                df,
-                orientation='h',
-                x="size",
-                y="price",
-                color="direction",
-                title=f"{self.orderbook.ticker}<br><sup>{format_timestamp(timestamp)}",
-                color_discrete_sequence=["green", "red"]
+            return frame, paused
+
+        if transport == "figure":
+            @app.callback(
+                Output('l3-graph', 'figure'),
+                Output('frame-slider', 'value'),
+                Output('paused', 'data'),
+                Output('transport-stats', 'children'),
+                Input('interval', 'n_intervals'),
+                Input('frame-slider', 'value'),
+                Input('play-pause', 'n_clicks'),
+                State('paused', 'data')
             )
-            fig.update_layout(
-                xaxis=dict(range=[0, 2000], autorange=False),
-                yaxis=dict(range=[price_min, price_max], autorange=False),
-                uirevision="static",
-                height=600
+            def update_l3_graph(n_intervals, slider_value, play_clicks, paused):
+                started = _time.perf_counter()
+                frame, paused = next_frame(slider_value, paused)
+                fig = frames.figure(frame)
+                stats.record(fig, started)
+                return fig, frame, paused, str(stats)
+        else:
+            @app.callback(
+                Output('l3-delta', 'data'),
+                Output('frame-slider', 'value'),
+                Output('paused', 'data'),
+                Output('transport-stats', 'children'),
+                Input('interval', 'n_intervals'),
+                Input('frame-slider', 'value'),
+                Input('play-pause', 'n_clicks'),
+                State('paused', 'data'),
+                State('l3-delta', 'data')
+            )
+            def update_l3_delta(n_intervals, slider_value, play_clicks, paused, last_payload):
+                started = _time.perf_counter()
+                frame, paused = next_frame(slider_value, paused)
+                prev_frame = last_payload["frame"] if last_payload else None
+                if prev_frame == frame:
+                    return no_update, frame, paused, str(stats)
+                payload = frames.frame_payload(frame, prev_frame)
+                stats.keyframes += payload["key"]
+                stats.record(payload, started)
+                return payload, frame, paused, str(stats)
+
+            app.clientside_callback(
+                APPLY_FRAME_DELTA_JS,
+                Output('l3-graph', 'figure'),
+                Input('l3-delta', 'data'),
+                State('l3-graph', 'figure')
             )
-            return fig, frame, paused
 
         return app
 
+    def sample_L2_array(self, start_time: float, end_time: float, interval: float, num_levels: int = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sample the L2 state of the book on a regular time grid into a typed array.
+
+        Parameters
+        ----------
+        start_time : float
+            Timestamp (seconds after midnight) of the first sample.
+        end_time : float
+            Timestamp (seconds after midnight) of the last sample (inclusive).
+        interval : float
+            Time interval (in seconds) between consecutive samples.
+        num_levels : int, optional
+            Number of levels per side. Defaults to the orderbook's `nlevels`.
+
+        Returns
+        -------
+        timestamps : np.ndarray
+            Sample times, shape (T,).
+        levels : np.ndarray
+            int64 array of shape (T, num_levels, 4) holding (ask price, ask size,
+            bid price, bid size) per level, see
+            :meth:`Orderbook.convert_orderbook_to_L2_array`.
+        midprices : np.ndarray
+            Unscaled midprice at each sample (NaN where one side is empty), shape (T,).
+        """
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        if num_levels is None:
+            num_levels = self.orderbook.nlevels
+        n_samples = int(np.floor((end_time - start_time) / interval + 1e-9)) + 1 if end_time >= start_time else 0
+        timestamps = start_time + interval * np.arange(n_samples)
+        levels = np.empty((n_samples, num_levels, 4), dtype=np.int64)
+        midprices = np.full(n_samples, np.nan)
+
+        self.simulate_until(start_time)
+        for i, t in enumerate(timestamps):
+            self.simulate_from_current_until(t)
+            self.orderbook.convert_orderbook_to_L2_array(num_levels, out=levels[i])
+            midprice = self.orderbook.mid_price()
+            if midprice is not None:
+                midprices[i] = midprice
+        return timestamps, levels, midprices
+
+    def write_tensor_dataset(self, path: str, start_time: float = None, end_time: float = None,
+                             num_levels: int = None, events_per_sample: int = None, interval: float = None,
+                             window: int = 100, horizons=(1, 10, 100), shard_size: int = 1 << 20) -> TensorDataset:
+        """
+        Replay the message data once and write L2 training tensors to disk.
+
+        Samples of shape (num_levels, 4) are written straight into memory-mapped
+        ``.npy`` shards during the replay, in event time (every
+        `events_per_sample` messages) or on a regular time grid (every
+        `interval` seconds). Labels (the midprice change a number of samples
+        ahead) are then computed in one vectorized pass over the first level of
+        the tensors. A ``manifest.json`` describes the shards, which overlap by
+        ``window - 1`` samples so that :class:`TensorDataset` can return any
+        window as a view without copying.
+
+        Parameters
+        ----------
+        path : str
+            Output directory.
+        start_time : float, optional
+            Timestamp (seconds after midnight) to start sampling. The book is
+            simulated up to this time first. Defaults to the first message.
+        end_time : float, optional
+            Timestamp (seconds after midnight) to stop sampling (inclusive).
+            Defaults to the last message.
+        num_levels : int, optional
+            Levels per side. Defaults to the orderbook's `nlevels`.
+        events_per_sample : int, optional
+            Take a sample after every this many messages. The default when
+            `interval` is not given either is 1.
+        interval : float, optional
+            Take a sample every this many seconds, starting at `start_time` (or the
+            first message), instead.
+        window : int, default=100
+            Samples per training window.
+        horizons : sequence of int, default=(1, 10, 100)
+            Label horizons in samples.
+        shard_size : int, default=1 << 20
+            Samples per shard file.
+
+        Returns
+        -------
+        TensorDataset
+            The dataset, opened for reading.
+        """
+        self._require_message_data("write_tensor_dataset")
+        if events_per_sample is not None and interval is not None:
+            raise ValueError("Pass either events_per_sample or interval, not both.")
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be > 0")
+        if interval is None and events_per_sample is None:
+            events_per_sample = 1
+        if events_per_sample is not None and events_per_sample < 1:
+            raise ValueError("events_per_sample must be >= 1")
+        if num_levels is None:
+            num_levels = self.orderbook.nlevels
+
+        book = self.orderbook
+        if start_time is None:
+            self._last_idx = 0
+            self._reset_book(book)
+        else:
+            self.simulate_until(start_time)
+        times = self.dataM["Time"].to_numpy()
+        end_idx = len(times) if end_time is None else int(np.searchsorted(times, end_time, side='right'))
+        end_idx = max(end_idx, self._last_idx)
+        if interval is None:
+            n_samples = (end_idx - self._last_idx) // events_per_sample
+            sampling = {"events_per_sample": events_per_sample}
+        else:
+            first = start_time if start_time is not None else (times[0] if len(times) else 0.0)
+            last = end_time if end_time is not None else (times[-1] if len(times) else first)
+            n_samples = int(np.floor((last - first) / interval + 1e-9)) + 1 if last >= first else 0
+            grid = first + interval * np.arange(n_samples)
+            sampling = {"interval": interval}
+
+        writer = TensorDatasetWriter(path, n_samples, num_levels, window, horizons, shard_size, metadata={
+            "ticker": book.ticker, "price_scaling": book.price_scaling, "message_file": self.msg_book_file_path,
+            **sampling})
+        rows = self.dataM.iloc[self._last_idx:end_idx].itertuples(index=False, name=None)
+        if interval is None:
+            countdown = events_per_sample
+            for row in rows:
+                if writer.count == n_samples:
+                    break
+                book.process_order(Order(*row))
+                self._last_idx += 1
+                countdown -= 1
+                if not countdown:
+                    countdown = events_per_sample
+                    writer.append(book, row[0], self._last_idx - 1)
+        else:
+            j = 0
+            for row in rows:
+                while j < n_samples and row[0] > grid[j]:
+                    writer.append(book, grid[j], self._last_idx - 1)
+                    j += 1
+                if j == n_samples:
+                    break
+                book.process_order(Order(*row))
+                self._last_idx += 1
+            for t in grid[j:]:
+                writer.append(book, t, self._last_idx - 1)
+        writer.close()
+        return TensorDataset(path)
+
     def plot_price_levels_heatmap(self, start_time: float, end_time: float, interval: float, show_midprice:bool=True) -> None:
         """
         Creates a heatmap graph of order book price levels over time.
@@ -446,38 +1192,19 @@ class LobsterSim:
 
         Notes
         -----
-        - The `self.simulate_until()` and `self.simulate_from_current_until()` methods
-          are used to advance the simulation and collect order book snapshots.
+        - Snapshots are collected with :meth:`sample_L2_array` and scattered into a
+          dense tick-indexed price grid in a single vectorized step.
         - The price values are scaled by `self.orderbook.price_scaling` for accurate
           visualization.
         - This function uses the `plotly.graph_objects` library to generate an interactive
           heatmap.
         """
-        l2_snapshots = []
-        timestamps = []
-        midprices = []
-        curr_time = start_time
-        self.simulate_until(curr_time)
-        while curr_time <= end_time:
-            self.simulate_from_current_until(curr_time)
-            df = self.orderbook.convert_orderbook_to_L2_dataframe()
-            df.price = df.price * self.orderbook.price_scaling
-            l2_snapshots.append(df)
-            timestamps.append(format_timestamp(curr_time))
-            midprices.append(self.orderbook.mid_price() * self.orderbook.price_scaling)
-            curr_time += interval
-
-        all_prices = sorted(set().union(*(df['price'] for df in l2_snapshots)))
-        price_to_idx = {price: i for i, price in enumerate(all_prices)}
+        go = import_optional("plotly.graph_objects")
+        sample_times, levels, midprices = self.sample_L2_array(start_time, end_time, interval)
+        timestamps = [format_timestamp(t) for t in sample_times]
 
-        heatmap = np.zeros((len(all_prices), len(l2_snapshots)))
-
-        for t, snapshot in enumerate(l2_snapshots):
-            for _, row in snapshot.iterrows():
-                price = row['price']
-                size = row['size']
-                i = price_to_idx[price]
-                heatmap[i, t] = size
+        heatmap, all_prices = _price_level_grid(levels)
+        all_prices = all_prices * self.orderbook.price_scaling
 
         fig = go.Figure()
 
@@ -493,7 +1220,7 @@ class LobsterSim:
         if show_midprice:
             fig.add_trace(go.Scatter(
                 x=timestamps,
-                y=midprices,
+                y=midprices * self.orderbook.price_scaling,
                 mode='lines',
                 line=dict(color='white', width=2),
                 name='Midprice',
@@ -511,26 +1238,105 @@ class LobsterSim:
 
         fig.show()
 
-    def size_OFI_graph(self, start_time: float, end_time: float, frame_interval: float, reset_ofi_interval: float =np.inf) -> None:
+    def _decimated_series(self, name: str, times: np.ndarray, values: np.ndarray, n_pixels: int, decimate: bool) -> tuple:
         """
-        Plots a time series graph of the cumulative Size Order Flow Imbalance (OFI).
+        Cache a sampled series as a :class:`DecimationPyramid` under `name` in
+        `series_pyramids` and return its plotted points.
 
-        This function simulates the order book over a specified time range, calculating
-        the cumulative Size OFI at regular intervals and plotting the results. The Size
-        OFI measures the imbalance between the total size of buy and sell orders.
+        Returns
+        -------
+        tuple
+            (x as datetimes, y) reduced to a pixel-resolution envelope if `decimate`
+            is True, otherwise the full series.
+        """
+        pyramid = DecimationPyramid(times, values)
+        self.series_pyramids[name] = pyramid
+        if decimate:
+            return self.query_series(name, n_pixels=n_pixels)
+        return pd.to_datetime(pyramid.x, unit="s"), pyramid.y
+
+    def query_series(self, name: str, x0=None, x1=None, n_pixels: int = 1200) -> tuple:
+        """
+        Points of a plotted series for a visible x range, at pixel resolution.
 
         Parameters
         ----------
-        start_time : float
-            Timestamp (seconds after midnight) to start the simulation.
-        end_time : float
-            Timestamp (seconds after midnight) to end the simulation.
-        frame_interval : float
-            Time interval (in seconds) between each point plotted on the graph.
-        reset_ofi_interval : float, optional
-            The time interval (in seconds) at which the cumulative OFI value is reset to zero.
-            Defaults to `np.inf`, meaning the OFI is never reset within the plotting range.
+        name : str
+            Key in `series_pyramids`, e.g. "midprice".
+        x0, x1 : float, str or datetime-like, optional
+            Visible range, as seconds after midnight or as the datetimes of the plot's
+            x axis (e.g. the ``xaxis.range`` of a plotly relayout event). Default to
+            the whole series.
+        n_pixels : int, default=1200
+            Width of the plot area in pixels.
+
+        Returns
+        -------
+        tuple
+            (x as datetimes, y), see :meth:`DecimationPyramid.query`.
+        """
+        pyramid = self.series_pyramids.get(name)
+        if pyramid is None:
+            raise KeyError(f"No plotted series named {name!r}; available: {sorted(self.series_pyramids)}")
+        if not len(pyramid.x):
+            return pd.to_datetime(pyramid.x, unit="s"), pyramid.y
+        x0 = pyramid.x[0] if x0 is None else _axis_seconds(x0)
+        x1 = pyramid.x[-1] if x1 is None else _axis_seconds(x1)
+        x, y = pyramid.query(x0, x1, n_pixels)
+        return pd.to_datetime(x, unit="s"), y
+
+    def create_series_app(self, names=None, n_pixels: int = 1200) -> "Dash":
         """
+        Create a Dash application showing the series in `series_pyramids` that
+        re-queries them at full detail whenever a graph is zoomed or panned.
+
+        Parameters
+        ----------
+        names : sequence of str, optional
+            Series to show. Defaults to every series plotted so far.
+        n_pixels : int, default=1200
+            Width of each graph in pixels.
+
+        Returns
+        -------
+        dash.Dash
+            A Dash application instance that can be run or embedded in a web server.
+        """
+        import_optional("dash", "The series app")
+        from dash import Dash, dcc, html, Input, Output
+        names = list(self.series_pyramids) if names is None else list(names)
+        for name in names:
+            if name not in self.series_pyramids:
+                raise KeyError(f"No plotted series named {name!r}; available: {sorted(self.series_pyramids)}")
+
+        def series_figure(name, x0=None, x1=None):
+            x, y = self.query_series(name, x0, x1, n_pixels)
+            fig = self._time_series_figure(x, y, f"{self.orderbook.ticker} {name}", name, name,
+                                           dict(color='cyan'), 'lines')
+            fig.update_layout(width=n_pixels, uirevision=name)
+            if x0 is not None:
+                fig.update_xaxes(range=[x0, x1])
+            return fig
+
+        app = Dash(__name__)
+        app.layout = html.Div([dcc.Graph(id=f"series-{name}", figure=series_figure(name)) for name in names])
+
+        def register(name):
+            @app.callback(Output(f"series-{name}", 'figure'), Input(f"series-{name}", 'relayoutData'),
+                          prevent_initial_call=True)
+            def rezoom(relayout):
+                relayout = relayout or {}
+                if "xaxis.range[0]" in relayout:
+                    return series_figure(name, relayout["xaxis.range[0]"], relayout["xaxis.range[1]"])
+                if "xaxis.range" in relayout:
+                    return series_figure(name, *relayout["xaxis.range"])
+                return series_figure(name)
+
+        for name in names:
+            register(name)
+        return app
+
+    def _sample_OFI(self, start_time: float, end_time: float, frame_interval: float, reset_ofi_interval: float, ofi_method) -> tuple[np.ndarray, np.ndarray]:
         timestamps = []
         ofi_values = []
         self.simulate_until(start_time)
@@ -542,34 +1348,71 @@ class LobsterSim:
                 self.orderbook.reset_cum_OFI()
                 reset_time = 0
             self.simulate_from_current_until(curr_time)
-            ofi_values.append(self.orderbook.calc_size_OFI())
-            timestamps.append(format_timestamp(curr_time))
+            ofi_values.append(ofi_method())
+            timestamps.append(curr_time)
             curr_time += frame_interval
             reset_time += frame_interval
+        return np.asarray(timestamps, dtype=np.float64), np.asarray(ofi_values, dtype=np.float64)
 
-        fig = go.Figure()
+    def _show_time_series(self, x, y, title: str, yaxis_title: str, trace_name: str, line: dict, mode: str) -> None:
+        self._time_series_figure(x, y, title, yaxis_title, trace_name, line, mode).show()
 
+    def _time_series_figure(self, x, y, title: str, yaxis_title: str, trace_name: str, line: dict, mode: str):
+        go = import_optional("plotly.graph_objects")
+        fig = go.Figure()
         fig.add_trace(go.Scatter(
-            x=timestamps,
-            y=ofi_values,
-            mode='lines+markers',
-            line=dict(color='cyan'),
-            name='Size OFI'
+            x=x,
+            y=y,
+            mode=mode,
+            line=line,
+            name=trace_name,
         ))
 
         fig.update_layout(
-            title=f"{self.orderbook.ticker} OFI Time Series",
+            title=title,
             xaxis_title='Time',
-            yaxis_title='Order Flow Imbalance',
+            yaxis_title=yaxis_title,
+            xaxis=dict(tickformat='%H:%M:%S', hoverformat='%H:%M:%S.%f'),
             template='plotly_dark',
             height=500,
             width=1200,
             margin=dict(l=40, r=40, t=40, b=40)
         )
-        fig.show()
+        return fig
 
+    def size_OFI_graph(self, start_time: float, end_time: float, frame_interval: float, reset_ofi_interval: float =np.inf, decimate: bool = True) -> None:
+        """
+        Plots a time series graph of the cumulative Size Order Flow Imbalance (OFI).
+
+        This function simulates the order book over a specified time range, calculating
+        the cumulative Size OFI at regular intervals and plotting the results. The Size
+        OFI measures the imbalance between the total size of buy and sell orders.
 
-    def count_OFI_graph(self, start_time: float, end_time: float, frame_interval: float, reset_ofi_interval: float=np.inf) -> None:
+        Parameters
+        ----------
+        start_time : float
+            Timestamp (seconds after midnight) to start the simulation.
+        end_time : float
+            Timestamp (seconds after midnight) to end the simulation.
+        frame_interval : float
+            Time interval (in seconds) between each point plotted on the graph.
+        reset_ofi_interval : float, optional
+            The time interval (in seconds) at which the cumulative OFI value is reset to zero.
+            Defaults to `np.inf`, meaning the OFI is never reset within the plotting range.
+        decimate : bool, optional
+            If True (default), series with more points than the plot has pixels are
+            reduced to a min/max/first/last envelope per pixel before plotting. The
+            full series is kept in ``series_pyramids["size_OFI"]``; see
+            :meth:`query_series` and :meth:`create_series_app` for zoomed ranges.
+        """
+        times, ofi_values = self._sample_OFI(start_time, end_time, frame_interval, reset_ofi_interval,
+                                             self.orderbook.calc_size_OFI)
+        x, y = self._decimated_series("size_OFI", times, ofi_values, 1200, decimate)
+        self._show_time_series(x, y, f"{self.orderbook.ticker} OFI Time Series", 'Order Flow Imbalance',
+                               'Size OFI', dict(color='cyan'), 'lines+markers')
+
+
+    def count_OFI_graph(self, start_time: float, end_time: float, frame_interval: float, reset_ofi_interval: float=np.inf, decimate: bool = True) -> None:
         """
         Plots a time series graph of the cumulative Count Order Flow Imbalance (OFI).
 
@@ -588,45 +1431,19 @@ class LobsterSim:
         reset_ofi_interval : float, optional
             The time interval (in seconds) at which the cumulative OFI value is reset to zero.
             Defaults to `np.inf`, meaning the OFI is never reset within the plotting range.
+        decimate : bool, optional
+            If True (default), series with more points than the plot has pixels are
+            reduced to a min/max/first/last envelope per pixel before plotting. The
+            full series is kept in ``series_pyramids["count_OFI"]``; see
+            :meth:`query_series` and :meth:`create_series_app` for zoomed ranges.
         """
-        timestamps = []
-        ofi_values = []
-        self.simulate_until(start_time)
-        self.orderbook.reset_cum_OFI()
-        curr_time = start_time
-        reset_time = 0
-        while curr_time <= end_time:
-            if reset_time >= reset_ofi_interval:
-                self.orderbook.reset_cum_OFI()
-                reset_time = 0
-            self.simulate_from_current_until(curr_time)
-            ofi_values.append(self.orderbook.calc_count_OFI())
-            timestamps.append(format_timestamp(curr_time))
-            curr_time += frame_interval
-            reset_time += frame_interval
+        times, ofi_values = self._sample_OFI(start_time, end_time, frame_interval, reset_ofi_interval,
+                                             self.orderbook.calc_count_OFI)
+        x, y = self._decimated_series("count_OFI", times, ofi_values, 1200, decimate)
+        self._show_time_series(x, y, f"{self.orderbook.ticker} OFI Time Series", 'Order Flow Imbalance',
+                               'Size OFI', dict(color='cyan'), 'lines+markers')
 
-        fig = go.Figure()
-
-        fig.add_trace(go.Scatter(
-            x=timestamps,
-            y=ofi_values,
-            mode='lines+markers',
-            line=dict(color='cyan'),
-            name='Size OFI'
-        ))
-
-        fig.update_layout(
-            title=f"{self.orderbook.ticker} OFI Time Series",
-            xaxis_title='Time',
-            yaxis_title='Order Flow Imbalance',
-            template='plotly_dark',
-            height=500,
-            width=1200,
-            margin=dict(l=40, r=40, t=40, b=40)
-        )
-        fig.show()
-
-    def midprice_graph(self, start_time: float, end_time: float, interval: float) -> None:
+    def midprice_graph(self, start_time: float, end_time: float, interval: float, decimate: bool = True) -> None:
         """
         Plots a time series graph of the mid-price of the order book.
 
@@ -641,6 +1458,11 @@ class LobsterSim:
             Timestamp (seconds after midnight) to end the simulation.
         interval : float
             Time interval (in seconds) between each data point plotted on the graph.
+        decimate : bool, optional
+            If True (default), series with more points than the plot has pixels are
+            reduced to a min/max/first/last envelope per pixel before plotting. The
+            full series is kept in ``series_pyramids["midprice"]``; see
+            :meth:`query_series` and :meth:`create_series_app` for zoomed ranges.
         """
         timestamps = []
         midprices = []
@@ -648,28 +1470,14 @@ class LobsterSim:
         self.simulate_until(curr_time)
         while curr_time <= end_time:
             self.simulate_from_current_until(curr_time)
-            timestamps.append(format_timestamp(curr_time))
-            midprices.append(self.orderbook.mid_price() * self.orderbook.price_scaling)
+            midprice = self.orderbook.mid_price()
+            timestamps.append(curr_time)
+            midprices.append(np.nan if midprice is None else midprice * self.orderbook.price_scaling)
             curr_time += interval
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=timestamps,
-            y=midprices,
-            mode='lines',
-            line=dict(color='white', width=2),
-            name='Midprice',
-        ))
-
-        fig.update_layout(
-            title=f"{self.orderbook.ticker} Mid Price",
-            xaxis_title='Time',
-            yaxis_title='Price',
-            template='plotly_dark',
-            height=500,
-            width=1200,
-            margin=dict(l=40, r=40, t=40, b=40)
-        )
-        fig.show()
+        x, y = self._decimated_series("midprice", np.asarray(timestamps, dtype=np.float64),
+                                      np.asarray(midprices, dtype=np.float64), 1200, decimate)
+        self._show_time_series(x, y, f"{self.orderbook.ticker} Mid Price", 'Price', 'Midprice',
+                               dict(color='white', width=2), 'lines')
 
     def depth_percentile_graph(self, start_time: float, end_time: float, interval: float) -> None:
         """
@@ -688,38 +1496,19 @@ class LobsterSim:
             Timestamp (seconds after midnight) to end the simulation.
         interval : float
             Time interval (in seconds) between each data point (snapshot) on the heatmap.
+
+        Notes
+        -----
+        Snapshots are collected with :meth:`sample_L2_array`; sizes of levels that
+        round to the same BPS bin are summed.
         """
-        timestamps = []
-        l2_snapshots = []
-        midprices = []
-        curr_time = start_time
-        self.simulate_until(curr_time)
-        while curr_time <= end_time:
-            self.simulate_from_current_until(curr_time)
-            df = self.orderbook.convert_orderbook_to_L2_dataframe()
-            df.price = df.price.astype(float) * self.orderbook.price_scaling
-            l2_snapshots.append(df)
-            timestamps.append(format_timestamp(curr_time))
-            midprices.append(self.orderbook.mid_price() * self.orderbook.price_scaling)
-            curr_time += interval
+        go = import_optional("plotly.graph_objects")
+        sample_times, levels, midprices = self.sample_L2_array(start_time, end_time, interval)
+        timestamps = [format_timestamp(t) for t in sample_times]
+
+        heatmap, all_bps = _bps_grid(levels, midprices)
+        bps_abs_max = abs(max(all_bps[0], -all_bps[-1])) if len(all_bps) else 0
 
-        all_bps = set()
-        for i, df in enumerate(l2_snapshots):
-            bps_values = ((df["price"] - midprices[i]) / midprices[i] * 10000)
-            bps_values = bps_values.round().astype(int)
-            all_bps.update(bps_values.tolist())
-        all_bps = sorted(all_bps)
-        bps_abs_max = abs(max(all_bps[0], -all_bps[-1]))
-
-        bps_to_idx = {bps: i for i, bps in enumerate(all_bps)}
-        heatmap = np.zeros((len(all_bps), len(l2_snapshots)))
-
-        for t, snapshot in enumerate(l2_snapshots):
-            for _, row in snapshot.iterrows():
-                bps = int(round(((row['price'] - midprices[t]) / midprices[t] * 10000)))
-                size = row['size']
-                i = bps_to_idx[bps]
-                heatmap[i, t] = size
         fig = go.Figure(data=go.Heatmap(
             z=heatmap,
             x=timestamps,
@@ -750,47 +1539,230 @@ class LobsterSim:
         )
         fig.show()
 
-    def graph_trade_arrival_time(self, start_time: float, end_time: float, bin_size: float =None, filter_trade_type: Literal["aggro_lim", "vis_exec", "hid_exec"] = None) -> None:
+    def message_arrays(self) -> dict:
         """
-        Graphs the arrival count of bid and ask trades over time.
+        Typed NumPy view of the message data, built once and cached.
 
-        The function simulates trades within a specified time range, aggregates them
-        into time bins, and plots a bar chart showing the number of buy (bid) and
-        sell (ask) trades in each bin.
+        Returns
+        -------
+        dict
+            Arrays keyed by `time` (float64), `type` (int8 LOBSTER event code),
+            `order_id`, `size`, `price` (int64) and `direction` (int8, 1 for bid,
+            -1 for ask). `time` is sorted and serves as the time index for
+            slicing with ``np.searchsorted``.
+        """
+        self._require_message_data("message_arrays")
+        if self._message_arrays is None:
+            self._message_arrays = message_arrays_from_frame(self.dataM)
+        return self._message_arrays
+
+    def build_L2_engine(self) -> L2Engine:
+        """
+        Build (once) a vectorized L2 engine over the whole message data.
+
+        The engine answers top-of-book-depth queries at arbitrary times without
+        replaying the book, see :class:`L2Engine`. It is exact only while the
+        matching engine is off, which is the default for LOBSTER data. When a
+        time window was loaded from a book snapshot, the engine starts from that
+        snapshot's resting orders.
+
+        Returns
+        -------
+        L2Engine
+            Engine whose snapshots match :meth:`Orderbook.convert_orderbook_to_L2_array`
+            after :meth:`simulate_until` the same time.
+
+        Raises
+        ------
+        ValueError
+            If the orderbook uses its auto matching engine.
+        """
+        if self.orderbook._use_auto_matching_engine:
+            raise ValueError("L2Engine is exact only with the matching engine turned off.")
+        if self._l2_engine is None:
+            self._l2_engine = L2Engine.from_message_arrays(self.message_arrays(), self._base_state)
+        return self._l2_engine
+
+    def trades_in_window(
+        self,
+        start_time: float,
+        end_time: float,
+        filter_trade_type: Literal["aggro_lim", "vis_exec", "hid_exec"] = None,
+        l1_stream: L1Stream = None,
+    ) -> pd.DataFrame:
+        """
+        Trades executed after `start_time` up to and including `end_time`.
+
+        Visible and hidden executions are read directly from the message arrays
+        with vectorized masks; no replay is needed. Aggressive-limit trades only
+        exist when the orderbook uses its matching engine, in which case the
+        window is replayed and the trade log is returned instead. The window is
+        also replayed in streaming mode.
 
         Parameters
         ----------
         start_time : float
-            Timestamp (seconds after midnight) to start the simulation.
+            Timestamp (seconds after midnight) where the window starts (exclusive).
         end_time : float
-            Timestamp (seconds after midnight) to end the simulation.
+            Timestamp (seconds after midnight) where the window ends (inclusive).
+        filter_trade_type : Literal["aggro_lim", "vis_exec", "hid_exec"], optional
+            Only return trades of this type. Defaults to all types.
+        l1_stream : L1Stream, optional
+            Quote stream from :meth:`extract_L1_stream` covering the window. When
+            given, hidden execution direction is inferred from the midprice exactly
+            like the replay does; otherwise the LOBSTER message direction is used.
+
+        Returns
+        -------
+        DataFrame
+            Columns `timestamp`, `trade_type`, `direction`, `size`, `price` and
+            `order_id`, matching the fields of :attr:`Orderbook.trade_log`.
+        """
+        if self.orderbook._use_auto_matching_engine or filter_trade_type == "aggro_lim" or self._stream is not None:
+            self.simulate_until(start_time)
+            self.orderbook.clear_trade_log()
+            self.simulate_from_current_until(end_time)
+            df = pd.DataFrame(self.orderbook.trade_log, columns=list(Trade._fields))
+            if filter_trade_type is not None:
+                df = df[df["trade_type"] == filter_trade_type]
+            return df.reset_index(drop=True)
+
+        arrays = self.message_arrays()
+        lo, hi = np.searchsorted(arrays["time"], [start_time, end_time], side='right')
+        codes = arrays["type"][lo:hi]
+        if filter_trade_type is None:
+            mask = (codes == 4) | (codes == 5)
+        else:
+            mask = codes == EVENT_TYPE_CODES[filter_trade_type]
+        idx = lo + np.flatnonzero(mask)
+
+        prices = arrays["price"][idx]
+        direction = arrays["direction"][idx]
+        is_hidden = arrays["type"][idx] == 5
+        if l1_stream is not None and is_hidden.any():
+            rows = np.searchsorted(l1_stream.msg_index, idx[is_hidden], side='right') - 1
+            mid = np.where(rows >= 0, l1_stream.mid[np.maximum(rows, 0)], np.nan)
+            hidden_dir = direction[is_hidden]
+            hidden_dir = np.where(prices[is_hidden] < mid, 1, np.where(prices[is_hidden] > mid, -1, hidden_dir))
+            direction = direction.copy()
+            direction[is_hidden] = hidden_dir
+
+        return pd.DataFrame({
+            "timestamp": arrays["time"][idx],
+            "trade_type": np.where(is_hidden, "hid_exec", "vis_exec"),
+            "direction": np.where(direction == 1, "bid", "ask"),
+            "size": arrays["size"][idx],
+            "price": prices,
+            "order_id": arrays["order_id"][idx],
+        })
+
+    def _hidden_direction_stream(self, start_time: float, end_time: float, filter_trade_type) -> L1Stream:
+        """
+        Quote stream for :meth:`trades_in_window` to infer hidden execution
+        direction from, or None when the window is replayed anyway or holds no
+        hidden executions of interest.
+        """
+        if (self.orderbook._use_auto_matching_engine or self._stream is not None
+                or filter_trade_type not in (None, "hid_exec")):
+            return None
+        return self.extract_L1_stream(start_time, end_time)
+
+    def trade_arrival_counts(self, start_time: float, end_time: float, bin_size: float = None,
+                             filter_trade_type: Literal["aggro_lim", "vis_exec", "hid_exec"] = None,
+                             l1_stream: L1Stream = None) -> pd.DataFrame:
+        """
+        Number of bid and ask trades per time bin.
+
+        Parameters
+        ----------
+        start_time : float
+            Timestamp (seconds after midnight) where the window starts.
+        end_time : float
+            Timestamp (seconds after midnight) where the window ends.
         bin_size : float, optional
             The size of each time bin in seconds. If None, the bin size is set to
             1/100th of the total time range.
         filter_trade_type : Literal["aggro_lim", "vis_exec", "hid_exec"], optional
-            A filter to display only a specific type of trade. Defaults to None,
-            meaning all trade types are included.
+            Only count trades of this type. Defaults to all types.
+        l1_stream : L1Stream, optional
+            See :meth:`trades_in_window`.
+
+        Returns
+        -------
+        DataFrame
+            Indexed by bin start time (seconds after midnight) with `bid` and `ask`
+            count columns. Only non-empty bins are listed.
         """
         if bin_size is None:
             bin_size = (end_time - start_time) / 100
-        self.simulate_until(start_time)
-        self.orderbook.clear_trade_log()
-        self.simulate_from_current_until(end_time)
+        df = self.trades_in_window(start_time, end_time, filter_trade_type, l1_stream)
+        return _count_by_bin(df["timestamp"].to_numpy(dtype=np.float64), df["direction"].to_numpy() == "bid", bin_size)
 
-        df = pd.DataFrame(self.orderbook.trade_log)
+    def trade_size_counts(self, start_time: float, end_time: float, bin_size: int = 20,
+                          filter_trade_type: Literal["aggro_lim", "vis_exec", "hid_exec"] = None,
+                          l1_stream: L1Stream = None, max_zscore: float = 3) -> pd.DataFrame:
+        """
+        Number of bid and ask trades per trade-size bin, with size outliers removed.
+
+        Parameters
+        ----------
+        start_time : float
+            Timestamp (seconds after midnight) where the window starts.
+        end_time : float
+            Timestamp (seconds after midnight) where the window ends.
+        bin_size : int, default=20
+            The size of each trade size bin.
+        filter_trade_type : Literal["aggro_lim", "vis_exec", "hid_exec"], optional
+            Only count trades of this type. Outliers are identified over all trades
+            before this filter is applied.
+        l1_stream : L1Stream, optional
+            See :meth:`trades_in_window`.
+        max_zscore : float, default=3
+            Trades whose size Z-score exceeds this value in absolute terms are dropped.
 
-        df["time_bin"] = (df["timestamp"] // bin_size) * bin_size
+        Returns
+        -------
+        DataFrame
+            Indexed by bin start size with `bid` and `ask` count columns. Only
+            non-empty bins are listed.
+        """
+        df = self.trades_in_window(start_time, end_time, None if filter_trade_type != "aggro_lim" else filter_trade_type,
+                                   l1_stream)
+        sizes = df["size"].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            zscores = (sizes - sizes.mean()) / sizes.std() if len(sizes) else sizes
+        keep = np.abs(zscores) <= max_zscore
         if filter_trade_type is not None:
-            df = df[df["trade_type"] == filter_trade_type]
+            keep &= df["trade_type"].to_numpy() == filter_trade_type
+        return _count_by_bin(sizes[keep], df["direction"].to_numpy()[keep] == "bid", bin_size)
 
-        grouped = df.groupby(["time_bin", "direction"]).size().unstack(fill_value=0)
+    def graph_trade_arrival_time(self, start_time: float, end_time: float, bin_size: float =None, filter_trade_type: Literal["aggro_lim", "vis_exec", "hid_exec"] = None) -> None:
+        """
+        Graphs the arrival count of bid and ask trades over time.
 
-        if "bid" not in grouped.columns:
-            grouped["bid"] = 0
-        if "ask" not in grouped.columns:
-            grouped["ask"] = 0
+        The function collects trades within a specified time range (see
+        :meth:`trades_in_window`), aggregates them into time bins, and plots a bar
+        chart showing the number of buy (bid) and sell (ask) trades in each bin.
 
-        grouped = grouped.sort_index()
+        Parameters
+        ----------
+        start_time : float
+            Timestamp (seconds after midnight) to start the simulation.
+        end_time : float
+            Timestamp (seconds after midnight) to end the simulation.
+        bin_size : float, optional
+            The size of each time bin in seconds. If None, the bin size is set to
+            1/100th of the total time range.
+        filter_trade_type : Literal["aggro_lim", "vis_exec", "hid_exec"], optional
+            A filter to display only a specific type of trade. Defaults to None,
+            meaning all trade types are included.
+        """
+        go = import_optional("plotly.graph_objects")
+        grouped = self.trade_arrival_counts(start_time, end_time, bin_size, filter_trade_type,
+                                            self._hidden_direction_stream(start_time, end_time, filter_trade_type))
+        if grouped.empty:
+            print("No trades in the given time range.")
+            return
         max_count = max(grouped["bid"].max(), grouped["ask"].max())
 
         fig = go.Figure()
@@ -833,9 +1805,10 @@ class LobsterSim:
         """
         Graphs the size distribution of bid and ask trades.
 
-        This function simulates trades within a specified time range, filters out outliers
-        using Z-score, and then creates a bar chart showing the distribution of trade
-        sizes for both bids and asks.
+        This function collects trades within a specified time range (see
+        :meth:`trades_in_window`), filters out outliers using Z-score, and then
+        creates a bar chart showing the distribution of trade sizes for both bids
+        and asks.
 
         Parameters
         ----------
@@ -849,37 +1822,12 @@ class LobsterSim:
             A filter to display only a specific type of trade. Defaults to None,
             meaning all trade types are included.
         """
-        self.simulate_until(start_time)
-        self.orderbook.clear_trade_log()
-        self.simulate_from_current_until(end_time)
-
-        df = pd.DataFrame(self.orderbook.trade_log)
-
-        if df.empty:
+        go = import_optional("plotly.graph_objects")
+        grouped = self.trade_size_counts(start_time, end_time, bin_size, filter_trade_type,
+                                         self._hidden_direction_stream(start_time, end_time, filter_trade_type))
+        if grouped.empty:
             print("No trades in the given time range.")
             return
-
-        df["z_score"] = zscore(df["size"])
-        df = df[df["z_score"].abs() <= 3]
-        df.drop(columns="z_score", inplace=True)
-
-        if df.empty:
-            print("All trades were filtered out as outliers.")
-            return
-
-        if filter_trade_type is not None:
-            df = df[df["trade_type"] == filter_trade_type]
-
-        df["size_bin"] = (df["size"] // bin_size) * bin_size
-
-        grouped = df.groupby(["size_bin", "direction"]).size().unstack(fill_value=0)
-
-        if "bid" not in grouped.columns:
-            grouped["bid"] = 0
-        if "ask" not in grouped.columns:
-            grouped["ask"] = 0
-
-        grouped = grouped.sort_index()
         max_count = max(grouped["bid"].max(), grouped["ask"].max())
 
         fig = go.Figure()
@@ -1191,3 +2139,104 @@ class LobsterSim:
             if self._last_idx%10000 == 0:
                 print(f"{self._last_idx} / {self.dataM.shape[0]}")
         print("Full book is good")
+
+    def validate_full_book(
+        self,
+        num_levels_to_check: int,
+        n_level_message_df: pd.DataFrame = None,
+        sample_every: int = 1,
+        max_mismatches: int = None,
+    ) -> BookValidationReport:
+        """
+        Replay the message data from the start and validate every snapshot against
+        the LOBSTER orderbook.csv file, collecting all mismatches instead of stopping
+        at the first one.
+
+        The reconstructed L2 state is written into a preallocated array during a
+        single replay and compared with the (memory-mapped) orderbook file array in
+        one vectorized step.
+
+        Parameters
+        ----------
+        num_levels_to_check : int
+            Number of levels per side to compare.
+        n_level_message_df : pd.DataFrame, optional
+            Message data (same format as `dataM`) paired row-by-row with the
+            orderbook file. Needed when `dataM` was loaded from a full-depth
+            message file; each reference message is located in `dataM` and the
+            book is compared after it is applied. If None, `dataM` itself is
+            assumed to be paired row-by-row with the orderbook file.
+        sample_every : int, default=1
+            Compare only every k-th orderbook file row. The replay still
+            processes every message.
+        max_mismatches : int, optional
+            Maximum number of mismatching cells listed in the report table.
+            Summary counts always cover every mismatch.
+
+        Returns
+        -------
+        BookValidationReport
+            Mismatch table, summary counts and replay throughput.
+
+        Raises
+        ------
+        ValueError
+            If no orderbook file was given or `sample_every` is not positive.
+        """
+        self._require_message_data("Book validation")
+        if self._dataL_array is None:
+            raise ValueError("validate_full_book requires lob_book_file_path to be set")
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+
+        started = _time.perf_counter()
+        n_ref = len(self._dataL_array)
+        if n_level_message_df is not None:
+            n_ref = min(n_ref, len(n_level_message_df))
+            reference_rows = list(n_level_message_df.iloc[:n_ref].itertuples(index=False, name=None))
+        else:
+            n_ref = min(n_ref, len(self.dataM))
+            reference_rows = None
+
+        n_samples = (n_ref + sample_every - 1) // sample_every
+        reconstructed = np.empty((n_samples, num_levels_to_check, 4), dtype=np.int64)
+        message_indices = np.empty(n_samples, dtype=np.int64)
+        times = np.empty(n_samples, dtype=np.float64)
+
+        self._last_idx = 0
+        self._reset_book(self.orderbook)
+        ref_pos = 0
+        sample = 0
+        for row in self.dataM.itertuples(index=False, name=None):
+            if ref_pos >= n_ref:
+                break
+            self.orderbook.process_order(Order(*row))
+            self._last_idx += 1
+            if reference_rows is not None and row != reference_rows[ref_pos]:
+                continue
+            if ref_pos % sample_every == 0:
+                self.orderbook.convert_orderbook_to_L2_array(num_levels_to_check, out=reconstructed[sample])
+                message_indices[sample] = self._last_idx - 1
+                times[sample] = row[0]
+                sample += 1
+            ref_pos += 1
+
+        snapshot_rows = np.arange(sample, dtype=np.int64) * sample_every
+        mismatched_snapshots, mismatch_count, field_counts, mismatches = compare_L2_arrays(
+            reconstructed[:sample],
+            self._dataL_array[snapshot_rows],
+            snapshot_rows,
+            message_indices[:sample],
+            times[:sample],
+            max_mismatches=max_mismatches,
+        )
+        return BookValidationReport(
+            num_levels=num_levels_to_check,
+            snapshots_checked=sample,
+            mismatched_snapshots=mismatched_snapshots,
+            mismatch_count=mismatch_count,
+            field_counts=field_counts,
+            mismatches=mismatches,
+            events_processed=self._last_idx,
+            elapsed=_time.perf_counter() - started,
+        )
@@ -0,0 +1,346 @@
+import gc
+import sys
+import tracemalloc
+import types
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+# Objects that belong to the program rather than to a data structure
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+@dataclass
+class MemoryReport:
+    """
+    Bytes used by each component of an order book or simulator.
+
+    Attributes
+    ----------
+    exact : bool
+        True if sizes come from a deep traversal of the objects, False for the
+        cheap estimate.
+    components : dict
+        Bytes per component, e.g. "messages", "reference_book", "levels", "orders",
+        "trade_log".
+    details : dict
+        Optional per-component breakdown, e.g. bytes per message table column.
+    mapped : dict
+        Bytes of memory-mapped arrays per component. They are included in
+        `components` but only occupy RAM for the pages that have been read.
+    traced_current, traced_peak : int or None
+        Memory currently and maximally allocated according to :mod:`tracemalloc`,
+        if it was tracing when the report was made.
+    """
+    exact: bool
+    components: dict = field(default_factory=dict)
+    details: dict = field(default_factory=dict)
+    mapped: dict = field(default_factory=dict)
+    traced_current: int = None
+    traced_peak: int = None
+
+    @property
+    def total(self) -> int:
+        return sum(self.components.values())
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Report as a DataFrame with columns `component`, `item` and `bytes`.
+
+        Components without a breakdown have a single row with an empty `item`.
+        """
+        rows = []
+        for name, size in self.components.items():
+            items = self.details.get(name)
+            if items:
+                rows.extend((name, item, n) for item, n in items.items())
+            else:
+                rows.append((name, "", size))
+        return pd.DataFrame(rows, columns=["component", "item", "bytes"])
+
+    def __str__(self) -> str:
+        lines = [f"Memory ({'exact' if self.exact else 'estimate'}): {self.total / 2 ** 20:,.1f} MiB"]
+        for name, size in sorted(self.components.items(), key=lambda kv: -kv[1]):
+            note = " (memory-mapped)" if self.mapped.get(name) else ""
+            lines.append(f"  {name:<16} {size / 2 ** 20:10,.2f} MiB{note}")
+        if self.traced_current is not None:
+            lines.append(f"  tracemalloc: current {self.traced_current / 2 ** 20:,.1f} MiB, "
+                         f"peak {self.traced_peak / 2 ** 20:,.1f} MiB")
+        return "\n".join(lines)
+
+
+# -------------------------
+# Sizing helpers
+# -------------------------
+def deep_getsizeof(obj, seen: set = None) -> int:
+    """
+    Bytes used by `obj` and every object it references, each counted once.
+
+    NumPy arrays count their data buffer once per owning array; classes,
+    modules and functions are not followed.
+
+    Parameters
+    ----------
+    obj : object
+        Root object.
+    seen : set, optional
+        IDs of objects already counted. Pass the same set to several calls to
+        split shared structures between components without double counting.
+
+    Returns
+    -------
+    int
+        Size in bytes.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _SKIP_TYPES):
+            continue
+        seen.add(id(o))
+        if isinstance(o, np.ndarray):
+            total += array_nbytes(o, seen)
+            if o.dtype == object:
+                stack.extend(o.ravel().tolist())
+            continue
+        total += sys.getsizeof(o)
+        stack.extend(gc.get_referents(o))
+    return total
+
+
+def array_nbytes(arr: np.ndarray, seen: set = None) -> int:
+    """
+    Bytes of the buffer behind `arr`, counted once per owning array when `seen` is shared.
+    """
+    owner = arr
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+    if seen is not None:
+        if id(owner) in seen and owner is not arr:
+            return 0
+        seen.add(id(owner))
+    return owner.nbytes if owner.flags.owndata else arr.nbytes
+
+
+def _is_mapped(arr: np.ndarray) -> bool:
+    while isinstance(arr, np.ndarray):
+        if isinstance(arr, np.memmap):
+            return True
+        arr = arr.base
+    return arr is not None and type(arr).__name__ == "mmap"
+
+
+def frame_memory(df: pd.DataFrame, exact: bool = False) -> dict:
+    """
+    Bytes per column of a DataFrame, including the index as "Index".
+
+    The estimate counts the column buffers (8-byte pointers for object columns);
+    the exact mode adds each distinct object referenced by object columns once.
+    """
+    sizes = df.memory_usage(index=True, deep=False).to_dict()
+    if exact:
+        for col in df.columns:
+            if df[col].dtype == object:
+                unique = {id(v): v for v in df[col].to_numpy()}
+                sizes[col] += sum(sys.getsizeof(v) for v in unique.values())
+    return {str(k): int(v) for k, v in sizes.items()}
+
+
+def _arrays_memory(obj, seen: set) -> int:
+    """
+    Buffer bytes of the arrays in a (possibly nested) container of arrays and scalars.
+    """
+    if isinstance(obj, np.ndarray):
+        return array_nbytes(obj, seen)
+    if isinstance(obj, dict):
+        return sum(_arrays_memory(v, seen) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_arrays_memory(v, seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return sum(_arrays_memory(v, seen) for v in vars(obj).values())
+    return 0
+
+
+# -------------------------
+# Reports
+# -------------------------
+def orderbook_memory(orderbook, exact: bool = False) -> MemoryReport:
+    """
+    Memory used by an :class:`Orderbook`.
+
+    Components are "levels" (the sorted price maps and per-level order dicts),
+    "orders" (resting :class:`LimitOrder` objects), "trade_log", "anomalies",
+    "ofi" and, when journaling is enabled, "journal".
+
+    Parameters
+    ----------
+    orderbook : Orderbook
+        Book to measure.
+    exact : bool, default=False
+        Traverse every object instead of extrapolating from one sample per kind.
+        The estimate is O(price levels); the exact mode is O(objects).
+
+    Returns
+    -------
+    MemoryReport
+    """
+    sides = (orderbook.bids, orderbook.asks)
+    report = MemoryReport(exact=exact)
+    if exact:
+        seen = set()
+        report.components["orders"] = sum(deep_getsizeof(o, seen) for side in sides
+                                          for level in side.values() for o in level.values())
+        report.components["levels"] = deep_getsizeof(sides, seen)
+        report.components["trade_log"] = deep_getsizeof(orderbook.trade_log, seen)
+    else:
+        n_levels = sum(len(side) for side in sides)
+        # SortedDict hash tables, plus per level a sorted key list pointer, the price int
+        # and the order dict
+        levels = sum(sys.getsizeof(side) for side in sides)
+        levels += n_levels * (8 + 28) + sum(sys.getsizeof(level) for side in sides for level in side.values())
+        report.components["levels"] = levels
+
+        n_orders = sum(len(level) for side in sides for level in side.values())
+        sample = [o for side in sides for level in side.values()[:4] for o in list(level.values())[:4]]
+        report.components["orders"] = int(n_orders * _mean_object_size(sample))
+
+        trades = orderbook.trade_log
+        sample = trades[::max(1, len(trades) // 16)]
+        report.components["trade_log"] = sys.getsizeof(trades) + int(len(trades) * _mean_object_size(sample))
+    anomalies = orderbook.anomalies
+    report.components["anomalies"] = sum(sys.getsizeof(a) for a in (anomalies.msg_index, anomalies.kind,
+                                                                     anomalies.event_type, anomalies.order_id,
+                                                                     anomalies.price, anomalies.timestamp))
+    report.components["ofi"] = deep_getsizeof(orderbook.cum_OFI)
+    if orderbook.journal is not None:
+        entries = orderbook.journal.entries
+        if exact:
+            # Orders still resting were counted above; only removed ones are the journal's
+            report.components["journal"] = deep_getsizeof(entries, seen)
+        else:
+            sample = [entries[i] for i in range(0, len(entries), max(1, len(entries) // 16))]
+            mean = sum(deep_getsizeof(entry) for entry in sample) / len(sample) if sample else 0.0
+            report.components["journal"] = sys.getsizeof(entries) + int(len(entries) * mean)
+    _add_tracemalloc(report)
+    return report
+
+
+def _mean_object_size(sample: list) -> float:
+    """
+    Mean size of record objects and their numeric fields; strings are assumed shared.
+    """
+    if not sample:
+        return 0.0
+    total = 0
+    for obj in sample:
+        total += sys.getsizeof(obj)
+        if hasattr(obj, "__dict__"):
+            total += sys.getsizeof(obj.__dict__)
+            values = vars(obj).values()
+        else:
+            values = obj
+        total += sum(sys.getsizeof(v) for v in values if _is_boxed_number(v))
+    return total / len(sample)
+
+
+def _is_boxed_number(v) -> bool:
+    # Small ints are cached by the interpreter and cost nothing per record
+    if type(v) is int:
+        return not -5 <= v <= 256
+    return isinstance(v, (float, np.generic))
+
+
+def sim_memory(sim, exact: bool = False) -> MemoryReport:
+    """
+    Memory used by a :class:`LobsterSim` and its order book.
+
+    Components are "messages" (`dataM`, per column in `details`), "message_arrays",
+    "reference_book" (the orderbook file table; its DataFrame view shares the
+    buffer), "l2_engine", "snapshots" (the window base state), "pyramids" (cached
+    plot series) plus the components of :func:`orderbook_memory`.
+
+    Parameters
+    ----------
+    sim : LobsterSim
+        Simulator to measure.
+    exact : bool, default=False
+        See :func:`orderbook_memory`. Also counts the distinct objects behind
+        object columns of the message table.
+
+    Returns
+    -------
+    MemoryReport
+    """
+    report = MemoryReport(exact=exact)
+    seen = set()
+    if sim.dataM is not None:
+        columns = frame_memory(sim.dataM, exact)
+        report.details["messages"] = columns
+        report.components["messages"] = sum(columns.values())
+    report.components["message_arrays"] = _arrays_memory(sim._message_arrays, seen)
+    if sim._dataL_array is not None:
+        report.components["reference_book"] = array_nbytes(sim._dataL_array, seen)
+        if _is_mapped(sim._dataL_array):
+            report.mapped["reference_book"] = report.components["reference_book"]
+    report.components["l2_engine"] = _arrays_memory(sim._l2_engine, seen)
+    report.components["snapshots"] = _arrays_memory(sim._base_state, seen)
+    report.components["pyramids"] = _arrays_memory(sim.series_pyramids, seen)
+
+    book = orderbook_memory(sim.orderbook, exact)
+    report.components.update(book.components)
+    _add_tracemalloc(report)
+    return report
+
+
+def _add_tracemalloc(report: MemoryReport) -> None:
+    if tracemalloc.is_tracing():
+        report.traced_current, report.traced_peak = tracemalloc.get_traced_memory()
+
+
+def sample_replay_memory(sim, times, exact: bool = False, trace: bool = True) -> pd.DataFrame:
+    """
+    Replay the simulator's book and record its memory footprint at each time.
+
+    Parameters
+    ----------
+    sim : LobsterSim
+        Simulator to replay. Its book is reset to the start of the data.
+    times : array-like
+        Sorted sample times in seconds after midnight.
+    exact : bool, default=False
+        Use exact component sizes (slow for large books).
+    trace : bool, default=True
+        Also record the Python heap allocated and the peak allocation since the
+        previous sample with :mod:`tracemalloc`. Tracing slows the replay down; it
+        is started for the duration of the call if it is not already running.
+
+    Returns
+    -------
+    DataFrame
+        One row per sample time with the `time`, the bytes of every component,
+        `total` and, when tracing, `traced_current` and `traced_peak`.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    started = trace and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    rows = []
+    try:
+        if len(times):
+            sim.simulate_until(times[0])
+        for t in times:
+            sim.simulate_from_current_until(t)
+            report = sim_memory(sim, exact)
+            row = {"time": t, **report.components, "total": report.total}
+            if report.traced_current is not None:
+                row["traced_current"] = report.traced_current
+                row["traced_peak"] = report.traced_peak
+                tracemalloc.reset_peak()
+            rows.append(row)
+    finally:
+        if started:
+            tracemalloc.stop()
+    return pd.DataFrame(rows)
@@ -0,0 +1,204 @@
+import numpy as np
+
+from .orders import Order
+from .loaders import load_message_arrays, _EVENT_TYPE_LABELS, _DIRECTION_LABELS
+
+
+class MultiBookSim:
+    """
+    Several order books replayed on one clock from a time-merged message stream.
+
+    The message files are parsed into typed arrays and merged once into a single
+    stream sorted by timestamp; ties keep the order of `books` and, within a
+    file, the file order. One replay loop then feeds every message to the book
+    it belongs to, so the per-event cost does not depend on the number of books.
+
+    Parameters
+    ----------
+    books : dict
+        Order books keyed by ticker.
+    message_files : dict
+        LOBSTER message.csv file path per ticker (same keys as `books`).
+
+    Attributes
+    ----------
+    tickers : list
+        Tickers in merge priority order.
+    books : dict
+        Order books keyed by ticker.
+    time : np.ndarray
+        Merged message timestamps (sorted).
+    book_index : np.ndarray
+        Position in `tickers` of the book each merged message belongs to.
+    msg_index : np.ndarray
+        Row of each merged message in its own message file.
+    """
+    def __init__(self, books: dict, message_files: dict):
+        if set(books) != set(message_files):
+            raise ValueError("books and message_files must have the same tickers")
+        self.tickers = list(books)
+        self.books = dict(books)
+        if len(self.tickers) > np.iinfo(np.int32).max:
+            raise ValueError("too many books")
+
+        arrays = [load_message_arrays(message_files[ticker]) for ticker in self.tickers]
+        lengths = [len(a["time"]) for a in arrays]
+        time = np.concatenate([a["time"] for a in arrays]) if arrays else np.zeros(0)
+        book_index = np.repeat(np.arange(len(arrays), dtype=np.int32), lengths)
+        msg_index = np.concatenate([np.arange(n, dtype=np.int64) for n in lengths]) if arrays else np.zeros(0, np.int64)
+        order = np.lexsort((msg_index, book_index, time))
+
+        def merged(name):
+            return np.concatenate([a[name] for a in arrays])[order] if arrays else np.zeros(0)
+
+        self.time = time[order]
+        self.book_index = book_index[order]
+        self.msg_index = msg_index[order]
+        # Columns in the form Order expects, merged once so replay only slices them
+        self._event_type = _EVENT_TYPE_LABELS[merged("type").astype(np.int64)]
+        self._direction = _DIRECTION_LABELS[merged("direction").astype(np.int64) + 1]
+        self._order_id = merged("order_id")
+        self._size = merged("size")
+        self._price = merged("price")
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    # -------------------------
+    # Replay
+    # -------------------------
+    def simulate_until(self, time: float) -> None:
+        """
+        Reset every book and replay the merged stream up to `time` (inclusive).
+
+        Parameters
+        ----------
+        time : float
+            Time in seconds after midnight to simulate until.
+        """
+        for book in self.books.values():
+            book.clear_orderbook()
+        self._position = 0
+        self._replay_until(time)
+
+    def simulate_from_current_until(self, time: float) -> None:
+        """
+        Continue the replay of all books from their current state up to `time`.
+
+        Parameters
+        ----------
+        time : float
+            Time in seconds after midnight to simulate until.
+
+        Raises
+        ------
+        ValueError
+            If `time` is earlier than the last applied message.
+        """
+        if self._position and time < self.time[self._position - 1]:
+            raise ValueError("time parameter must be later than the current book timestamp")
+        self._replay_until(time)
+
+    def _replay_until(self, time: float, chunk_size: int = 65536) -> np.ndarray:
+        """
+        Apply merged messages up to `time` and return the indices of the books they touched.
+        """
+        start = self._position
+        stop = int(np.searchsorted(self.time, time, side='right'))
+        process = [self.books[ticker].process_order for ticker in self.tickers]
+        for lo in range(start, stop, chunk_size):
+            hi = min(lo + chunk_size, stop)
+            for b, t, event_type, order_id, size, price, direction in zip(
+                    self.book_index[lo:hi].tolist(), self.time[lo:hi].tolist(), self._event_type[lo:hi],
+                    self._order_id[lo:hi].tolist(), self._size[lo:hi].tolist(), self._price[lo:hi].tolist(),
+                    self._direction[lo:hi]):
+                process[b](Order(t, event_type, order_id, size, price, direction))
+        self._position = stop
+        return np.unique(self.book_index[start:stop])
+
+    # -------------------------
+    # Synchronized sampling
+    # -------------------------
+    def sample_L2_array(self, start_time: float, end_time: float, interval: float,
+                        num_levels: int = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sample the L2 state of every book on a common regular time grid.
+
+        Only books that received messages since the previous sample are
+        converted again; the others repeat their previous row.
+
+        Parameters
+        ----------
+        start_time : float
+            Timestamp (seconds after midnight) of the first sample.
+        end_time : float
+            Timestamp (seconds after midnight) of the last sample (inclusive).
+        interval : float
+            Time interval (in seconds) between consecutive samples.
+        num_levels : int, optional
+            Number of levels per side. Defaults to the largest `nlevels` of the books.
+
+        Returns
+        -------
+        timestamps : np.ndarray
+            Sample times, shape (T,).
+        levels : np.ndarray
+            int64 array of shape (T, n_books, num_levels, 4), books in `tickers`
+            order, see :meth:`Orderbook.convert_orderbook_to_L2_array`.
+        midprices : np.ndarray
+            Unscaled midprices, shape (T, n_books) (NaN where a side is empty).
+        """
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        n_samples = int(np.floor((end_time - start_time) / interval + 1e-9)) + 1 if end_time >= start_time else 0
+        timestamps = start_time + interval * np.arange(n_samples)
+        return timestamps, *self.sample_L2_at(timestamps, num_levels)
+
+    def sample_L2_at(self, times: np.ndarray, num_levels: int = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sample the L2 state of every book at sorted arbitrary times.
+
+        The books are reset and replayed from the start of the stream.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            Sorted sample times in seconds after midnight.
+        num_levels : int, optional
+            Number of levels per side. Defaults to the largest `nlevels` of the books.
+
+        Returns
+        -------
+        levels : np.ndarray
+            int64 array of shape (len(times), n_books, num_levels, 4).
+        midprices : np.ndarray
+            Unscaled midprices, shape (len(times), n_books).
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if num_levels is None:
+            num_levels = max((book.nlevels for book in self.books.values()), default=0)
+        books = [self.books[ticker] for ticker in self.tickers]
+        levels = np.empty((len(times), len(books), num_levels, 4), dtype=np.int64)
+        midprices = np.full((len(times), len(books)), np.nan)
+
+        if len(times):
+            self.simulate_until(times[0])
+        changed = np.arange(len(books))
+        for i, t in enumerate(times):
+            if i:
+                changed = self._replay_until(t)
+                levels[i] = levels[i - 1]
+                midprices[i] = midprices[i - 1]
+            for b in changed.tolist():
+                books[b].convert_orderbook_to_L2_array(num_levels, out=levels[i, b])
+                midprice = books[b].mid_price()
+                midprices[i, b] = np.nan if midprice is None else midprice
+        return levels, midprices
+
+    def mid_prices(self) -> np.ndarray:
+        """
+        Current unscaled midprice of every book in `tickers` order (NaN where undefined).
+        """
+        midprices = [self.books[ticker].mid_price() for ticker in self.tickers]
+        return np.array([np.nan if m is None else m for m in midprices], dtype=np.float64)
@@ -1,19 +1,30 @@
 from sortedcontainers import SortedDict
-from typing import Literal, List
+from typing import Literal, List, TYPE_CHECKING
 from collections import namedtuple
+from copy import deepcopy
 import numpy as np
 import pandas as pd
-import plotly.express as px
-from plotly.basedatatypes import BaseTraceType
 import warnings
 import logging
 
 from .orders import Order, LimitOrder
 from .ofi import OFI
-from .utils import format_timestamp
+from .utils import format_timestamp, import_optional
+from .instrumentation import ReplayStats, instrument_process_order
+from .anomalies import AnomalyLog
+from .journal import UndoJournal, journal_process_order, undo
+from .memory import MemoryReport, orderbook_memory
+
+if TYPE_CHECKING:
+    from plotly.basedatatypes import BaseTraceType
 
 logger = logging.getLogger(__name__)
 
+LOBSTER_DUMMY_ASK_PRICE = 9999999999
+LOBSTER_DUMMY_BID_PRICE = -9999999999
+
+Trade = namedtuple("Trade", ["timestamp", "trade_type", "direction", "size", "price", "order_id"])
+
 class Orderbook:
     """
     Limit Order Book (LOB) data structure with support for order
@@ -51,6 +62,29 @@ class Orderbook:
         Object tracking cumulative order flow imbalance (OFI).
     trade_log : list
         List of executed trades (as namedtuples).
+    bbo_change_count : int
+        Number of times the best bid/ask price or size changed since the book was
+        last cleared.
+    on_bbo_change : callable or None
+        Optional callback invoked as ``on_bbo_change(orderbook)`` after every change
+        of the best bid/ask price or size.
+    stats : ReplayStats or None
+        Statistics collected while instrumentation is enabled, see
+        :meth:`enable_instrumentation`.
+    message_count : int
+        Number of messages processed since the book was last cleared.
+    anomalies : AnomalyLog
+        Messages that referred to a price or order missing from the book since
+        the book was last cleared.
+    journal : UndoJournal or None
+        Inverses of the most recent messages while journaling is enabled, see
+        :meth:`enable_journal`.
+
+    Notes
+    -----
+    The best bid/ask prices and sizes are cached and updated by the order
+    handlers, so events away from the touch do not iterate the price levels.
+    Code that edits `bids`/`asks` directly must call `_refresh_bbo` afterwards.
     """
     def __init__(self, nlevels: int, ticker: str, tick_size: float, price_scaling: float =0.0001, use_matching_engine: bool = False):
         if tick_size <= 0 or price_scaling <= 0:
@@ -71,6 +105,17 @@ class Orderbook:
         self.trade_log = []
         self._warning_count = 0
         self._use_auto_matching_engine = use_matching_engine
+        self._best_bid = 0
+        self._best_bid_size = 0
+        self._best_ask = np.inf
+        self._best_ask_size = 0
+        self.bbo_change_count = 0
+        self.on_bbo_change = None
+        self.stats = None
+        self._instrumentation = None  # (installed wrapper, previous instance process_order)
+        self.message_count = 0
+        self.anomalies = AnomalyLog(name=ticker, log=logger)
+        self.journal = None
 
     # -------------------------
     # State management
@@ -81,11 +126,99 @@ class Orderbook:
         """
         self.bids.clear()
         self.asks.clear()
+        self._best_bid, self._best_bid_size = 0, 0
+        self._best_ask, self._best_ask_size = np.inf, 0
+        self.bbo_change_count = 0
         self.curr_book_timestamp = 0.0
         self.midprice = None
         self.midprice_change_timestamp = 0.0
         self.reset_cum_OFI()
         self.trade_log.clear()
+        self.message_count = 0
+        self.anomalies.clear()
+        if self.journal is not None:
+            self.journal.clear()
+
+    def copy(self) -> "Orderbook":
+        """
+        Create an independent copy of the current order book state.
+
+        Resting orders (in queue order), timestamps, midprice tracking and the
+        cumulative OFI are copied. The trade log of the copy starts empty.
+
+        Returns
+        -------
+        Orderbook
+            New order book that can be advanced without affecting this one.
+        """
+        book = Orderbook(self.nlevels, self.ticker, self.tick_size, self.price_scaling, self._use_auto_matching_engine)
+        for side_name in ("bids", "asks"):
+            side = getattr(self, side_name)
+            levels = {
+                price: {oid: LimitOrder(o.timestamp, oid, o.size, o.price, o.direction) for oid, o in orders.items()}
+                for price, orders in side.items()
+            }
+            setattr(book, side_name, SortedDict(side.key, levels))
+        book.curr_book_timestamp = self.curr_book_timestamp
+        book.midprice = self.midprice
+        book.midprice_change_timestamp = self.midprice_change_timestamp
+        book.cum_OFI = deepcopy(self.cum_OFI)
+        book._refresh_bbo()
+        book.bbo_change_count = self.bbo_change_count
+        book.message_count = self.message_count
+        return book
+
+    def export_state(self) -> dict:
+        """
+        Export the resting orders and timestamps of the book as flat arrays.
+
+        Returns
+        -------
+        dict
+            `direction` (int8, 1 for bid, -1 for ask), `price`, `order_id`, `size`
+            (int64) and `timestamp` (float64) of every resting order, bids first,
+            in price priority and queue order; plus scalars `curr_book_timestamp`,
+            `midprice` (NaN if undefined) and `midprice_change_timestamp`.
+            The cumulative OFI and trade log are not part of the state.
+        """
+        orders = [order for side in (self.bids, self.asks) for level in side.values() for order in level.values()]
+        return {
+            "direction": np.array([1 if o.direction == 'bid' else -1 for o in orders], dtype=np.int8),
+            "price": np.array([o.price for o in orders], dtype=np.int64),
+            "order_id": np.array([o.order_id for o in orders], dtype=np.int64),
+            "size": np.array([o.size for o in orders], dtype=np.int64),
+            "timestamp": np.array([o.timestamp for o in orders], dtype=np.float64),
+            "curr_book_timestamp": float(self.curr_book_timestamp),
+            "midprice": np.nan if self.midprice is None else float(self.midprice),
+            "midprice_change_timestamp": float(self.midprice_change_timestamp),
+        }
+
+    def restore_state(self, state: dict) -> None:
+        """
+        Replace the book contents with a state from :meth:`export_state`.
+
+        The cumulative OFI, trade log and BBO change counter are reset.
+
+        Parameters
+        ----------
+        state : dict
+            State as returned by :meth:`export_state`.
+        """
+        self.clear_orderbook()
+        for d, price, order_id, size, timestamp in zip(state["direction"].tolist(), state["price"].tolist(),
+                                                      state["order_id"].tolist(), state["size"].tolist(),
+                                                      state["timestamp"].tolist()):
+            direction = 'bid' if d == 1 else 'ask'
+            side = self.bids if d == 1 else self.asks
+            if price not in side:
+                side[price] = {}
+            side[price][order_id] = LimitOrder(timestamp, order_id, size, price, direction)
+        self.curr_book_timestamp = float(state["curr_book_timestamp"])
+        midprice = float(state["midprice"])
+        self.midprice = None if np.isnan(midprice) else midprice
+        self.midprice_change_timestamp = float(state["midprice_change_timestamp"])
+        self._refresh_bbo()
+        self.bbo_change_count = 0
 
     def clear_trade_log(self) -> None:
         """
@@ -93,6 +226,163 @@ class Orderbook:
         """
         self.trade_log.clear()
 
+    def enable_instrumentation(self, stats: ReplayStats = None, sample_every: int = 64,
+                               book_size_every: int = 1000) -> ReplayStats:
+        """
+        Start collecting per-event-type counts, sampled latencies, book sizes and
+        anomaly counts in `stats`.
+
+        An instrumented `process_order` is installed on this instance only,
+        wrapping the one currently in place (e.g. a journaling one);
+        :meth:`disable_instrumentation` restores that one again, so an
+        uninstrumented book runs the plain class method with no extra checks.
+
+        Parameters
+        ----------
+        stats : ReplayStats, optional
+            Statistics object to add to. A new one is created by default.
+        sample_every : int, default=64
+            Time one in every `sample_every` events.
+        book_size_every : int, default=1000
+            Record the book size once every `book_size_every` events.
+
+        Returns
+        -------
+        ReplayStats
+            The statistics object being filled.
+        """
+        self.disable_instrumentation()
+        if stats is None:
+            stats = ReplayStats(sample_every=sample_every, book_size_every=book_size_every)
+        previous = self.__dict__.get("process_order")
+        wrapper = instrument_process_order(self, stats)
+        self.process_order = wrapper
+        self._instrumentation = (wrapper, previous)
+        self.stats = stats
+        return stats
+
+    def disable_instrumentation(self) -> ReplayStats:
+        """
+        Stop collecting statistics and restore the `process_order` that was in
+        place before :meth:`enable_instrumentation`.
+
+        Returns
+        -------
+        ReplayStats or None
+            The statistics collected so far.
+
+        Raises
+        ------
+        ValueError
+            If another `process_order` wrapper was installed after the
+            instrumented one and is still in place.
+        """
+        if self._instrumentation is not None:
+            self._unwrap_process_order(*self._instrumentation, "instrumentation")
+            self._instrumentation = None
+        stats, self.stats = self.stats, None
+        return stats
+
+    def _unwrap_process_order(self, wrapper, previous, name: str) -> None:
+        """
+        Replace the instance `process_order` `wrapper` by the one it wrapped.
+        """
+        if self.__dict__.get("process_order") is not wrapper:
+            raise ValueError(f"Cannot disable {name}: another process_order wrapper was installed "
+                             "after it; remove that one first.")
+        if previous is None:
+            del self.process_order
+        else:
+            self.process_order = previous
+
+    def enable_journal(self, capacity: int = 100_000) -> UndoJournal:
+        """
+        Record the inverse of every processed message so it can be undone.
+
+        A journaling `process_order` is installed on this instance, wrapping the
+        one currently in place; wrappers installed later (instrumentation, views)
+        wrap it in turn and must be removed before it. Clearing the book empties the journal. Each entry takes roughly 0.5 KB,
+        so the default capacity holds about 50 MB.
+
+        Parameters
+        ----------
+        capacity : int, default=100_000
+            Number of most recent messages that can be undone.
+
+        Returns
+        -------
+        UndoJournal
+            The journal being filled.
+        """
+        self.disable_journal()
+        journal = UndoJournal(capacity)
+        journal._previous = self.__dict__.get("process_order")
+        journal._wrapper = journal_process_order(self, journal)
+        self.process_order = journal._wrapper
+        self.journal = journal
+        return journal
+
+    def disable_journal(self) -> None:
+        """
+        Stop journaling, restore the `process_order` that was in place before
+        :meth:`enable_journal` and drop the journal.
+
+        Raises
+        ------
+        ValueError
+            If another `process_order` wrapper was installed after the journaling
+            one and is still in place.
+        """
+        if self.journal is None:
+            return
+        self._unwrap_process_order(self.journal._wrapper, self.journal._previous, "journaling")
+        self.journal = None
+
+    def undo(self, n: int = 1) -> int:
+        """
+        Revert the last `n` processed messages using the journal.
+
+        Resting orders regain their size and queue position, and the OFI
+        counters, trade log, anomaly log, cached BBO, midprice tracking and
+        timestamps return to their earlier values. `on_bbo_change` is not called.
+
+        Parameters
+        ----------
+        n : int, default=1
+            Number of messages to revert.
+
+        Returns
+        -------
+        int
+            Number of messages reverted; fewer than `n` if the journal holds fewer.
+
+        Raises
+        ------
+        ValueError
+            If journaling is not enabled.
+        """
+        if self.journal is None:
+            raise ValueError("Journaling is not enabled; call enable_journal first.")
+        return undo(self, self.journal, n)
+
+    def memory_usage(self, exact: bool = False) -> MemoryReport:
+        """
+        Report the bytes used by the price levels, resting orders, trade log,
+        anomaly log and OFI counters of the book.
+
+        Parameters
+        ----------
+        exact : bool, default=False
+            Traverse every object. The default estimate extrapolates from one
+            sample object per kind and only iterates the price levels.
+
+        Returns
+        -------
+        MemoryReport
+            See :func:`memory.orderbook_memory`.
+        """
+        return orderbook_memory(self, exact)
+
     # ----------------------------------
     # Order Processing Handler & Helpers
     # ----------------------------------
@@ -117,6 +407,7 @@ class Orderbook:
             raise ValueError(f"Order timestamp {order.timestamp} is earlier than current book timestamp {self.curr_book_timestamp}.")
 
         self.curr_book_timestamp = order.timestamp
+        self.message_count += 1
         prev_midprice = self.mid_price()
         if order.event_type == 'submit':
             self._add_order(order)
@@ -193,9 +484,7 @@ class Orderbook:
         order_id : int
             ID of the aggressive order/execution.
         """
-        Trade = namedtuple("Trade", ["timestamp", "trade_type", "direction", "size", "price", "order_id"])
-        trade = Trade(timestamp, trade_type, direction, size, price, order_id)
-        self.trade_log.append(trade)
+        self.trade_log.append(Trade(timestamp, trade_type, direction, size, price, order_id))
 
     def _add_order(self, order: Order) -> None:
         """
@@ -228,6 +517,7 @@ class Orderbook:
             if order.price not in side:
                 side[order.price] = {}
             side[order.price][order.order_id] = resting_order
+            self._update_bbo(order.direction, order.price)
 
     def _execute_against_opposite_book(self, order: Order) -> int:
         """
@@ -268,6 +558,7 @@ class Orderbook:
                 del orders_at_price[order_id]
             if not orders_at_price:
                 del side[best_price]
+            self._update_bbo('ask' if order.direction == 'bid' else 'bid', best_price)
 
             self._record_trade(order.timestamp, "aggro_lim", 'ask' if order.direction == 'bid' else 'bid', trade_size, best_price, order.order_id)
             if order.direction == 'bid':
@@ -289,24 +580,20 @@ class Orderbook:
             Order object containing event details. See :class:`Order`
             in `orders.py` for full definition.
 
-        Warns
+        Notes
         -----
-        UserWarning
-            If the price or order ID is not found in the book.
+        Messages for a price or order ID missing from the book are recorded in
+        `anomalies` and otherwise ignored.
         """
         self._update_MOFI(order)
         self._record_trade(order.timestamp, "vis_exec", order.direction, order.size, order.price, order.order_id)
         side = getattr(self, f'{order.direction}s')
         if order.price not in side:
-            logger.warning("Warning _execute_vis_order: Price %s not found on %s side.\n"
-                           "Order info: %s", order.price, order.direction, order)
-            self._warning_count += 1
+            self._record_anomaly(order, "price_not_found")
             return
 
         if order.order_id not in side[order.price]:
-            logger.warning("Warning _execute_vis_order: Order ID %s not found at price %s on %s side.\n"
-                           "Order info: %s", order.order_id, order.price, order.direction, order)
-            self._warning_count += 1
+            self._record_anomaly(order, "order_id_not_found")
             return
 
         side[order.price][order.order_id].size -= order.size
@@ -316,6 +603,7 @@ class Orderbook:
 
         if not side[order.price]:
             del side[order.price]
+        self._update_bbo(order.direction, order.price)
 
     def _cancel_order(self, order: Order) -> None:
         """
@@ -329,23 +617,19 @@ class Orderbook:
             Order object containing event details. See :class:`Order`
             in `orders.py` for full definition.
 
-        Warns
+        Notes
         -----
-        UserWarning
-            If the price or order ID is not found in the book.
+        Messages for a price or order ID missing from the book are recorded in
+        `anomalies` and otherwise ignored.
         """
         self._update_DOFI(order)
         side = getattr(self, f'{order.direction}s')
         if order.price not in side:
-            logger.warning("Warning _cancel_order: Price %s not found on %s side.\n"
-                           "Order info: %s", order.price, order.direction, order)
-            self._warning_count += 1
+            self._record_anomaly(order, "price_not_found")
             return
 
         if order.order_id not in side[order.price]:
-            logger.warning("Warning _cancel_order: Order ID %s not found at price %s on %s side.\n"
-                           "Order info: %s", order.order_id, order.price, order.direction, order)
-            self._warning_count += 1
+            self._record_anomaly(order, "order_id_not_found")
             return
 
         side[order.price][order.order_id].size -= order.size
@@ -355,6 +639,7 @@ class Orderbook:
 
         if not side[order.price]:
             del side[order.price]
+        self._update_bbo(order.direction, order.price)
 
     def _delete_order(self, order: Order):
         """
@@ -366,10 +651,10 @@ class Orderbook:
             Order object containing event details. See :class:`Order`
             in `orders.py` for full definition.
 
-        Warns
+        Notes
         -----
-        UserWarning
-            If the price or order ID is not found in the book.
+        Messages for a price or order ID missing from the book are recorded in
+        `anomalies` and otherwise ignored.
         """
         self._update_DOFI(order)
         side = getattr(self, f'{order.direction}s')
@@ -378,17 +663,23 @@ class Orderbook:
                 del side[order.price][order.order_id]
                 if not side[order.price]:
                     del side[order.price]
+                self._update_bbo(order.direction, order.price)
             else:
-                logger.warning("Warning _delete_order: Price %s not found on %s side.\n"
-                             "Order info: %s", order.price, order.direction, order)
-                self._warning_count += 1
+                self._record_anomaly(order, "order_id_not_found")
                 return
         else:
-            logger.warning("Warning _delete_order: Order ID %s not found at price %s on %s side.\n"
-                         "Order info: %s", order.order_id, order.price, order.direction, order)
-            self._warning_count += 1
+            self._record_anomaly(order, "price_not_found")
             return
 
+    def _record_anomaly(self, order: Order, kind: str) -> None:
+        """
+        Record a message that refers to a price or order missing from the book.
+        """
+        self._warning_count += 1
+        self.anomalies.record(self.message_count - 1, kind, order)
+        if self.stats is not None:
+            self.stats.record_anomaly(order.event_type, kind)
+
     def _handle_hidden_exec(self, order: Order):
         """
         Record a hidden execution (not visible in the book).
@@ -410,6 +701,59 @@ class Orderbook:
 
         self._record_trade(order.timestamp, "hid_exec", inferred_direction, order.size, order.price, order.order_id)
 
+    # --------------------------
+    # BBO tracking
+    # --------------------------
+    def _update_bbo(self, direction: Literal["bid", "ask"], price: int) -> None:
+        """
+        Update the cached best bid/ask after the level at `price` changed.
+        Levels behind the touch cannot change the BBO and are ignored.
+
+        Parameters
+        ----------
+        direction : {"bid", "ask"}
+            Side of the changed level.
+        price : int
+            Price of the changed level.
+        """
+        if direction == 'bid':
+            if price >= self._best_bid:
+                self._refresh_best_bid()
+        elif price <= self._best_ask:
+            self._refresh_best_ask()
+
+    def _refresh_best_bid(self) -> None:
+        if self.bids:
+            price = next(iter(self.bids))
+            size = sum(order.size for order in self.bids[price].values())
+        else:
+            price, size = 0, 0
+        if price != self._best_bid or size != self._best_bid_size:
+            self._best_bid, self._best_bid_size = price, size
+            self._bbo_changed()
+
+    def _refresh_best_ask(self) -> None:
+        if self.asks:
+            price = next(iter(self.asks))
+            size = sum(order.size for order in self.asks[price].values())
+        else:
+            price, size = np.inf, 0
+        if price != self._best_ask or size != self._best_ask_size:
+            self._best_ask, self._best_ask_size = price, size
+            self._bbo_changed()
+
+    def _refresh_bbo(self) -> None:
+        """
+        Recompute the cached best bid/ask from scratch.
+        """
+        self._refresh_best_bid()
+        self._refresh_best_ask()
+
+    def _bbo_changed(self) -> None:
+        self.bbo_change_count += 1
+        if self.on_bbo_change is not None:
+            self.on_bbo_change(self)
+
     # --------------------------
     # OFI helpers
     # --------------------------
@@ -497,6 +841,41 @@ class Orderbook:
         df = pd.DataFrame(order_dict).T
         return df.rename(columns={0: "direction", 1: "price", 2: "size"})
 
+    def convert_orderbook_to_L2_array(self, num_levels: int = None, out: np.ndarray = None) -> np.ndarray:
+        """
+        Convert the current order book state into an L2 array laid out like a
+        LOBSTER orderbook.csv row.
+
+        Parameters
+        ----------
+        num_levels : int, optional
+            Number of levels per side. Defaults to `nlevels`.
+        out : np.ndarray, optional
+            Preallocated int64 array of shape (num_levels, 4) to fill in place.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (num_levels, 4). Row i holds level i+1 as
+            (ask price, ask size, bid price, bid size). Missing levels hold the
+            LOBSTER dummy prices (9999999999 / -9999999999) with size 0.
+        """
+        if num_levels is None:
+            num_levels = self.nlevels
+        if out is None:
+            out = np.empty((num_levels, 4), dtype=np.int64)
+        out[:, 0] = LOBSTER_DUMMY_ASK_PRICE
+        out[:, 1] = 0
+        out[:, 2] = LOBSTER_DUMMY_BID_PRICE
+        out[:, 3] = 0
+        for col, side in ((0, self.asks), (2, self.bids)):
+            for level, (price, orders) in enumerate(side.items()):
+                if level >= num_levels:
+                    break
+                out[level, col] = price
+                out[level, col + 1] = sum(order.size for order in orders.values())
+        return out
+
     def convert_orderbook_to_L3_dataframe(self) -> pd.DataFrame:
         """
         Convert the current order book state into a DataFrame containing L3 data.
@@ -532,6 +911,7 @@ class Orderbook:
         UserWarning
             If the order book is empty or plotting fails.
         """
+        px = import_optional("plotly.express")
         try:
             df = self.convert_orderbook_to_L2_dataframe()
             df.price = df.price * self.price_scaling
@@ -562,6 +942,7 @@ class Orderbook:
         UserWarning
             If the order book is empty or plotting fails.
         """
+        px = import_optional("plotly.express")
         try:
             df = self.convert_orderbook_to_L3_dataframe()
             df.price = df.price * self.price_scaling
@@ -581,7 +962,7 @@ class Orderbook:
                           "Check if the orderbook is populated before calling.")
             logger.exception("Failed to display L3 orderbook")
 
-    def _get_L3_plot_traces(self) -> tuple[BaseTraceType]:
+    def _get_L3_plot_traces(self) -> "tuple[BaseTraceType]":
         """
         Extract Plotly traces for L3 visualization.
 
@@ -590,6 +971,7 @@ class Orderbook:
         tuple of BaseTraceType
             Traces representing L3 order book bars.
         """
+        px = import_optional("plotly.express")
         try:
             df = self.convert_orderbook_to_L3_dataframe()
             df.price = df.price * self.price_scaling
@@ -605,7 +987,7 @@ class Orderbook:
         except Exception:
             logger.exception("Failed to extract L3 trace")
 
-    def _get_L2_plot_traces(self) -> tuple[BaseTraceType]:
+    def _get_L2_plot_traces(self) -> "tuple[BaseTraceType]":
         """
         Extract Plotly traces for L3 visualization.
 
@@ -614,6 +996,7 @@ class Orderbook:
         tuple of BaseTraceType
             Traces representing L3 order book bars.
         """
+        px = import_optional("plotly.express")
         try:
             df = self.convert_orderbook_to_L2_dataframe()
             df.price = df.price * self.price_scaling
@@ -641,7 +1024,7 @@ class Orderbook:
         int
             Lowest ask price, or np.inf if no asks exist.
         """
-        return next(iter(self.asks), np.inf)
+        return self._best_ask
 
     def highest_bid_price(self) -> int:
         """
@@ -652,7 +1035,7 @@ class Orderbook:
         int
             Highest bid price, or 0 if no bids exist.
         """
-        return next(iter(self.bids), 0)
+        return self._best_bid
 
     def lowest_ask_volume(self) -> int:
         """
@@ -661,9 +1044,9 @@ class Orderbook:
         Returns
         -------
         int
-            Aggregate size of orders at the lowest ask.
+            Aggregate size of orders at the lowest ask, or 0 if no asks exist.
         """
-        return sum(order.size for order in self.asks[self.lowest_ask_price()].values())
+        return self._best_ask_size
 
     def highest_bid_volume(self) -> int:
         """
@@ -672,9 +1055,9 @@ class Orderbook:
         Returns
         -------
         int
-            Aggregate size of orders at the highest bid.
+            Aggregate size of orders at the highest bid, or 0 if no bids exist.
         """
-        return sum(order.size for order in self.bids[self.highest_bid_price()].values())
+        return self._best_bid_size
 
     def bid_ask_spread(self) -> int:
         """
@@ -698,7 +1081,7 @@ class Orderbook:
         """
         if not self.bids or not self.asks:
             return None
-        return (self.highest_bid_price() + self.lowest_ask_price()) / 2
+        return (self._best_bid + self._best_ask) / 2
 
     def worst_ask_price(self) -> int:
         """
@@ -960,6 +1343,93 @@ class Orderbook:
         """
         return order.timestamp - self.midprice_change_timestamp
 
+    def order_features(self, order_ids=None) -> pd.DataFrame:
+        """
+        Compute the order-level features of every resting order in one sweep.
+
+        Gives the same values as calling :meth:`volume_of_higher_priority_orders`,
+        :meth:`symmetric_opposite_book_volume`,
+        :meth:`time_elapsed_since_first_available_order_with_same_price`,
+        :meth:`time_elapsed_since_most_recent_order_with_same_price` and
+        :meth:`time_elapsed_since_mid_price_change` with each resting order, in
+        O(N + L log L) for N orders on L levels instead of O(N * L): level
+        volumes are summed once and the per-order values come from cumulative
+        sums and binary searches over them.
+
+        Parameters
+        ----------
+        order_ids : sequence of int, optional
+            Orders to return. Defaults to all resting orders.
+
+        Returns
+        -------
+        DataFrame
+            Indexed by `order_id`, bids first in price priority and queue order.
+            Columns `direction` (int8, 1 for bid, -1 for ask), `price`, `size`
+            (int64), `timestamp` (float64) and one column per feature, named after
+            its method. Without a midprice the symmetric volume is 0.
+
+        Raises
+        ------
+        KeyError
+            If one of `order_ids` is not resting in the book.
+        """
+        bid_arrays, ask_arrays = self._side_order_arrays(self.bids), self._side_order_arrays(self.asks)
+        mid = self.mid_price()
+        columns = {name: [] for name in ("order_id", "direction", "price", "size", "timestamp",
+                                         "volume_of_higher_priority_orders", "symmetric_opposite_book_volume",
+                                         "time_elapsed_since_first_available_order_with_same_price",
+                                         "time_elapsed_since_most_recent_order_with_same_price",
+                                         "time_elapsed_since_mid_price_change")}
+        for sign, (prices, counts, level_volume, order_id, size, timestamp), opposite in (
+                (1, bid_arrays, ask_arrays), (-1, ask_arrays, bid_arrays)):
+            ends = np.cumsum(counts)
+            starts = ends - counts
+            if mid is None:
+                symmetric = np.zeros(len(prices), dtype=np.int64)
+            else:
+                # Opposite levels strictly between the midprice and the mirrored price;
+                # both sides are in priority order, so compare prices times `sign`
+                opposite_prices, opposite_volume = opposite[0], opposite[2]
+                mirrored = 2 * mid - prices
+                n = np.searchsorted(sign * opposite_prices, sign * mirrored, side='left')
+                symmetric = np.r_[0, np.cumsum(opposite_volume)][n]
+                symmetric[sign * prices >= sign * mid] = 0
+            for name, values in (
+                    ("order_id", order_id),
+                    ("direction", np.full(len(order_id), sign, dtype=np.int8)),
+                    ("price", np.repeat(prices, counts)),
+                    ("size", size),
+                    ("timestamp", timestamp),
+                    ("volume_of_higher_priority_orders", np.repeat(np.cumsum(level_volume), counts)),
+                    ("symmetric_opposite_book_volume", np.repeat(symmetric, counts)),
+                    ("time_elapsed_since_first_available_order_with_same_price",
+                     timestamp - np.repeat(timestamp[starts], counts)),
+                    ("time_elapsed_since_most_recent_order_with_same_price",
+                     timestamp - np.repeat(timestamp[ends - 1], counts)),
+                    ("time_elapsed_since_mid_price_change", timestamp - self.midprice_change_timestamp)):
+                columns[name].append(values)
+        columns = {name: np.concatenate(parts) for name, parts in columns.items()}
+        order_id = columns.pop("order_id")
+        features = pd.DataFrame(columns, index=pd.Index(order_id, name="order_id"))
+        return features if order_ids is None else features.loc[list(order_ids)]
+
+    @staticmethod
+    def _side_order_arrays(side: SortedDict) -> tuple:
+        """
+        Flatten one side into level prices, order counts and volumes, and
+        per-order IDs, sizes and timestamps, all in priority order.
+        """
+        levels = list(side.values())
+        orders = [order for level in levels for order in level.values()]
+        prices = np.fromiter(side.keys(), dtype=np.int64, count=len(levels))
+        counts = np.fromiter(map(len, levels), dtype=np.int64, count=len(levels))
+        order_id = np.fromiter((o.order_id for o in orders), dtype=np.int64, count=len(orders))
+        size = np.fromiter((o.size for o in orders), dtype=np.int64, count=len(orders))
+        timestamp = np.fromiter((o.timestamp for o in orders), dtype=np.float64, count=len(orders))
+        level_volume = np.add.reduceat(size, counts.cumsum() - counts) if len(orders) else np.zeros(0, dtype=np.int64)
+        return prices, counts, level_volume, order_id, size, timestamp
+
     def meta_orders(self, time_delta=0) -> List[List[namedtuple]]:
         """
         Group trades into meta-orders based on time and type.
@@ -0,0 +1,204 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+_POW10_INT = 10 ** np.arange(19, dtype=np.int64)
+_POW10_FLOAT = 10.0 ** np.arange(19)
+
+# Bytes allowed in a plain numeric CSV: digits, '-', '.', ',', '\n', '\r'
+_ALLOWED = np.zeros(256, dtype=bool)
+_ALLOWED[[ord(c) for c in "0123456789-.,\n\r"]] = True
+_DIGIT = np.zeros(256, dtype=bool)
+_DIGIT[[ord(c) for c in "0123456789"]] = True
+
+
+class UnsupportedFormat(ValueError):
+    """
+    Raised when a file does not fit the plain numeric schema of the fast parser
+    (blank fields, exponents, ragged rows, ...). Callers fall back to pandas.
+    """
+
+
+def _parse_block(buf: np.ndarray, float_columns: tuple) -> np.ndarray:
+    """
+    Parse a block of complete CSV lines of plain decimal numbers.
+
+    Every field value is assembled from its digits with positional powers of
+    ten in a handful of vectorized passes; float fields are divided by 10**(number
+    of fractional digits), which rounds exactly like parsing the decimal string
+    (both operands are exact, and IEEE division is correctly rounded).
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (rows, columns) holding int64 values for integer columns
+        and, for the columns in `float_columns`, the float64 bit patterns
+        (view the column as float64).
+    """
+    if buf[-1] != 10:
+        buf = np.concatenate([buf, np.array([10], dtype=np.uint8)])
+    if (buf == 13).any():
+        buf = buf[buf != 13]
+    if not _ALLOWED[buf].all():
+        raise UnsupportedFormat("Unexpected characters in numeric CSV.")
+
+    is_newline = buf == 10
+    is_delim = is_newline | (buf == 44)
+    ends = np.flatnonzero(is_delim)
+    line_ends = np.flatnonzero(is_newline)
+    n_rows = len(line_ends)
+    if n_rows == 0 or len(ends) % n_rows:
+        raise UnsupportedFormat("Rows have different numbers of fields.")
+    n_cols = len(ends) // n_rows
+    if not np.array_equal(ends[n_cols - 1::n_cols], line_ends):
+        raise UnsupportedFormat("Rows have different numbers of fields.")
+
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    minus = np.flatnonzero(buf == 45)
+    if len(minus) and not np.array_equal(starts[np.minimum(np.searchsorted(starts, minus), len(starts) - 1)], minus):
+        raise UnsupportedFormat("'-' is only supported as the sign of a field.")
+
+    # Work on the digit bytes only: the digits of a field are contiguous there
+    digit_pos = np.flatnonzero(_DIGIT[buf])
+    digits_end = np.searchsorted(digit_pos, ends)
+    digits_start = np.empty_like(digits_end)
+    digits_start[0] = 0
+    digits_start[1:] = digits_end[:-1]
+    n_digits = digits_end - digits_start
+    if not n_digits.all():
+        raise UnsupportedFormat("Blank fields are not supported.")
+    if n_digits.max() > 18:
+        raise UnsupportedFormat("Numbers with more than 18 digits are not supported.")
+
+    # Power of ten of each digit = number of digits after it in its field
+    power = np.repeat(digits_end - 1, n_digits) - np.arange(len(digit_pos))
+    contrib = (buf[digit_pos] - 48).astype(np.int64) * _POW10_INT[power]
+    mantissa = np.add.reduceat(contrib, digits_start)
+    values = np.where(buf[starts] == 45, -mantissa, mantissa)
+
+    dots = np.flatnonzero(buf == 46)
+    frac_digits = np.zeros(len(ends), dtype=np.int64)
+    dot_field = np.searchsorted(ends, dots)
+    if len(dot_field) > 1 and (dot_field[1:] == dot_field[:-1]).any():
+        raise UnsupportedFormat("Fields with more than one '.' are not supported.")
+    frac_digits[dot_field] = digits_end[dot_field] - np.searchsorted(digit_pos, dots)
+
+    values = values.reshape(n_rows, n_cols)
+    frac_digits = frac_digits.reshape(n_rows, n_cols)
+    int_columns = [c for c in range(n_cols) if c not in float_columns]
+    if frac_digits[:, int_columns].any():
+        raise UnsupportedFormat("Decimal values in integer columns.")
+    for c in float_columns:
+        if c < n_cols:
+            values[:, c] = (values[:, c] / _POW10_FLOAT[frac_digits[:, c]]).view(np.int64)
+    return values
+
+
+def _line_ranges(data: np.ndarray, n_parts: int, window: int = 1 << 16) -> list:
+    """
+    Split `data` into about `n_parts` byte ranges that end at line boundaries.
+    """
+    size = len(data)
+    bounds = [0]
+    for i in range(1, n_parts):
+        pos = max(i * size // n_parts, bounds[-1])
+        while pos < size:
+            newlines = np.flatnonzero(data[pos:pos + window] == 10)
+            if len(newlines):
+                bounds.append(pos + int(newlines[0]) + 1)
+                break
+            pos += window
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def parse_numeric_csv(path: str, float_columns: tuple = (), max_workers: int = None,
+                      block_size: int = 1 << 22) -> np.ndarray:
+    """
+    Parse a header-less CSV file of plain decimal numbers in parallel.
+
+    The file is read into one byte buffer and split into ranges at line
+    boundaries, which worker threads parse independently into int64 arrays
+    (NumPy releases the GIL in the vectorized passes).
+
+    Parameters
+    ----------
+    path : str
+        Uncompressed CSV file path.
+    float_columns : tuple of int, default=()
+        Indices of columns holding decimals, returned as float64 bit patterns.
+    max_workers : int, optional
+        Number of parser threads. Defaults to the number of CPUs.
+    block_size : int, default=4 MiB
+        Approximate number of bytes per parsed range.
+
+    Returns
+    -------
+    np.ndarray
+        int64 array of shape (rows, columns). View float columns with
+        ``arr[:, c].view(np.float64)``.
+
+    Raises
+    ------
+    UnsupportedFormat
+        If the file does not fit the schema (blank fields, exponents, text, signs
+        inside a field, ragged rows).
+
+    Notes
+    -----
+    Known limitation: each vectorized pass runs at memory speed, but the dozen or
+    so passes and their temporaries hold one thread to roughly 20 MB/s, below the
+    C parser of ``pandas.read_csv`` on a single core. Throughput scales with the
+    worker threads; the hundreds of MB/s of SIMD parsers would need a compiled
+    extension, which this package does not ship.
+    """
+    raw = np.fromfile(path, dtype=np.uint8)
+    if not len(raw):
+        raise UnsupportedFormat("Empty file.")
+    ranges = _line_ranges(raw, max(1, -(-len(raw) // block_size)))
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        blocks = list(pool.map(lambda r: _parse_block(raw[r[0]:r[1]], float_columns), ranges))
+    if len({b.shape[1] for b in blocks}) > 1:
+        raise UnsupportedFormat("Rows have different numbers of fields.")
+    return np.concatenate(blocks)
+
+
+def parse_message_arrays(path: str, max_workers: int = None) -> dict:
+    """
+    Parse a LOBSTER message.csv file straight into typed arrays.
+
+    Parameters
+    ----------
+    path : str
+        Uncompressed LOBSTER message.csv file path. Columns after the sixth are ignored.
+    max_workers : int, optional
+        Number of parser threads.
+
+    Returns
+    -------
+    dict
+        `time` (float64), `type` (int8 LOBSTER event code), `order_id`, `size`,
+        `price` (int64) and `direction` (int8, 1 for bid, -1 for ask), the layout
+        of :meth:`LobsterSim.message_arrays`. Unknown event type and direction
+        codes are stored as 0.
+
+    Raises
+    ------
+    UnsupportedFormat
+        If the file does not fit the plain numeric schema.
+    """
+    values = parse_numeric_csv(path, float_columns=(0,), max_workers=max_workers)
+    if values.shape[1] < 6:
+        raise UnsupportedFormat("Message files need at least 6 columns.")
+    event_type, direction = values[:, 1], values[:, 5]
+    return {
+        "time": values[:, 0].view(np.float64).copy(),
+        "type": np.where((event_type >= 1) & (event_type <= 7), event_type, 0).astype(np.int8),
+        "order_id": values[:, 2].copy(),
+        "size": values[:, 3].copy(),
+        "price": values[:, 4].copy(),
+        "direction": np.where(np.abs(direction) == 1, direction, 0).astype(np.int8),
+    }
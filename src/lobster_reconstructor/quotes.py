@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class L1Stream:
+    """
+    Event-resolution best bid/ask (L1) quote stream, similar to a TAQ quote file.
+
+    Prices are unscaled integers stored as float64 so that an empty side can be
+    represented by NaN; sizes are int64 (0 when the side is empty).
+
+    Attributes
+    ----------
+    time : np.ndarray
+        Timestamp (seconds after midnight) of the message that produced each row.
+    msg_index : np.ndarray
+        Index of that message in the message data.
+    bid_price, ask_price : np.ndarray
+        Best bid and ask prices after the message.
+    bid_size, ask_size : np.ndarray
+        Aggregate size at the best bid and ask after the message.
+    price_scaling : float
+        Scaling factor of the orderbook the stream was recorded from.
+    """
+    time: np.ndarray
+    msg_index: np.ndarray
+    bid_price: np.ndarray
+    bid_size: np.ndarray
+    ask_price: np.ndarray
+    ask_size: np.ndarray
+    price_scaling: float = 0.0001
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @property
+    def mid(self) -> np.ndarray:
+        return (self.bid_price + self.ask_price) / 2
+
+    @property
+    def spread(self) -> np.ndarray:
+        return self.ask_price - self.bid_price
+
+    def changes_only(self) -> "L1Stream":
+        """
+        Keep only rows where the best bid/ask price or size changed.
+
+        Returns
+        -------
+        L1Stream
+            Stream with the first row and every row that differs from its predecessor.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        for col in (self.bid_price, self.bid_size, self.ask_price, self.ask_size):
+            prev, curr = col[:-1], col[1:]
+            same = prev == curr
+            if col.dtype.kind == 'f':
+                same |= np.isnan(prev) & np.isnan(curr)
+            keep[1:] &= same
+        keep[1:] = ~keep[1:]
+        return self._take(keep)
+
+    def asof(self, times: np.ndarray) -> "L1Stream":
+        """
+        Sample the quote in effect at arbitrary times without replaying the book.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            Sorted query times in seconds after midnight.
+
+        Returns
+        -------
+        L1Stream
+            One row per query time holding the state after every message with
+            timestamp <= that time. `time` holds the query times; rows before the
+            first recorded message have NaN prices, zero sizes and `msg_index` -1.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        idx = np.searchsorted(self.time, times, side='right') - 1
+        valid = idx >= 0
+        safe = np.where(valid, idx, 0)
+
+        def pick(col, fill):
+            out = col[safe] if len(col) else np.zeros(len(times), dtype=col.dtype)
+            return np.where(valid, out, fill).astype(col.dtype)
+
+        return L1Stream(
+            time=times,
+            msg_index=pick(self.msg_index, -1),
+            bid_price=pick(self.bid_price, np.nan),
+            bid_size=pick(self.bid_size, 0),
+            ask_price=pick(self.ask_price, np.nan),
+            ask_size=pick(self.ask_size, 0),
+            price_scaling=self.price_scaling,
+        )
+
+    def to_dataframe(self, scale_prices: bool = False) -> pd.DataFrame:
+        """
+        Convert the stream into a DataFrame.
+
+        Parameters
+        ----------
+        scale_prices : bool, default=False
+            Multiply prices, mid and spread by `price_scaling`.
+
+        Returns
+        -------
+        DataFrame
+            Columns `time`, `msg_index`, `bid_price`, `bid_size`, `ask_price`,
+            `ask_size`, `mid` and `spread`.
+        """
+        scale = self.price_scaling if scale_prices else 1
+        return pd.DataFrame({
+            "time": self.time,
+            "msg_index": self.msg_index,
+            "bid_price": self.bid_price * scale,
+            "bid_size": self.bid_size,
+            "ask_price": self.ask_price * scale,
+            "ask_size": self.ask_size,
+            "mid": self.mid * scale,
+            "spread": self.spread * scale,
+        })
+
+    def _take(self, mask: np.ndarray) -> "L1Stream":
+        return L1Stream(self.time[mask], self.msg_index[mask], self.bid_price[mask], self.bid_size[mask],
+                        self.ask_price[mask], self.ask_size[mask], self.price_scaling)
@@ -0,0 +1,340 @@
+import sys
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+import numpy as np
+
+from .orderbook import Orderbook
+
+_MAGIC = 0x4C4F4253544552   # "LOBSTER"
+_LAYOUT_VERSION = 1
+_HEADER_WORDS = 8           # magic, version, num_levels, slots, slot_words, published, 2 spare
+_SLOT_HEADER_WORDS = 4      # sequence, messages, timestamp bits, spare
+_PUBLISHED = 5
+
+# Event types that leave the visible book unchanged
+_INVISIBLE_EVENTS = frozenset(('hid_exec', 'cross', 'halt'))
+
+
+def _slot_words(num_levels: int) -> int:
+    # Round slots up to whole 64-byte cache lines so the writer and readers of
+    # neighbouring slots do not share lines
+    words = _SLOT_HEADER_WORDS + 4 * num_levels
+    return -(-words // 8) * 8
+
+
+@dataclass
+class SharedBookSnapshot:
+    """
+    Consistent copy of one publication read from shared memory.
+
+    Attributes
+    ----------
+    sequence : int
+        Publication number, starting at 0.
+    timestamp : float
+        Book timestamp (seconds after midnight) when it was published.
+    messages : int
+        The book's `message_count` when it was published.
+    levels : np.ndarray
+        int64 array of shape (num_levels, 4), see
+        :meth:`Orderbook.convert_orderbook_to_L2_array`.
+    """
+    sequence: int
+    timestamp: float
+    messages: int
+    levels: np.ndarray
+
+    @property
+    def quote(self) -> tuple:
+        """
+        L1 quote as (ask price, ask size, bid price, bid size).
+        """
+        return tuple(self.levels[0].tolist())
+
+
+class SharedBookPublisher:
+    """
+    Publish the top levels of an order book to other processes via shared memory.
+
+    Publications go into a ring of `slots` fixed-size slots in a
+    :class:`multiprocessing.shared_memory.SharedMemory` block. Each slot is
+    guarded by a sequence number (a seqlock): the writer makes it odd, fills the
+    slot, then makes it even, and finally advances the published count in the
+    header. Readers copy a slot and keep the copy only if its sequence number was
+    even and unchanged, so the writer never waits for readers and readers never
+    take a lock.
+
+    The protocol relies on stores becoming visible to other cores in program
+    order, which x86-64 guarantees; weakly ordered CPUs may in rare cases let a
+    reader accept a torn copy.
+
+    Parameters
+    ----------
+    num_levels : int, default=10
+        Levels per side published.
+    slots : int, default=64
+        Number of publications kept in the ring. Readers that fall more than
+        `slots` publications behind skip ahead.
+    name : str, optional
+        Shared memory block name. A unique name is generated if omitted.
+
+    Attributes
+    ----------
+    name : str
+        Name readers pass to :class:`SharedBookReader`.
+    published : int
+        Number of publications so far.
+    """
+    def __init__(self, num_levels: int = 10, slots: int = 64, name: str = None):
+        if num_levels < 1 or slots < 1:
+            raise ValueError("num_levels and slots must be >= 1")
+        self.num_levels = num_levels
+        self.slots = slots
+        self._slot_words = _slot_words(num_levels)
+        size = 8 * (_HEADER_WORDS + slots * self._slot_words)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self._shm.name
+        self._header, self._ring, self._ring_float = _map(self._shm.buf, slots, self._slot_words)
+        self._header[:] = 0
+        self._ring[:] = 0
+        self._header[:5] = (_MAGIC, _LAYOUT_VERSION, num_levels, slots, self._slot_words)
+        self.published = 0
+        self._attached = None
+
+    def publish(self, orderbook: Orderbook) -> int:
+        """
+        Write the current top levels of `orderbook` as the next publication.
+
+        Returns
+        -------
+        int
+            Sequence number of the publication.
+        """
+        seq = self.published
+        slot = self._ring[seq % self.slots]
+        slot[0] = 2 * seq + 1
+        slot[1] = orderbook.message_count
+        self._ring_float[seq % self.slots, 2] = orderbook.curr_book_timestamp
+        orderbook.convert_orderbook_to_L2_array(
+            self.num_levels, out=slot[_SLOT_HEADER_WORDS:_SLOT_HEADER_WORDS + 4 * self.num_levels].reshape(-1, 4))
+        slot[0] = 2 * seq + 2
+        self.published = seq + 1
+        self._header[_PUBLISHED] = seq + 1
+        return seq
+
+    def attach(self, orderbook: Orderbook, every: int = 1) -> None:
+        """
+        Publish automatically as `orderbook` processes messages.
+
+        A publishing `process_order` is installed on the book instance, wrapping
+        the one currently in place (e.g. an instrumented one). :meth:`detach`
+        restores it. Messages that cannot change the published levels (hidden
+        executions, cross and halt messages, and prices behind the `num_levels`-th
+        level of their side) are not counted and do not trigger a publication.
+
+        Parameters
+        ----------
+        orderbook : Orderbook
+            Book to follow. Its replay, e.g. through :class:`LobsterSim`, publishes
+            as it goes.
+        every : int, default=1
+            Publish once per this many counted messages; 1 publishes after each
+            event that may have changed the top of the book.
+        """
+        if self._attached is not None:
+            raise ValueError("publisher is already attached to a book")
+        had_own = "process_order" in orderbook.__dict__
+        process_order = orderbook.process_order
+        publish = self.publish
+        every = max(1, every)
+        counter = [0]
+        deepest = self.num_levels - 1
+        bids, asks = orderbook.bids, orderbook.asks
+
+        def publishing_process_order(order):
+            process_order(order)
+            if order.event_type in _INVISIBLE_EVENTS:
+                return
+            # After the message, a price behind the deepest published level was not
+            # (and did not become) part of the published levels
+            if order.direction == 'bid':
+                if len(bids) > deepest and order.price < bids.peekitem(deepest)[0]:
+                    return
+            elif len(asks) > deepest and order.price > asks.peekitem(deepest)[0]:
+                return
+            counter[0] += 1
+            if counter[0] == every:
+                counter[0] = 0
+                publish(orderbook)
+
+        orderbook.process_order = publishing_process_order
+        self._attached = (orderbook, process_order if had_own else None)
+
+    def detach(self) -> None:
+        """
+        Stop publishing automatically and restore the book's previous `process_order`.
+        """
+        if self._attached is None:
+            return
+        orderbook, previous = self._attached
+        if previous is None:
+            orderbook.__dict__.pop("process_order", None)
+        else:
+            orderbook.process_order = previous
+        self._attached = None
+
+    def close(self) -> None:
+        """
+        Detach, then release and remove the shared memory block.
+
+        Readers that are still attached keep their mapping until they close it.
+        """
+        self.detach()
+        self._header = self._ring = self._ring_float = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SharedBookReader:
+    """
+    Lock-free reader of the publications of a :class:`SharedBookPublisher`.
+
+    Parameters
+    ----------
+    name : str
+        Name of the publisher's shared memory block.
+    max_retries : int, default=100
+        Attempts to read a slot the writer is currently filling before giving up
+        on it.
+    """
+    def __init__(self, name: str, max_retries: int = 100):
+        self._shm = _attach_untracked(name)
+        header = np.ndarray(_HEADER_WORDS, dtype=np.int64, buffer=self._shm.buf)
+        if header[0] != _MAGIC or header[1] != _LAYOUT_VERSION:
+            header = None
+            self._shm.close()
+            raise ValueError(f"{name!r} is not a shared order book block")
+        self.num_levels, self.slots, self._slot_words = (int(x) for x in header[2:5])
+        del header
+        self.max_retries = max_retries
+        self._header, self._ring, self._ring_float = _map(self._shm.buf, self.slots, self._slot_words)
+
+    @property
+    def published(self) -> int:
+        """
+        Number of publications so far.
+        """
+        return int(self._header[_PUBLISHED])
+
+    def read(self, sequence: int) -> SharedBookSnapshot:
+        """
+        Read publication `sequence`.
+
+        Returns
+        -------
+        SharedBookSnapshot or None
+            None if it has not been published yet, has already been overwritten,
+            or stayed inconsistent for `max_retries` attempts.
+        """
+        if sequence < 0:
+            return None
+        index = sequence % self.slots
+        slot = self._ring[index]
+        done = 2 * sequence + 2
+        end = _SLOT_HEADER_WORDS + 4 * self.num_levels
+        for _ in range(self.max_retries):
+            before = int(slot[0])
+            if before > done or before < done - 1:
+                # Overwritten by a later publication, or not written yet
+                return None
+            if before == done:
+                messages = int(slot[1])
+                timestamp = float(self._ring_float[index, 2])
+                levels = slot[_SLOT_HEADER_WORDS:end].copy().reshape(-1, 4)
+                if int(slot[0]) == before:
+                    return SharedBookSnapshot(sequence, timestamp, messages, levels)
+        return None
+
+    def latest(self) -> SharedBookSnapshot:
+        """
+        Read the newest consistent publication.
+
+        Returns
+        -------
+        SharedBookSnapshot or None
+            None if nothing has been published yet.
+        """
+        while True:
+            published = self.published
+            if not published:
+                return None
+            snapshot = self.read(published - 1)
+            if snapshot is not None:
+                return snapshot
+            # The writer lapped the ring while we were copying, or is stuck
+            # mid-write: fall back to the previous slot if it is still intact
+            snapshot = self.read(published - 2)
+            if snapshot is not None or self.published == published:
+                return snapshot
+
+    def read_since(self, sequence: int) -> list:
+        """
+        Read every publication after `sequence` that is still in the ring.
+
+        Parameters
+        ----------
+        sequence : int
+            Last sequence number already seen; -1 for none.
+
+        Returns
+        -------
+        list of SharedBookSnapshot
+            In publication order. Gaps in the sequence numbers show publications
+            that were overwritten before they could be read.
+        """
+        published = self.published
+        start = max(sequence + 1, published - self.slots)
+        snapshots = (self.read(seq) for seq in range(start, published))
+        return [s for s in snapshots if s is not None]
+
+    def close(self) -> None:
+        """
+        Release this process's mapping of the shared memory block.
+        """
+        self._header = self._ring = self._ring_float = None
+        self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _map(buf, slots: int, slot_words: int) -> tuple:
+    header = np.ndarray(_HEADER_WORDS, dtype=np.int64, buffer=buf)
+    ring = np.ndarray((slots, slot_words), dtype=np.int64, buffer=buf, offset=8 * _HEADER_WORDS)
+    return header, ring, ring.view(np.float64)
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block without handing it to the resource tracker.
+
+    Before Python 3.13 attaching registers the block with the tracker, which
+    unlinks it when the reader process exits and leaves the writer's block gone.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = shared_memory.resource_tracker.register
+    shared_memory.resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        shared_memory.resource_tracker.register = register
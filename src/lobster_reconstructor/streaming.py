@@ -0,0 +1,121 @@
+import queue
+import threading
+from typing import Iterator
+
+from .loaders import iter_message_chunks
+
+_END = object()
+
+
+class MessageStream:
+    """
+    Forward-only stream of message rows parsed by a background reader thread.
+
+    The reader parses the message file in chunks of `chunk_size` rows and hands
+    them to the consumer through a queue holding at most `max_chunks` chunks, so
+    at most ``(max_chunks + 2) * chunk_size`` messages are held in memory
+    regardless of file length.
+
+    Parameters
+    ----------
+    msg_book_file_path : str or file-like
+        LOBSTER message.csv file path, or a buffer holding message rows.
+    chunk_size : int, default=100_000
+        Number of messages parsed at a time.
+    max_chunks : int, default=4
+        Maximum number of parsed chunks waiting to be consumed.
+
+    Attributes
+    ----------
+    position : int
+        Number of messages consumed so far (index of the next message).
+    """
+    def __init__(self, msg_book_file_path, chunk_size: int = 100_000, max_chunks: int = 4):
+        if chunk_size < 1 or max_chunks < 1:
+            raise ValueError("chunk_size and max_chunks must be >= 1")
+        self.position = 0
+        self._rows = []
+        self._row_pos = 0
+        self._exhausted = False
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read, args=(msg_book_file_path, chunk_size), daemon=True)
+        self._thread.start()
+
+    def _read(self, msg_book_file_path, chunk_size: int) -> None:
+        try:
+            for chunk in iter_message_chunks(msg_book_file_path, chunk_size):
+                if not self._put(list(chunk.itertuples(index=False, name=None))):
+                    return
+        except Exception as exc:
+            self._put(exc)
+            return
+        self._put(_END)
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _next_chunk(self) -> bool:
+        item = self._queue.get()
+        if item is _END:
+            self._exhausted = True
+            return False
+        if isinstance(item, Exception):
+            self._exhausted = True
+            raise item
+        self._rows = item
+        self._row_pos = 0
+        return True
+
+    def take_until(self, time: float) -> Iterator[tuple]:
+        """
+        Yield the next messages with timestamp <= `time`.
+
+        The first message after `time` stays in the stream.
+
+        Parameters
+        ----------
+        time : float
+            Timestamp (seconds after midnight) to stop at (inclusive).
+
+        Yields
+        ------
+        tuple
+            (Time, Type, OrderID, Size, Price, Direction) message rows.
+        """
+        while True:
+            if self._row_pos >= len(self._rows):
+                if self._exhausted or not self._next_chunk():
+                    return
+                continue
+            row = self._rows[self._row_pos]
+            if row[0] > time:
+                return
+            self._row_pos += 1
+            self.position += 1
+            yield row
+
+    @property
+    def exhausted(self) -> bool:
+        """True once every message has been consumed."""
+        return self._exhausted and self._row_pos >= len(self._rows)
+
+    def close(self) -> None:
+        """
+        Stop the reader thread and release buffered chunks.
+        """
+        self._stop.set()
+        self._exhausted = True
+        self._rows = []
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join(timeout=1)
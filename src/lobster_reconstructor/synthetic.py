@@ -0,0 +1,200 @@
+import heapq
+import random
+import numpy as np
+import pandas as pd
+from sortedcontainers import SortedDict
+
+
+def generate_messages(
+    n_events: int = 100_000,
+    seed: int = 0,
+    start_time: float = 34200.0,
+    event_rate: float = 50.0,
+    depth: int = 10,
+    tick: int = 100,
+    start_price: int = 1_000_000,
+    mean_lifetime: float = 5.0,
+    execution_share: float = 0.1,
+    hidden_share: float = 0.02,
+    cancel_share: float = 0.1,
+    mid_volatility: float = 0.5,
+    mean_size: int = 100,
+) -> dict:
+    """
+    Generate a synthetic LOBSTER message stream with a consistent order book.
+
+    Messages arrive as a Poisson process. Each arrival is a limit order submission
+    within `depth` ticks of a drifting reference mid, a visible execution against
+    the front of the queue at the best opposite price, a hidden execution, or a
+    partial cancellation of a random resting order. Every submitted order gets an
+    exponential lifetime and is deleted when it expires, unless it was executed
+    first. Submissions never cross the spread, so the stream replays without
+    anomalies and without the matching engine.
+
+    Parameters
+    ----------
+    n_events : int, default=100_000
+        Number of messages.
+    seed : int, default=0
+        Random seed; equal arguments give identical streams.
+    start_time : float, default=34200.0
+        Timestamp (seconds after midnight) of the start of the stream.
+    event_rate : float, default=50.0
+        Mean number of arrivals per second (deletes of expired orders come on top).
+    depth : int, default=10
+        Number of ticks from the touch within which orders are submitted.
+    tick : int, default=100
+        Tick size in unscaled LOBSTER price units.
+    start_price : int, default=1_000_000
+        Initial reference mid (unscaled).
+    mean_lifetime : float, default=5.0
+        Mean lifetime in seconds of a limit order.
+    execution_share, hidden_share, cancel_share : float
+        Shares of arrivals that are visible executions, hidden executions and
+        partial cancellations. The remaining arrivals are submissions.
+    mid_volatility : float, default=0.5
+        Standard deviation of the reference mid, in ticks per square-root second.
+    mean_size : int, default=100
+        Mean order size.
+
+    Returns
+    -------
+    dict
+        `time` (float64), `type` (int8 LOBSTER event code), `order_id`, `size`,
+        `price` (int64) and `direction` (int8, 1 for bid, -1 for ask), the layout
+        of :meth:`LobsterSim.message_arrays`.
+    """
+    rnd = random.Random(seed)
+    out = np.zeros((n_events, 5), dtype=np.int64)
+    times = np.empty(n_events, dtype=np.float64)
+
+    levels = {1: SortedDict(), -1: SortedDict()}   # direction -> price -> [order IDs in queue order]
+    orders = {}                                    # order ID -> [price, size, direction]
+    live = []                                      # order IDs, for uniform sampling
+    position = {}                                  # order ID -> index in `live`
+    expiries = []                                  # heap of (expiry time, order ID)
+
+    def remove(oid):
+        price, _, direction = orders.pop(oid)
+        queue = levels[direction][price]
+        queue.remove(oid)
+        if not queue:
+            del levels[direction][price]
+        i = position.pop(oid)
+        last = live.pop()
+        if last != oid:
+            live[i] = last
+            position[last] = i
+
+    t = start_time
+    mid = float(start_price)
+    next_oid = 1
+    sigma = mid_volatility * tick
+    max_offset = max(depth - 1, 0)
+    p_exec = execution_share
+    p_hidden = p_exec + hidden_share
+    p_cancel = p_hidden + cancel_share
+    i = 0
+    while i < n_events:
+        dt = rnd.expovariate(event_rate)
+        if expiries and expiries[0][0] <= t + dt:
+            expiry, oid = heapq.heappop(expiries)
+            if oid in orders:
+                price, size, direction = orders[oid]
+                remove(oid)
+                times[i] = t = max(t, expiry)
+                out[i] = (3, oid, size, price, direction)
+                i += 1
+            continue
+
+        t += dt
+        mid += rnd.gauss(0.0, sigma * dt ** 0.5)
+        u = rnd.random()
+        if u < p_exec and live:
+            direction = rnd.choice((1, -1))
+            if not levels[direction]:
+                direction = -direction
+            price = levels[direction].peekitem(-1 if direction == 1 else 0)[0]
+            oid = levels[direction][price][0]
+            resting = orders[oid]
+            size = min(resting[1], max(1, int(rnd.expovariate(1.0 / mean_size))))
+            resting[1] -= size
+            if not resting[1]:
+                remove(oid)
+            out[i] = (4, oid, size, price, direction)
+        elif u < p_hidden:
+            price = int(round(mid / tick)) * tick
+            out[i] = (5, 0, max(1, int(rnd.expovariate(1.0 / mean_size))), price, rnd.choice((1, -1)))
+        elif u < p_cancel and live:
+            oid = live[rnd.randrange(len(live))]
+            price, size, direction = orders[oid]
+            if size > 1:
+                size = rnd.randint(1, size - 1)
+                orders[oid][1] -= size
+                out[i] = (2, oid, size, price, direction)
+            else:
+                remove(oid)
+                out[i] = (3, oid, size, price, direction)
+        else:
+            direction = rnd.choice((1, -1))
+            offset = min(int(rnd.expovariate(3.0 / max(depth, 1))), max_offset) * tick
+            if direction == 1:
+                price = int(mid // tick) * tick - offset
+                if levels[-1]:
+                    price = min(price, levels[-1].peekitem(0)[0] - tick)
+            else:
+                price = -int(-mid // tick) * tick + offset
+                if levels[1]:
+                    price = max(price, levels[1].peekitem(-1)[0] + tick)
+            size = max(1, int(rnd.expovariate(1.0 / mean_size)))
+            oid = next_oid
+            next_oid += 1
+            orders[oid] = [price, size, direction]
+            levels[direction].setdefault(price, []).append(oid)
+            position[oid] = len(live)
+            live.append(oid)
+            heapq.heappush(expiries, (t + rnd.expovariate(1.0 / mean_lifetime), oid))
+            out[i] = (1, oid, size, price, direction)
+        times[i] = t
+        i += 1
+
+    return {
+        "time": times,
+        "type": out[:, 0].astype(np.int8),
+        "order_id": out[:, 1].copy(),
+        "size": out[:, 2].copy(),
+        "price": out[:, 3].copy(),
+        "direction": out[:, 4].astype(np.int8),
+    }
+
+
+def write_message_file(path: str, arrays: dict = None, **kwargs) -> dict:
+    """
+    Write a synthetic LOBSTER message.csv file.
+
+    Parameters
+    ----------
+    path : str
+        Output file path.
+    arrays : dict, optional
+        Message arrays as returned by :func:`generate_messages`. Generated from
+        `kwargs` if omitted.
+    **kwargs
+        Passed to :func:`generate_messages`.
+
+    Returns
+    -------
+    dict
+        The written message arrays.
+    """
+    if arrays is None:
+        arrays = generate_messages(**kwargs)
+    pd.DataFrame({
+        "time": arrays["time"],
+        "type": arrays["type"],
+        "order_id": arrays["order_id"],
+        "size": arrays["size"],
+        "price": arrays["price"],
+        "direction": arrays["direction"],
+    }).to_csv(path, header=False, index=False, float_format="%.9f")
+    return arrays
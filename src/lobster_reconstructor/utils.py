@@ -1,3 +1,6 @@
+import importlib
+
+
 def format_timestamp(seconds_from_midnight: float, display_micro=False) -> str:
     """
     Formats a timestamp in seconds from midnight into a human-readable string.
@@ -24,4 +27,32 @@ def format_timestamp(seconds_from_midnight: float, display_micro=False) -> str:
         else f"{hours:02d}:{mins:02d}:{secs:02d}"
     )
 
+
+def import_optional(module: str, feature: str = "Plotting"):
+    """
+    Import an optional dependency, e.g. the plotly and dash visualization stack.
+
+    Parameters
+    ----------
+    module : str
+        Module name, e.g. "plotly.graph_objects".
+    feature : str, default="Plotting"
+        Feature named in the error message.
+
+    Returns
+    -------
+    module
+        The imported module.
+
+    Raises
+    ------
+    ImportError
+        If the module is not installed, with a hint to install the `viz` extra.
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        raise ImportError(f"{feature} requires the optional '{module.split('.')[0]}' package "
+                          "(pip install lobster_reconstructor[viz]).") from exc
+
 # def scale_format_price(price: int, price_scaling: float) -> str:
@@ -0,0 +1,193 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+L2_FIELDS = ("ask_price", "ask_size", "bid_price", "bid_size")
+
+
+@dataclass
+class BookValidationReport:
+    """
+    Result of validating a reconstructed book against a LOBSTER orderbook.csv file.
+
+    Attributes
+    ----------
+    num_levels : int
+        Number of levels per side that were compared.
+    snapshots_checked : int
+        Number of orderbook file rows compared.
+    mismatched_snapshots : int
+        Number of compared rows with at least one mismatching field.
+    mismatch_count : int
+        Total number of mismatching (row, level, field) cells.
+    field_counts : dict
+        Mismatch count per field (`ask_price`, `ask_size`, `bid_price`, `bid_size`).
+    mismatches : pd.DataFrame
+        One row per mismatching cell with columns `snapshot` (orderbook file row),
+        `message_index` (index into the replayed message data), `time`, `side`,
+        `level` (1-based), `field`, `expected` and `reconstructed`.
+        Truncated to `max_mismatches` rows if a cap was given.
+    events_processed : int
+        Number of messages replayed.
+    elapsed : float
+        Wall-clock seconds spent replaying and comparing.
+    """
+    num_levels: int
+    snapshots_checked: int = 0
+    mismatched_snapshots: int = 0
+    mismatch_count: int = 0
+    field_counts: dict = field(default_factory=dict)
+    mismatches: pd.DataFrame = field(default_factory=pd.DataFrame)
+    events_processed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.mismatch_count == 0
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.events_processed / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def summary(self) -> str:
+        """
+        Human-readable summary of the validation run.
+
+        Returns
+        -------
+        str
+            Multi-line summary with counts and throughput.
+        """
+        lines = [
+            f"Checked {self.snapshots_checked} snapshots x {self.num_levels} levels "
+            f"({self.events_processed} events, {self.events_per_sec:,.0f} events/s)",
+        ]
+        if self.ok:
+            lines.append("Full book is good")
+        else:
+            first = self.mismatches.iloc[0]
+            lines.append(f"{self.mismatch_count} mismatching fields in {self.mismatched_snapshots} snapshots: "
+                         + ", ".join(f"{k}={v}" for k, v in self.field_counts.items()))
+            lines.append(f"First mismatch at snapshot {first['snapshot']} (message index {first['message_index']}, "
+                         f"time {first['time']}): {first['side'].upper()} level {first['level']} {first['field']} "
+                         f"expected {first['expected']}, reconstructed {first['reconstructed']}")
+        return "\n".join(lines)
+
+
+def compare_L2_arrays(
+    reconstructed: np.ndarray,
+    reference: np.ndarray,
+    snapshot_rows: np.ndarray,
+    message_indices: np.ndarray,
+    times: np.ndarray,
+    max_mismatches: int = None,
+) -> tuple[int, int, dict, pd.DataFrame]:
+    """
+    Compare reconstructed L2 snapshots with reference rows in one vectorized step.
+
+    Parameters
+    ----------
+    reconstructed : np.ndarray
+        Array of shape (n, num_levels, 4), see :meth:`Orderbook.convert_orderbook_to_L2_array`.
+    reference : np.ndarray
+        Orderbook file rows of shape (n, >= 4 * num_levels), in LOBSTER column order.
+    snapshot_rows : np.ndarray
+        Orderbook file row number of each snapshot.
+    message_indices : np.ndarray
+        Message index after which each snapshot was taken.
+    times : np.ndarray
+        Timestamp of each snapshot.
+    max_mismatches : int, optional
+        Maximum number of mismatching cells to list in the returned table.
+
+    Returns
+    -------
+    tuple
+        (mismatched_snapshots, mismatch_count, field_counts, mismatches DataFrame)
+    """
+    n, num_levels, _ = reconstructed.shape
+    expected = np.asarray(reference[:, :4 * num_levels]).reshape(n, num_levels, 4)
+    diff = reconstructed != expected
+
+    mismatch_count = int(diff.sum())
+    mismatched_snapshots = int(diff.any(axis=(1, 2)).sum())
+    field_counts = dict(zip(L2_FIELDS, diff.sum(axis=(0, 1)).tolist()))
+
+    snap, level, fld = np.nonzero(diff)
+    if max_mismatches is not None:
+        snap, level, fld = snap[:max_mismatches], level[:max_mismatches], fld[:max_mismatches]
+    field_names = np.array(L2_FIELDS)[fld]
+    mismatches = pd.DataFrame({
+        "snapshot": snapshot_rows[snap],
+        "message_index": message_indices[snap],
+        "time": times[snap],
+        "side": np.where(fld < 2, "ask", "bid"),
+        "level": level + 1,
+        "field": field_names,
+        "expected": expected[snap, level, fld],
+        "reconstructed": reconstructed[snap, level, fld],
+    })
+    return mismatched_snapshots, mismatch_count, field_counts, mismatches
+
+
+def _validate_day(job: dict, num_levels_to_check: int, sample_every: int, max_mismatches: int) -> BookValidationReport:
+    from .orderbook import Orderbook
+    from .lobster_sim import LobsterSim
+    from .loaders import read_message_file
+
+    orderbook = Orderbook(
+        job.get("nlevels", num_levels_to_check),
+        job.get("ticker", ""),
+        job["tick_size"],
+        job.get("price_scaling", 0.0001),
+    )
+    sim = LobsterSim(orderbook, job["message_file"], job["orderbook_file"])
+    n_level_message_df = None
+    if job.get("n_level_message_file") is not None:
+        n_level_message_df = read_message_file(job["n_level_message_file"])
+    return sim.validate_full_book(num_levels_to_check, n_level_message_df,
+                                  sample_every=sample_every, max_mismatches=max_mismatches)
+
+
+def validate_days(
+    jobs: dict,
+    num_levels_to_check: int,
+    sample_every: int = 1,
+    max_mismatches: int = 1000,
+    max_workers: int = None,
+) -> dict:
+    """
+    Validate several days of reconstruction in parallel worker processes.
+
+    Parameters
+    ----------
+    jobs : dict
+        Mapping of a label (e.g. the date) to a job specification dict with keys:
+
+        - `message_file` : LOBSTER message.csv used for reconstruction
+        - `orderbook_file` : LOBSTER orderbook.csv to compare against
+        - `tick_size` : tick size passed to :class:`Orderbook`
+        - `n_level_message_file` (optional) : message file paired row-by-row with
+          `orderbook_file`, when `message_file` is a full-depth file
+        - `ticker`, `nlevels`, `price_scaling` (optional) : :class:`Orderbook` arguments
+    num_levels_to_check : int
+        Number of levels per side to compare.
+    sample_every : int, default=1
+        Compare only every k-th orderbook file row.
+    max_mismatches : int, default=1000
+        Maximum number of mismatching cells listed per report.
+    max_workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+
+    Returns
+    -------
+    dict
+        Mapping of each label to its :class:`BookValidationReport`.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            label: pool.submit(_validate_day, job, num_levels_to_check, sample_every, max_mismatches)
+            for label, job in jobs.items()
+        }
+        return {label: future.result() for label, future in futures.items()}
@@ -0,0 +1,195 @@
+import threading
+import time
+from dataclasses import dataclass
+import numpy as np
+
+from .orderbook import Orderbook, LOBSTER_DUMMY_ASK_PRICE, LOBSTER_DUMMY_BID_PRICE
+
+
+@dataclass(frozen=True)
+class BookView:
+    """
+    Immutable published state of the top levels of an order book.
+
+    Attributes
+    ----------
+    version : int
+        Publication number, increasing by one with every publication.
+    timestamp : float
+        Book timestamp (seconds after midnight) when the view was taken.
+    message_count : int
+        The book's `message_count` when the view was taken.
+    levels : np.ndarray
+        Read-only int64 array of shape (num_levels, 4), see
+        :meth:`Orderbook.convert_orderbook_to_L2_array`.
+    """
+    version: int
+    timestamp: float
+    message_count: int
+    levels: np.ndarray
+
+    @property
+    def best_ask(self) -> int:
+        """
+        Unscaled best ask price, None if the ask side is empty.
+        """
+        price = int(self.levels[0, 0]) if len(self.levels) else LOBSTER_DUMMY_ASK_PRICE
+        return None if price == LOBSTER_DUMMY_ASK_PRICE else price
+
+    @property
+    def best_bid(self) -> int:
+        """
+        Unscaled best bid price, None if the bid side is empty.
+        """
+        price = int(self.levels[0, 2]) if len(self.levels) else LOBSTER_DUMMY_BID_PRICE
+        return None if price == LOBSTER_DUMMY_BID_PRICE else price
+
+    @property
+    def mid_price(self) -> float:
+        """
+        Unscaled midprice, None if either side is empty.
+        """
+        bid, ask = self.best_bid, self.best_ask
+        return None if bid is None or ask is None else (bid + ask) / 2
+
+
+class ViewPublisher:
+    """
+    Versioned views of an order book for threads other than the replay thread.
+
+    The replay thread builds a new immutable :class:`BookView` at the configured
+    cadence and publishes it by replacing the `current` reference, which is
+    atomic. Reader threads only ever read `current` and never touch the book's
+    sorted containers, so they see complete states without taking a lock, and the
+    replay never waits for them. A view a reader holds stays valid however far
+    the replay moves on.
+
+    Parameters
+    ----------
+    orderbook : Orderbook
+        Book to publish. Views are taken in the thread that replays it.
+    num_levels : int, optional
+        Levels per side in each view. Defaults to the book's `nlevels`.
+    every : int, default=1000
+        Messages between publications while the book is replayed (by
+        :meth:`LobsterSim.enable_views` or after :meth:`attach`).
+    interval : float, optional
+        Publish at most once per this many wall-clock seconds in that case.
+
+    Attributes
+    ----------
+    current : BookView
+        Latest published view. The first one is taken on construction.
+    """
+    def __init__(self, orderbook: Orderbook, num_levels: int = None, every: int = 1000, interval: float = None):
+        if every < 1:
+            raise ValueError("every must be >= 1")
+        self.orderbook = orderbook
+        self.num_levels = orderbook.nlevels if num_levels is None else num_levels
+        self.every = every
+        self.interval = interval
+        self._updated = threading.Event()
+        self._attached = False
+        self._previous = None
+        self._next_allowed = -np.inf
+        self.current = None
+        self.publish()
+
+    def publish(self) -> BookView:
+        """
+        Take a view of the book now and make it `current`.
+
+        Must be called from the thread that modifies the book.
+
+        Returns
+        -------
+        BookView
+            The published view.
+        """
+        book = self.orderbook
+        levels = book.convert_orderbook_to_L2_array(self.num_levels)
+        levels.flags.writeable = False
+        version = 0 if self.current is None else self.current.version + 1
+        self.current = BookView(version, book.curr_book_timestamp, book.message_count, levels)
+        # Wake waiting readers with the event they hold; later waits use a fresh one
+        updated, self._updated = self._updated, threading.Event()
+        updated.set()
+        return self.current
+
+    def maybe_publish(self) -> BookView:
+        """
+        Publish unless the last publication is less than `interval` seconds old.
+
+        Returns
+        -------
+        BookView or None
+            The published view, None if it was too early.
+        """
+        if self.interval is not None:
+            now = time.monotonic()
+            if now < self._next_allowed:
+                return None
+            self._next_allowed = now + self.interval
+        return self.publish()
+
+    def wait_for_update(self, version: int, timeout: float = None) -> BookView:
+        """
+        Block the calling reader thread until a view newer than `version` is published.
+
+        Parameters
+        ----------
+        version : int
+            Version the reader has already seen.
+        timeout : float, optional
+            Maximum wait in seconds.
+
+        Returns
+        -------
+        BookView
+            The current view, which is still `version` if the wait timed out.
+        """
+        updated = self._updated
+        if self.current.version <= version:
+            updated.wait(timeout)
+        return self.current
+
+    def attach(self) -> None:
+        """
+        Publish automatically while the book processes messages.
+
+        A counting `process_order` is installed on the book instance, wrapping
+        the one currently in place; :meth:`detach` restores it. Between
+        publications it costs one decrement per message.
+        """
+        if self._attached:
+            return
+        book = self.orderbook
+        process_order = book.process_order
+        # None means the class method was in place
+        self._previous = book.__dict__.get("process_order")
+        every = self.every
+        maybe_publish = self.maybe_publish
+        countdown = [every]
+
+        def publishing_process_order(order):
+            process_order(order)
+            countdown[0] -= 1
+            if not countdown[0]:
+                countdown[0] = every
+                maybe_publish()
+
+        book.process_order = publishing_process_order
+        self._attached = True
+
+    def detach(self) -> None:
+        """
+        Stop publishing automatically and restore the book's previous `process_order`.
+        """
+        if not self._attached:
+            return
+        if self._previous is None:
+            self.orderbook.__dict__.pop("process_order", None)
+        else:
+            self.orderbook.process_order = self._previous
+        self._attached = False
+        self._previous = None
@@ -1,7 +1,47 @@
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 import numpy as np
+import pandas as pd
 from src.lobster_reconstructor.orderbook import Orderbook
 from src.lobster_reconstructor.orders import Order, LimitOrder
+from src.lobster_reconstructor.lobster_sim import LobsterSim
+from src.lobster_reconstructor.dataset import TensorDataset
+
+
+MESSAGE_ROWS = [
+    (34200.0, 1, 1, 100, 10000, 1),
+    (34200.5, 1, 2, 50, 10100, -1),
+    (34201.0, 1, 3, 30, 9900, 1),
+    (34201.5, 2, 1, 40, 10000, 1),
+    (34202.0, 4, 2, 50, 10100, -1),
+    (34202.5, 1, 4, 70, 10200, -1),
+    (34203.0, 3, 3, 30, 9900, 1),
+]
+
+
+def write_csv(path, rows):
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(",".join(str(v) for v in row) + "\n")
+
+
+class MessageFileTestCase(unittest.TestCase):
+    """
+    Writes `ROWS` to ``message.csv`` in a fresh temporary directory for each test.
+    """
+    ROWS = MESSAGE_ROWS
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.msg_path = os.path.join(self.tmp.name, "message.csv")
+        write_csv(self.msg_path, self.ROWS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
 
 class TestOrderbookBasic(unittest.TestCase):
     def setUp(self):
@@ -142,6 +182,24 @@ class TestOrderbookBasic(unittest.TestCase):
         self.assertEqual(self.book.calc_size_OFI(), 0)
         self.assertEqual(self.book.calc_count_OFI(), 0)
 
+    def test_bbo_change_tracking(self):
+        changes = []
+        self.book.on_bbo_change = lambda book: changes.append(
+            (book.highest_bid_price(), book.highest_bid_volume(), book.lowest_ask_price(), book.lowest_ask_volume()))
+        self.submit_order(timestamp=1.0, event_type='submit', order_id=1, size=100, price=100, direction='bid')
+        self.submit_order(timestamp=1.1, event_type='submit', order_id=2, size=50, price=99, direction='bid')
+        self.submit_order(timestamp=1.2, event_type='submit', order_id=3, size=70, price=105, direction='ask')
+        self.submit_order(timestamp=1.3, event_type='cancel', order_id=1, size=40, price=100, direction='bid')
+        self.submit_order(timestamp=1.4, event_type='delete', order_id=1, size=60, price=100, direction='bid')
+        self.assertEqual(changes, [
+            (100, 100, np.inf, 0),
+            (100, 100, 105, 70),
+            (100, 60, 105, 70),
+            (99, 50, 105, 70),
+        ])
+        self.assertEqual(self.book.bbo_change_count, 4)
+        self.assertEqual(self.book.mid_price(), 102)
+
     def test_orderbook_snapshots(self):
         # build simple book
         for i, (sz, pr) in enumerate([(100,100), (200,101), (300,102), (400,103)], start=1):
@@ -236,6 +294,23 @@ class TestOrderbookEdgeCases(unittest.TestCase):
         t_mid = self.book.time_elapsed_since_mid_price_change(lo)
         self.assertEqual(t_mid, lo.timestamp - self.book.midprice_change_timestamp)
 
+    def test_order_features_match_per_order_functions(self):
+        self.assertEqual(len(self.book.order_features()), 0)
+        for i, (p, sz, d) in enumerate([(100, 10, 'bid'), (101, 15, 'bid'), (101, 7, 'bid'), (99, 4, 'bid'),
+                                        (103, 8, 'ask'), (104, 12, 'ask'), (103, 3, 'ask'), (106, 5, 'ask')]):
+            self.book.process_order(Order(timestamp=1 + i, event_type='submit', order_id=i + 1, size=sz, price=p, direction=d))
+        features = self.book.order_features()
+        orders = [o for side in (self.book.bids, self.book.asks) for level in side.values() for o in level.values()]
+        self.assertEqual(list(features.index), [o.order_id for o in orders])
+        for name in ("volume_of_higher_priority_orders", "symmetric_opposite_book_volume",
+                     "time_elapsed_since_first_available_order_with_same_price",
+                     "time_elapsed_since_most_recent_order_with_same_price", "time_elapsed_since_mid_price_change"):
+            self.assertEqual(list(features[name]), [getattr(self.book, name)(o) for o in orders], name)
+        self.assertEqual(features.loc[3, "volume_of_higher_priority_orders"], 22)
+        self.assertEqual(list(self.book.order_features([7, 2]).index), [7, 2])
+        with self.assertRaises(KeyError):
+            self.book.order_features([42])
+
     def test_ofi_edge_cases(self):
         # no activity
         self.assertEqual(self.book.calc_size_OFI(), 0)
@@ -247,6 +322,818 @@ class TestOrderbookEdgeCases(unittest.TestCase):
         self.assertEqual(self.book.calc_size_OFI(), 0)
         self.assertEqual(self.book.calc_count_OFI(), 0)
 
+
+class TestBookValidation(MessageFileTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lob_path = os.path.join(self.tmp.name, "orderbook.csv")
+        book = Orderbook(nlevels=2, ticker="VAL", tick_size=0.01)
+        rows = []
+        for r in MESSAGE_ROWS:
+            book.process_order(Order(r[0], {1: 'submit', 2: 'cancel', 3: 'delete', 4: 'vis_exec'}[r[1]],
+                                     r[2], r[3], r[4], 'bid' if r[5] == 1 else 'ask'))
+            rows.append(book.convert_orderbook_to_L2_array(2).ravel().tolist())
+        rows[4][1] += 1  # corrupt ask size at level 1 of row 4
+        write_csv(self.lob_path, rows)
+
+    def test_collects_every_mismatch(self):
+        sim = LobsterSim(Orderbook(nlevels=2, ticker="VAL", tick_size=0.01), self.msg_path, self.lob_path)
+        report = sim.validate_full_book(2)
+        self.assertEqual(report.snapshots_checked, len(MESSAGE_ROWS))
+        self.assertEqual(report.mismatch_count, 1)
+        row = report.mismatches.iloc[0]
+        self.assertEqual((row["snapshot"], row["side"], row["level"], row["field"]), (4, "ask", 1, "ask_size"))
+        self.assertTrue(os.path.exists(self.lob_path + ".npy"))
+
+    def test_sampled_validation(self):
+        sim = LobsterSim(Orderbook(nlevels=2, ticker="VAL", tick_size=0.01), self.msg_path, self.lob_path)
+        report = sim.validate_full_book(2, sample_every=3)
+        self.assertEqual(report.snapshots_checked, 3)
+        self.assertTrue(report.ok)
+
+
+class TestHeatmapGrids(MessageFileTestCase):
+    # Asks 1000200 and 1000201 round to the same BPS bin; the ask side is empty before 34200.5
+    ROWS = [
+        (34200.0, 1, 1, 100, 1000000, 1),
+        (34200.5, 1, 2, 50, 1000200, -1),
+        (34201.0, 1, 3, 30, 1000201, -1),
+        (34201.5, 1, 4, 20, 999900, 1),
+        (34202.0, 3, 2, 50, 1000200, -1),
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=3, ticker="HMP", tick_size=0.01), self.msg_path)
+        self.times, self.levels, self.mids = self.sim.sample_L2_array(34199.5, 34202.5, 0.5)
+
+    def replayed_rows(self):
+        for t in self.times:
+            self.sim.simulate_until(t)
+            yield self.sim.orderbook.mid_price(), self.sim.orderbook.convert_orderbook_to_L2_dataframe()
+
+    def test_price_grid_matches_per_snapshot_construction(self):
+        from src.lobster_reconstructor.lobster_sim import _price_level_grid
+        heatmap, prices = _price_level_grid(self.levels)
+        expected = np.zeros_like(heatmap)
+        for t, (_, snapshot) in enumerate(self.replayed_rows()):
+            for _, row in snapshot.iterrows():
+                expected[np.flatnonzero(prices == row["price"])[0], t] = row["size"]
+        np.testing.assert_array_equal(heatmap, expected)
+        self.assertEqual((prices[0], prices[-1]), (999900, 1000201))
+
+    def test_bps_grid_sums_collisions_and_skips_empty_sides(self):
+        from src.lobster_reconstructor.lobster_sim import _bps_grid
+        heatmap, bps = _bps_grid(self.levels, self.mids)
+        expected = np.zeros_like(heatmap)
+        for t, (mid, snapshot) in enumerate(self.replayed_rows()):
+            if mid is None:
+                continue
+            for _, row in snapshot.iterrows():
+                expected[int(round((row["price"] - mid) / mid * 10000)) - bps[0], t] += row["size"]
+        np.testing.assert_array_equal(heatmap, expected)
+        self.assertEqual(heatmap[:, :2].sum(), 0)
+        self.assertEqual(heatmap[bps == 1, 3].tolist(), [80])
+
+
+class TestL3FrameProvider(MessageFileTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=2, ticker="ANIM", tick_size=0.01), self.msg_path)
+
+    def test_frames_match_replay_in_any_order(self):
+        from src.lobster_reconstructor.animation import L3FrameProvider
+        frames = L3FrameProvider(self.sim, 34200.0, 34203.0, 0.5, checkpoint_every=2, prefetch=0)
+        for frame in [6, 1, 4, 3, 0]:
+            self.sim.simulate_until(frames.timestamps[frame])
+            expected = self.sim.orderbook.convert_orderbook_to_L3_dataframe()
+            expected.price = expected.price * self.sim.orderbook.price_scaling
+            self.assertTrue(frames.frame_dataframe(frame).equals(expected))
+
+    def test_checkpoints_are_thinned_within_budget(self):
+        from src.lobster_reconstructor.animation import L3FrameProvider
+        frames = L3FrameProvider(self.sim, 34200.0, 34203.0, 0.25, checkpoint_every=1, max_cache_bytes=1200, prefetch=0)
+        frames.frame_dataframe(len(frames) - 1)
+        self.assertLessEqual(frames.checkpoint_bytes, 600)
+        self.assertGreater(frames._checkpoint_stride, 1)
+        self.assertTrue(all(k % frames._checkpoint_stride == 0 for k in frames._checkpoints))
+        self.sim.simulate_until(frames.timestamps[3])
+        expected = self.sim.orderbook.convert_orderbook_to_L3_dataframe()
+        expected.price = expected.price * self.sim.orderbook.price_scaling
+        self.assertTrue(frames.frame_dataframe(3).equals(expected))
+        report = frames.memory_usage()
+        self.assertEqual((report.components["figures"], report.components["checkpoints"]),
+                         (frames.cache_bytes, frames.checkpoint_bytes))
+        self.assertEqual(report.components["cursor_book"], sum(report.details["cursor_book"].values()))
+
+    def test_close_stops_prefetch_thread(self):
+        import gc
+        from src.lobster_reconstructor.animation import L3FrameProvider
+        with L3FrameProvider(self.sim, 34200.0, 34203.0, 0.5, prefetch=2) as frames:
+            frames.figure(0)
+            thread = frames._prefetch_thread
+            self.assertTrue(thread.is_alive())
+        self.assertFalse(thread.is_alive())
+        self.assertEqual((frames.cache_bytes, frames.checkpoint_bytes), (0, 0))
+
+        frames = L3FrameProvider(self.sim, 34200.0, 34203.0, 0.5, prefetch=2)
+        frames.figure(0)
+        thread = frames._prefetch_thread
+        del frames
+        gc.collect()
+        thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+
+    def test_frame_deltas_rebuild_visible_orders(self):
+        from src.lobster_reconstructor.animation import L3FrameProvider
+        frames = L3FrameProvider(self.sim, 34200.0, 34203.0, 0.5, prefetch=0)
+        replayed = L3FrameProvider(self.sim, 34200.0, 34203.0, 0.5, prefetch=0)
+        orders, prev = {}, None
+        for frame in [0, 1, 2, 3, 5, 6]:
+            payload = frames.frame_payload(frame, prev)
+            self.assertEqual(payload["key"], prev is None or prev != frame - 1)
+            if payload["key"]:
+                orders = {}
+            for key in payload["removed"]:
+                del orders[key]
+            for key, size in payload["resized"]:
+                orders[key][2] = size
+            for key, *order in payload["added"]:
+                orders[key] = order
+            self.assertEqual(orders, replayed.frame_orders(frame))
+            prev = frame
+
+
+class TestDecimation(MessageFileTestCase):
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(0)
+        self.x = np.cumsum(rng.random(50_000))
+        self.y = np.cumsum(rng.normal(size=len(self.x)))
+
+    def test_envelope_keeps_extremes_and_order(self):
+        from src.lobster_reconstructor.decimation import minmax_decimate
+        x, y = minmax_decimate(self.x, self.y, 500)
+        self.assertLessEqual(len(x), 4 * 500)
+        self.assertTrue(np.all(np.diff(x) > 0))
+        self.assertEqual((y.min(), y.max()), (self.y.min(), self.y.max()))
+        self.assertEqual((x[0], x[-1]), (self.x[0], self.x[-1]))
+
+    def test_pyramid_query_matches_zoomed_range(self):
+        from src.lobster_reconstructor.decimation import DecimationPyramid
+        pyramid = DecimationPyramid(self.x, self.y)
+        x0, x1 = self.x[1234], self.x[40321]
+        x, y = pyramid.query(x0, x1, 300)
+        window = self.y[(self.x >= x0) & (self.x <= x1)]
+        self.assertLessEqual(len(x), 4 * 300)
+        self.assertEqual((y.min(), y.max()), (window.min(), window.max()))
+        x, y = pyramid.query(self.x[100], self.x[200], 300)
+        self.assertEqual(len(x), 101)
+
+    def test_sim_series_requeried_for_axis_range(self):
+        sim = LobsterSim(Orderbook(nlevels=2, ticker="DEC", tick_size=0.01), self.msg_path)
+        x, y = sim._decimated_series("midprice", self.x, self.y, 300, True)
+        self.assertLessEqual(len(x), 4 * 300)
+        x0, x1 = round(self.x[1234], 3), round(self.x[40321], 3)
+        expected = sim.series_pyramids["midprice"].query(x0, x1, 300)
+        axis_range = pd.to_datetime([x0, x1], unit="s").astype(str)
+        zoomed = sim.query_series("midprice", *axis_range, n_pixels=300)
+        np.testing.assert_array_equal(zoomed[1], expected[1])
+        np.testing.assert_array_equal(sim.query_series("midprice", x0, x1, 300)[1], expected[1])
+
+
+class TestL1Stream(MessageFileTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=2, ticker="L1", tick_size=0.01), self.msg_path)
+
+    def test_asof_matches_replay(self):
+        stream = self.sim.extract_L1_stream()
+        self.assertLess(len(stream), len(MESSAGE_ROWS) + 1)
+        grid = np.arange(34199.0, 34204.0, 0.25)
+        quotes = stream.asof(grid)
+        for i, t in enumerate(grid):
+            self.sim.simulate_until(t)
+            book = self.sim.orderbook
+            expected_bid = book.highest_bid_price() if book.bids else np.nan
+            expected_ask = book.lowest_ask_price() if book.asks else np.nan
+            np.testing.assert_equal([quotes.bid_price[i], quotes.ask_price[i]], [expected_bid, expected_ask])
+            self.assertEqual(quotes.bid_size[i], book.highest_bid_volume() if book.bids else 0)
+
+
+class TestTradeAnalytics(MessageFileTestCase):
+    ROWS = MESSAGE_ROWS[:4] + [(34201.8, 5, 0, 25, 10020, -1)] + MESSAGE_ROWS[4:] + [(34203.5, 5, 0, 10, 10150, 1)]
+
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=2, ticker="TRD", tick_size=0.01), self.msg_path)
+
+    def test_trades_in_window_matches_replay(self):
+        start, end = 34200.0, 34204.0
+        fast = self.sim.trades_in_window(start, end, l1_stream=self.sim.extract_L1_stream())
+        self.sim.simulate_until(start)
+        self.sim.orderbook.clear_trade_log()
+        self.sim.simulate_from_current_until(end)
+        replayed = pd.DataFrame(self.sim.orderbook.trade_log)
+        self.assertEqual(fast.values.tolist(), replayed.values.tolist())
+        self.assertEqual(fast["direction"].tolist(), ["bid", "ask", "ask"])
+
+    def test_arrival_counts(self):
+        counts = self.sim.trade_arrival_counts(34200.0, 34204.0, bin_size=1.0)
+        self.assertEqual(counts.index.tolist(), [34201.0, 34202.0, 34203.0])
+        self.assertEqual(counts["bid"].tolist(), [0, 0, 1])
+        self.assertEqual(counts["ask"].tolist(), [1, 1, 0])
+
+    def test_graph_counts_infer_hidden_direction(self):
+        stream = self.sim._hidden_direction_stream(34200.0, 34204.0, None)
+        counts = self.sim.trade_arrival_counts(34200.0, 34204.0, bin_size=1.0, l1_stream=stream)
+        self.assertEqual(counts["bid"].tolist(), [1, 0, 0])
+        self.assertEqual(counts["ask"].tolist(), [0, 1, 1])
+        self.assertIsNone(self.sim._hidden_direction_stream(34200.0, 34204.0, "vis_exec"))
+
+
+class TestL2Engine(MessageFileTestCase):
+    # Includes a cancel for an unknown order and an over-sized cancel
+    ROWS = sorted(MESSAGE_ROWS + [(34203.2, 2, 99, 10, 10000, 1), (34203.4, 2, 4, 500, 10200, -1)])
+
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=2, ticker="L2E", tick_size=0.01), self.msg_path)
+
+    def test_snapshots_match_replay(self):
+        engine = self.sim.build_L2_engine()
+        grid = np.arange(34199.0, 34204.0, 0.1)
+        snapshots = engine.snapshots(grid, 2)
+        for i, t in enumerate(grid):
+            self.sim.simulate_until(t)
+            expected = self.sim.orderbook.convert_orderbook_to_L2_dataframe()
+            got = [(side, snapshots[i, level, col], snapshots[i, level, col + 1])
+                   for side, col in (("bid", 2), ("ask", 0)) for level in range(2)
+                   if snapshots[i, level, col + 1] > 0]
+            self.assertEqual(got, [tuple(row) for row in expected.values.tolist()])
+
+    def test_window_engine_starts_from_snapshot(self):
+        self.sim.write_book_snapshots(interval=1.0)
+        window = LobsterSim(Orderbook(nlevels=2, ticker="L2E", tick_size=0.01), self.msg_path,
+                            start_time=34202.2)
+        self.assertIsNotNone(window._base_state)
+        grid = np.arange(34202.2, 34204.0, 0.1)
+        snapshots = window.build_L2_engine().snapshots(grid, 2)
+        for i, t in enumerate(grid):
+            self.sim.simulate_until(t)
+            np.testing.assert_array_equal(snapshots[i], self.sim.orderbook.convert_orderbook_to_L2_array(2))
+
+
+class TestWindowedLoading(MessageFileTestCase):
+    def setUp(self):
+        super().setUp()
+        self.full = LobsterSim(Orderbook(nlevels=2, ticker="WIN", tick_size=0.01), self.msg_path)
+
+    def test_message_index_offsets(self):
+        from src.lobster_reconstructor.loaders import build_message_index
+        index = build_message_index(self.msg_path, every=2)
+        self.assertEqual(index.n_lines, len(MESSAGE_ROWS))
+        self.assertEqual(index.line.tolist(), [0, 2, 4, 6])
+        self.assertEqual(index.time.tolist(), [MESSAGE_ROWS[i][0] for i in (0, 2, 4, 6)])
+
+    def test_window_matches_full_replay(self):
+        self.full.write_book_snapshots(interval=1.0)
+        window = LobsterSim(Orderbook(nlevels=2, ticker="WIN", tick_size=0.01), self.msg_path,
+                            start_time=34202.2, end_time=34202.7)
+        self.assertEqual(window.message_offset, 5)
+        self.assertEqual(window.dataM["Time"].tolist(), [34202.5])
+        for t in (34202.2, 34202.6):
+            window.simulate_until(t)
+            self.full.simulate_until(t)
+            np.testing.assert_array_equal(window.orderbook.convert_orderbook_to_L2_array(),
+                                          self.full.orderbook.convert_orderbook_to_L2_array())
+        with self.assertRaises(ValueError):
+            window.simulate_until(34201.0)
+
+    def test_changed_message_file_ignores_snapshots(self):
+        self.full.write_book_snapshots(interval=1.0)
+        window = LobsterSim(Orderbook(nlevels=2, ticker="WIN", tick_size=0.01), self.msg_path,
+                            start_time=34202.2, cache_orderbook_file=False)
+        self.assertEqual((window.message_offset, window._base_state), (0, None))
+        mtime = os.path.getmtime(self.msg_path)
+        os.utime(self.msg_path, (mtime - 10, mtime - 10))
+        window = LobsterSim(Orderbook(nlevels=2, ticker="WIN", tick_size=0.01), self.msg_path,
+                            start_time=34202.2)
+        self.assertEqual((window.message_offset, window._base_state), (0, None))
+        window.simulate_until(34202.6)
+        self.full.simulate_until(34202.6)
+        np.testing.assert_array_equal(window.orderbook.convert_orderbook_to_L2_array(),
+                                      self.full.orderbook.convert_orderbook_to_L2_array())
+
+
+class TestStreamingMode(MessageFileTestCase):
+    def test_forward_sampling_matches_loaded_mode(self):
+        loaded = LobsterSim(Orderbook(nlevels=2, ticker="STR", tick_size=0.01), self.msg_path)
+        streamed = LobsterSim(Orderbook(nlevels=2, ticker="STR", tick_size=0.01), self.msg_path,
+                              streaming=True, chunk_size=2)
+        expected = loaded.sample_L2_array(34200.0, 34203.0, 0.5)
+        got = streamed.sample_L2_array(34200.0, 34203.0, 0.5)
+        for e, g in zip(expected, got):
+            np.testing.assert_array_equal(e, g)
+        with self.assertRaises(ValueError):
+            streamed.simulate_until(34201.0)
+        with self.assertRaises(ValueError):
+            streamed.message_arrays()
+        streamed.close()
+
+
+class TestCompressedInputs(MessageFileTestCase):
+    def test_gzip_message_and_orderbook_files(self):
+        import gzip
+        from src.lobster_reconstructor.loaders import read_message_file, load_orderbook_array
+        gz_path = self.msg_path + ".gz"
+        with open(self.msg_path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+            dst.write(src.read())
+        pd.testing.assert_frame_equal(read_message_file(gz_path), read_message_file(self.msg_path))
+
+        rows = np.arange(24, dtype=np.int64).reshape(3, 8)
+        ob_path = os.path.join(self.tmp.name, "orderbook.csv.gz")
+        with gzip.open(ob_path, "wt") as f:
+            f.writelines(",".join(map(str, r)) + "\n" for r in rows)
+        np.testing.assert_array_equal(load_orderbook_array(ob_path), rows)
+        self.assertTrue(os.path.exists(ob_path + ".npy"))
+        np.testing.assert_array_equal(load_orderbook_array(ob_path), rows)
+
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        np.testing.assert_array_equal(load_orderbook_array(ob_path, cache_dir=cache_dir), rows)
+        self.assertEqual(len([f for f in os.listdir(cache_dir) if f.endswith(".npy")]), 1)
+
+    def test_empty_orderbook_file_raises(self):
+        from src.lobster_reconstructor.loaders import load_orderbook_array
+        for name, content in (("empty.csv", ""), ("header.csv", "ask_price_1,ask_size_1,bid_price_1,bid_size_1\n")):
+            ob_path = os.path.join(self.tmp.name, name)
+            with open(ob_path, "w") as f:
+                f.write(content)
+            for cache in (False, True):
+                with self.assertRaises(ValueError):
+                    load_orderbook_array(ob_path, cache=cache)
+
+
+class TestFastParser(MessageFileTestCase):
+    ROWS = [r + (0,) for r in MESSAGE_ROWS]  # padding column
+
+    def test_message_file_matches_pandas(self):
+        from src.lobster_reconstructor.parsers import parse_numeric_csv
+        from src.lobster_reconstructor.loaders import read_message_file, _MESSAGE_CSV_OPTIONS, _translate_message_codes
+        expected = _translate_message_codes(pd.read_csv(self.msg_path, **_MESSAGE_CSV_OPTIONS))
+        pd.testing.assert_frame_equal(read_message_file(self.msg_path), expected)
+        values = parse_numeric_csv(self.msg_path, float_columns=(0,), block_size=40)
+        self.assertEqual(values[:, 0].view(np.float64).tolist(), [r[0] for r in MESSAGE_ROWS])
+        self.assertEqual(values[:, 5].tolist(), [r[5] for r in MESSAGE_ROWS])
+
+    def test_unsupported_content_falls_back(self):
+        from src.lobster_reconstructor.loaders import read_message_file
+        with open(self.msg_path, "a") as f:
+            f.write("34204.0,1,9,,10000,1\n")
+        dataM = read_message_file(self.msg_path)
+        self.assertEqual(len(dataM), len(MESSAGE_ROWS) + 1)
+        self.assertTrue(pd.isna(dataM["Size"].iloc[-1]))
+
+    def test_misplaced_sign_is_rejected(self):
+        from src.lobster_reconstructor.parsers import parse_numeric_csv, UnsupportedFormat
+        for row in ("34204.0,1,9,1-0,10000,1,0\n", "34204.0.5,1,9,10,10000,1,0\n"):
+            with open(self.msg_path, "w") as f:
+                f.write(row)
+            with self.assertRaises(UnsupportedFormat):
+                parse_numeric_csv(self.msg_path, float_columns=(0,))
+
+
+class TestInstrumentation(MessageFileTestCase):
+    # The last message cancels an order that is not in the book
+    ROWS = MESSAGE_ROWS + [(34203.5, 2, 42, 10, 10000, 1)]
+
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=2, ticker="INS", tick_size=0.01), self.msg_path)
+
+    def test_counts_anomalies_and_export(self):
+        stats = self.sim.enable_instrumentation(sample_every=1, book_size_every=2)
+        self.sim.simulate_until(34210.0)
+        self.assertEqual(stats.events, len(MESSAGE_ROWS) + 1)
+        self.assertEqual(stats.event_counts["submit"], 4)
+        self.assertEqual(stats.anomalies[("cancel", "order_id_not_found")], 1)
+        self.assertEqual(sum(b.sum() for b in stats.latency_buckets.values()), stats.events)
+        self.assertEqual(len(stats.book_size), 4)
+
+        path = os.path.join(self.tmp.name, "replay.prom")
+        stats.write_prometheus(path, labels={"ticker": "INS"})
+        with open(path) as f:
+            text = f.read()
+        self.assertIn('lobster_events_total{ticker="INS",event_type="submit"} 4', text)
+        self.assertIn('lobster_anomalies_total{ticker="INS",event_type="cancel",kind="order_id_not_found"} 1', text)
+
+        self.assertIs(self.sim.disable_instrumentation(), stats)
+        self.assertNotIn("process_order", vars(self.sim.orderbook))
+
+    def test_instrumentation_wraps_installed_process_order(self):
+        from src.lobster_reconstructor.views import ViewPublisher
+        book = self.sim.orderbook
+        views = ViewPublisher(book, every=1)
+        views.attach()
+        stats = book.enable_instrumentation()
+        self.sim.simulate_until(34210.0)
+        self.assertEqual(stats.events, len(MESSAGE_ROWS) + 1)
+        self.assertEqual(views.current.message_count, book.message_count)
+        book.disable_instrumentation()
+        self.assertEqual(vars(book)["process_order"].__name__, "publishing_process_order")
+        views.detach()
+        self.assertNotIn("process_order", vars(book))
+
+
+class TestAnomalyLog(MessageFileTestCase):
+    ROWS = MESSAGE_ROWS + [(34203.5, 2, 42, 10, 10000, 1), (34203.6, 3, 7, 5, 10400, -1)]
+
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=2, ticker="ANO", tick_size=0.01), self.msg_path)
+
+    def test_records_and_rate_limits(self):
+        anomalies = self.sim.orderbook.anomalies
+        anomalies.log_first = 1
+        with self.assertLogs("src.lobster_reconstructor.orderbook", level="WARNING") as logs:
+            self.sim.simulate_until(34210.0)
+        # The second anomaly falls within the summary interval; the replay reports it on return
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("2 anomalies so far", logs.records[1].getMessage())
+        self.assertEqual(anomalies.unreported, 0)
+        self.assertEqual(self.sim.orderbook._warning_count, 2)
+        self.assertEqual(anomalies.counts(), {"price_not_found": 1, "order_id_not_found": 1})
+
+        df = anomalies.to_dataframe()
+        n = len(MESSAGE_ROWS)
+        self.assertEqual(df["msg_index"].tolist(), [n, n + 1])
+        self.assertEqual(df["event_type"].tolist(), ["cancel", "delete"])
+        self.assertEqual(df["order_id"].tolist(), [42, 7])
+
+        # Replaying from the start does not duplicate records
+        self.sim.simulate_until(34210.0)
+        self.assertEqual(len(anomalies), 2)
+
+    def test_no_summary_when_all_anomalies_were_logged(self):
+        with self.assertLogs("src.lobster_reconstructor.orderbook", level="WARNING") as logs:
+            self.sim.simulate_until(34210.0)
+        self.assertEqual(len(logs.records), 2)
+        self.assertNotIn("so far", logs.records[-1].getMessage())
+
+
+class TestSyntheticMessages(unittest.TestCase):
+    def test_stream_replays_cleanly(self):
+        from src.lobster_reconstructor.synthetic import generate_messages, write_message_file
+        arrays = generate_messages(n_events=3000, seed=3, depth=5)
+        again = generate_messages(n_events=3000, seed=3, depth=5)
+        for name in arrays:
+            np.testing.assert_array_equal(arrays[name], again[name])
+        self.assertTrue((np.diff(arrays["time"]) >= 0).all())
+        self.assertEqual(set(np.unique(arrays["type"])), {1, 2, 3, 4, 5})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "message.csv")
+            write_message_file(path, arrays)
+            sim = LobsterSim(Orderbook(nlevels=5, ticker="SYN", tick_size=0.01), path)
+            sim.simulate_until(arrays["time"][-1])
+        book = sim.orderbook
+        self.assertEqual(book._warning_count, 0)
+        self.assertLess(book.highest_bid_price(), book.lowest_ask_price())
+        np.testing.assert_array_equal(sim.build_L2_engine().snapshot(arrays["time"][-1], 5),
+                                      book.convert_orderbook_to_L2_array(5))
+
+
+class TestMemoryReport(MessageFileTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=2, ticker="MEM", tick_size=0.01), self.msg_path)
+
+    def test_components(self):
+        self.sim.simulate_until(34210.0)
+        for exact in (False, True):
+            report = self.sim.memory_usage(exact=exact)
+            self.assertEqual(report.exact, exact)
+            self.assertEqual(report.components["messages"], sum(report.details["messages"].values()))
+            self.assertGreater(report.components["orders"], 0)
+            self.assertGreater(report.components["levels"], 0)
+            self.assertEqual(report.total, report.to_dataframe()["bytes"].sum())
+        self.assertEqual(set(self.sim.orderbook.memory_usage().components),
+                         {"levels", "orders", "trade_log", "anomalies", "ofi"})
+
+    def test_sample_replay(self):
+        import tracemalloc
+        df = self.sim.sample_memory([34200.5, 34202.0, 34210.0])
+        self.assertEqual(len(df), 3)
+        self.assertIn("traced_peak", df.columns)
+        self.assertEqual(df["time"].tolist(), [34200.5, 34202.0, 34210.0])
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(self.sim.orderbook.curr_book_timestamp, MESSAGE_ROWS[-1][0])
+
+
+class TestHeadlessImport(unittest.TestCase):
+    def test_core_runs_without_viz_stack(self):
+        # Make plotly and dash unimportable in a fresh interpreter
+        code = """
+import sys
+sys.modules.update({name: None for name in ("plotly", "plotly.express", "plotly.graph_objects", "plotly.subplots", "dash")})
+from src.lobster_reconstructor import LobsterSim, Orderbook
+from src.lobster_reconstructor.orders import Order
+book = Orderbook(nlevels=2, ticker="HDL", tick_size=0.01)
+book.process_order(Order(34200.0, "submit", 1, 100, 10000, "bid"))
+assert book.highest_bid_price() == 10000
+try:
+    book.display_L2_order_book()
+except ImportError as exc:
+    assert "viz" in str(exc)
+else:
+    raise AssertionError("expected ImportError")
+"""
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class TestMultiBookSim(unittest.TestCase):
+    def setUp(self):
+        from src.lobster_reconstructor.multibook import MultiBookSim
+        self.tmp = tempfile.TemporaryDirectory()
+        self.files = {"AAA": os.path.join(self.tmp.name, "a.csv"), "BBB": os.path.join(self.tmp.name, "b.csv")}
+        write_csv(self.files["AAA"], MESSAGE_ROWS)
+        # Shares timestamps with AAA; ties go to AAA first
+        write_csv(self.files["BBB"], [(t + 0.5, *rest) for t, *rest in MESSAGE_ROWS])
+        self.multi = MultiBookSim({ticker: Orderbook(nlevels=2, ticker=ticker, tick_size=0.01) for ticker in self.files},
+                                  self.files)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_merged_order(self):
+        self.assertEqual(len(self.multi), 2 * len(MESSAGE_ROWS))
+        self.assertTrue((np.diff(self.multi.time) >= 0).all())
+        self.assertEqual(self.multi.book_index[:4].tolist(), [0, 0, 1, 0])
+        self.assertEqual(self.multi.msg_index[:4].tolist(), [0, 1, 0, 2])
+
+    def test_sampling_matches_single_books(self):
+        timestamps, levels, midprices = self.multi.sample_L2_array(34200.0, 34204.0, 0.5)
+        self.assertEqual(levels.shape, (len(timestamps), 2, 2, 4))
+        for b, ticker in enumerate(self.multi.tickers):
+            sim = LobsterSim(Orderbook(nlevels=2, ticker=ticker, tick_size=0.01), self.files[ticker])
+            _, expected, expected_mid = sim.sample_L2_array(34200.0, 34204.0, 0.5)
+            np.testing.assert_array_equal(levels[:, b], expected)
+            np.testing.assert_array_equal(midprices[:, b], expected_mid)
+        with self.assertRaises(ValueError):
+            self.multi.simulate_from_current_until(34200.0)
+
+
+class TestLiveFeed(MessageFileTestCase):
+    def test_replay_matches_sim(self):
+        import asyncio
+        import math
+        from src.lobster_reconstructor.live import LiveFeed, replay_file
+
+        async def run():
+            book = Orderbook(nlevels=2, ticker="TEST", tick_size=0.01)
+            feed = LiveFeed(book, replay_file(self.msg_path, speed=math.inf), batch_size=3)
+            snapshots = []
+
+            async def consume():
+                async for snapshot in feed.subscribe(maxsize=100):
+                    snapshots.append(snapshot)
+
+            consumer = asyncio.create_task(consume())
+            stats = await feed.run()
+            await consumer
+            return book, stats, snapshots
+
+        book, stats, snapshots = asyncio.run(run())
+        sim = LobsterSim(Orderbook(nlevels=2, ticker="TEST", tick_size=0.01), self.msg_path)
+        sim.simulate_until(np.inf)
+        np.testing.assert_array_equal(book.convert_orderbook_to_L2_array(2),
+                                      sim.orderbook.convert_orderbook_to_L2_array(2))
+        self.assertEqual(stats.messages, len(MESSAGE_ROWS))
+        self.assertEqual(len(stats.recent_latencies), len(MESSAGE_ROWS))
+        self.assertTrue((stats.recent_latencies >= 0).all())
+        np.testing.assert_array_equal(snapshots[-1].levels, book.convert_orderbook_to_L2_array(2))
+
+    def test_end_of_feed_is_not_a_dropped_snapshot(self):
+        import asyncio
+        from src.lobster_reconstructor.live import LiveFeed, _END
+
+        async def run():
+            feed = LiveFeed(Orderbook(nlevels=2, ticker="TEST", tick_size=0.01), None)
+            subscription = feed.subscribe(maxsize=1)
+            subscription._offer("snapshot")
+            subscription._offer(_END)
+            return feed.stats, [snapshot async for snapshot in subscription]
+
+        stats, snapshots = asyncio.run(run())
+        self.assertEqual(stats.snapshots_dropped, 0)
+        self.assertEqual(snapshots, ["snapshot"])
+
+    def test_decode_rejects_malformed_lines(self):
+        from src.lobster_reconstructor.live import decode_messages
+        orders = decode_messages([b"34200.5,1,7,10,10000,1\n", b"garbage\n", b"34200.6,9,7,10,10000,1\n"])
+        self.assertEqual(orders[0], Order(34200.5, "submit", 7, 10, 10000, "bid"))
+        self.assertEqual(orders[1:], [None, None])
+
+
+class TestSharedBook(MessageFileTestCase):
+    def setUp(self):
+        from src.lobster_reconstructor.shared_book import SharedBookPublisher, SharedBookReader
+        super().setUp()
+        self.publisher = SharedBookPublisher(num_levels=2, slots=4)
+        self.reader = SharedBookReader(self.publisher.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.publisher.close()
+        super().tearDown()
+
+    def test_attached_replay_publishes_every_event(self):
+        sim = LobsterSim(Orderbook(nlevels=2, ticker="TEST", tick_size=0.01), self.msg_path)
+        self.assertIsNone(self.reader.latest())
+        self.publisher.attach(sim.orderbook)
+        sim.simulate_until(np.inf)
+        self.publisher.detach()
+        self.assertNotIn("process_order", sim.orderbook.__dict__)
+
+        snapshot = self.reader.latest()
+        self.assertEqual(snapshot.sequence, self.reader.published - 1)
+        self.assertEqual(snapshot.messages, len(MESSAGE_ROWS))
+        self.assertEqual(snapshot.timestamp, sim.orderbook.curr_book_timestamp)
+        np.testing.assert_array_equal(snapshot.levels, sim.orderbook.convert_orderbook_to_L2_array(2))
+        self.assertEqual(snapshot.quote, tuple(snapshot.levels[0].tolist()))
+
+    def test_ring_overwrites_oldest(self):
+        book = Orderbook(nlevels=2, ticker="TEST", tick_size=0.01)
+        for i in range(6):
+            book.process_order(Order(34200.0 + i, "submit", i + 1, 10, 10000 + 100 * i, "ask"))
+            self.publisher.publish(book)
+        self.assertIsNone(self.reader.read(0))
+        self.assertIsNone(self.reader.read(6))
+        self.assertEqual([s.sequence for s in self.reader.read_since(-1)], [2, 3, 4, 5])
+        self.assertEqual([s.messages for s in self.reader.read_since(3)], [5, 6])
+        # A slot left half-written is skipped in favour of the previous publication
+        self.publisher._ring[5 % 4, 0] = 2 * 5 + 1
+        self.assertEqual(self.reader.latest().sequence, 4)
+
+
+class TestBookViews(MessageFileTestCase):
+    def test_replay_publishes_views(self):
+        sim = LobsterSim(Orderbook(nlevels=2, ticker="TEST", tick_size=0.01), self.msg_path)
+        views = sim.enable_views(every=2)
+        published = []
+        publish = views.publish
+        views.publish = lambda: published.append(publish()) or published[-1]
+        sim.simulate_until(np.inf)
+
+        self.assertEqual([v.message_count for v in published][:-1], list(range(2, len(MESSAGE_ROWS) + 1, 2)))
+        self.assertEqual([v.version for v in published], list(range(1, len(published) + 1)))
+        current = views.current
+        self.assertIs(current, published[-1])
+        self.assertEqual(current.message_count, len(MESSAGE_ROWS))
+        np.testing.assert_array_equal(current.levels, sim.orderbook.convert_orderbook_to_L2_array(2))
+        with self.assertRaises(ValueError):
+            current.levels[0, 0] = 0
+        self.assertIs(views.wait_for_update(current.version, timeout=0.01), current)
+
+        sim.disable_views()
+        self.assertIsNone(sim.views)
+        sim.simulate_until(34201.0)
+        self.assertEqual(current.message_count, len(MESSAGE_ROWS))
+
+    def test_attach_standalone_book(self):
+        from src.lobster_reconstructor.views import ViewPublisher
+        book = Orderbook(nlevels=2, ticker="TEST", tick_size=0.01)
+        views = ViewPublisher(book, every=3)
+        self.assertIsNone(views.current.mid_price)
+        views.attach()
+        for i in range(7):
+            price = 10100 + 100 * i if i % 2 else 10000 - 100 * i
+            book.process_order(Order(34200.0 + i, "submit", i + 1, 10, price, "ask" if i % 2 else "bid"))
+        views.detach()
+        self.assertNotIn("process_order", book.__dict__)
+        self.assertEqual((views.current.version, views.current.message_count), (2, 6))
+        self.assertEqual((views.current.best_bid, views.current.best_ask), (10000, 10200))
+        self.assertEqual(views.current.mid_price, 10100)
+
+
+class TestUndoJournal(MessageFileTestCase):
+    def assert_same_book(self, book, expected):
+        state, expected_state = book.export_state(), expected.export_state()
+        for key in expected_state:
+            np.testing.assert_array_equal(state[key], expected_state[key])
+        self.assertEqual(book.message_count, expected.message_count)
+        self.assertEqual(book.bbo_change_count, expected.bbo_change_count)
+        self.assertEqual((book.highest_bid_price(), book.lowest_ask_price()),
+                         (expected.highest_bid_price(), expected.lowest_ask_price()))
+        self.assertEqual(str(book.cum_OFI), str(expected.cum_OFI))
+
+    def test_step_back_and_rewind_match_replay(self):
+        sim = LobsterSim(Orderbook(nlevels=5, ticker="TEST", tick_size=0.01), self.msg_path)
+        with self.assertRaises(ValueError):
+            sim.step_back()
+        sim.enable_undo_journal()
+        sim.simulate_until(np.inf)
+        for k in range(1, len(MESSAGE_ROWS) + 1):
+            sim.simulate_until(np.inf)
+            self.assertEqual(sim.step_back(k), k)
+            expected = LobsterSim(Orderbook(nlevels=5, ticker="TEST", tick_size=0.01), self.msg_path)
+            if k < len(MESSAGE_ROWS):
+                expected.simulate_until(MESSAGE_ROWS[-k - 1][0])
+            self.assert_same_book(sim.orderbook, expected.orderbook)
+
+        for time in (34203.0, 34201.0, 34202.5, 34200.0):
+            sim.rewind_to(time)
+            expected = LobsterSim(Orderbook(nlevels=5, ticker="TEST", tick_size=0.01), self.msg_path)
+            expected.simulate_until(time)
+            self.assert_same_book(sim.orderbook, expected.orderbook)
+
+    def test_undo_restores_queue_position(self):
+        book = Orderbook(nlevels=5, ticker="TEST", tick_size=1)
+        book.enable_journal(capacity=2)
+        for i in range(3):
+            book.process_order(Order(34200.0 + i, "submit", i + 1, 10, 10000, "bid"))
+        book.process_order(Order(34204.0, "delete", 1, 10, 10000, "bid"))
+        book.process_order(Order(34205.0, "cancel", 2, 4, 10000, "bid"))
+        self.assertEqual(book.undo(5), 2)
+        self.assertEqual(list(book.bids[10000]), [1, 2, 3])
+        self.assertEqual(book.bids[10000][2].size, 10)
+        self.assertEqual((book.curr_book_timestamp, book.message_count), (34202.0, 3))
+        self.assertEqual(book.cum_OFI.Db.count, 0)
+        book.disable_journal()
+        self.assertNotIn("process_order", book.__dict__)
+        with self.assertRaises(ValueError):
+            book.undo()
+
+    def test_journal_composes_with_instrumentation(self):
+        for journal_first in (True, False):
+            sim = LobsterSim(Orderbook(nlevels=5, ticker="TEST", tick_size=0.01), self.msg_path)
+            if journal_first:
+                sim.enable_undo_journal()
+                stats = sim.enable_instrumentation(sample_every=1)
+            else:
+                stats = sim.enable_instrumentation(sample_every=1)
+                sim.enable_undo_journal()
+            sim.simulate_until(np.inf)
+            self.assertEqual(stats.events, len(MESSAGE_ROWS))
+            self.assertEqual(sim.step_back(3), 3)
+            expected = LobsterSim(Orderbook(nlevels=5, ticker="TEST", tick_size=0.01), self.msg_path)
+            expected.simulate_until(MESSAGE_ROWS[-4][0])
+            self.assert_same_book(sim.orderbook, expected.orderbook)
+            if journal_first:
+                with self.assertRaises(ValueError):
+                    sim.disable_undo_journal()
+                sim.disable_instrumentation()
+                sim.disable_undo_journal()
+            else:
+                with self.assertRaises(ValueError):
+                    sim.disable_instrumentation()
+                sim.disable_undo_journal()
+                sim.disable_instrumentation()
+            self.assertNotIn("process_order", vars(sim.orderbook))
+
+
+class TestTensorDataset(MessageFileTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sim = LobsterSim(Orderbook(nlevels=2, ticker="TEST", tick_size=0.01), self.msg_path)
+
+    def test_event_windows_match_replay(self):
+        out = os.path.join(self.tmp.name, "events")
+        ds = self.sim.write_tensor_dataset(out, window=3, horizons=(1, 2), shard_size=2)
+        self.assertEqual(len(ds), len(MESSAGE_ROWS) - 2)
+        self.assertEqual(len(ds.shards), 4)
+        expected = LobsterSim(Orderbook(nlevels=2, ticker="TEST", tick_size=0.01), self.msg_path)
+        for i in range(len(ds)):
+            levels, labels = ds[i]
+            self.assertIsInstance(levels, np.memmap)
+            self.assertEqual(levels.shape, (3, 2, 4))
+            expected.simulate_until(MESSAGE_ROWS[i + 2][0])
+            np.testing.assert_array_equal(levels[-1], expected.orderbook.convert_orderbook_to_L2_array(2))
+            np.testing.assert_array_equal(labels, ds.labels[i + 2])
+
+        np.testing.assert_array_equal(ds.msg_index, np.arange(len(MESSAGE_ROWS)))
+        mid = np.asarray(ds.mid)
+        self.assertTrue(np.isnan(mid[0]))
+        self.assertEqual(mid[1], 10050)
+        np.testing.assert_array_equal(ds.labels[:-1, 0], mid[1:] - mid[:-1])
+        self.assertTrue(np.isnan(ds.labels[-2:, 1]).all())
+        np.testing.assert_array_equal(ds.valid_windows(), np.flatnonzero(~np.isnan(ds.labels[2:]).any(axis=1)))
+        levels, labels = ds.batch([0, 2])
+        self.assertEqual((levels.shape, labels.shape), ((2, 3, 2, 4), (2, 2)))
+
+    def test_time_grid_matches_sample_L2_array(self):
+        out = os.path.join(self.tmp.name, "grid")
+        ds = self.sim.write_tensor_dataset(out, start_time=34200.0, end_time=34203.0, interval=0.25, window=1)
+        expected = LobsterSim(Orderbook(nlevels=2, ticker="TEST", tick_size=0.01), self.msg_path)
+        times, levels, mids = expected.sample_L2_array(34200.0, 34203.0, 0.25)
+        np.testing.assert_array_equal(ds.time, times)
+        np.testing.assert_array_equal(np.stack([ds[i][0][0] for i in range(len(ds))]), levels)
+        np.testing.assert_array_equal(ds.mid, mids)
+        self.assertEqual(TensorDataset(out).manifest["interval"], 0.25)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
 